@@ -0,0 +1,62 @@
+"""基准测试公共夹具
+
+每个基准按问题规模参数化 (1 ~ 10^6 个点)，规模不小于 ``LARGE_SIZE`` 的用例标记为
+``slow``，且只测量少量轮次，避免逐点实现的基准耗时过长。
+"""
+import os
+import numpy as np
+import pytest
+from typing import Any, Callable, Dict
+
+pytest.importorskip("pytest_benchmark")
+
+# 绘图基准在无显示环境下运行
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+SIZES = [
+    1,
+    100,
+    10_000,
+    pytest.param(1_000_000, marks=pytest.mark.slow),
+]
+LARGE_SIZE = 100_000
+LARGE_ROUNDS = 3
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"n={size}")
+def size(request) -> int:
+    """问题规模（点数）"""
+    return request.param
+
+
+@pytest.fixture
+def workload(size: int) -> Dict[str, np.ndarray]:
+    """
+    生成固定随机种子的负载数据
+
+    返回:
+        Dict[str, np.ndarray]: 频率 (Hz)、特征阻抗 (Ω) 和复数负载阻抗 (Ω)
+    """
+    rng = np.random.default_rng(0)
+    return {
+        "freq": rng.uniform(1e9, 10e9, size),
+        "z0": np.full(size, 50.0),
+        "zl": rng.uniform(10, 200, size) + 1j * rng.uniform(-100, 100, size)
+    }
+
+
+@pytest.fixture
+def measure(benchmark, size: int) -> Callable[..., Any]:
+    """
+    按规模选择测量方式并记录规模信息
+
+    小规模用例交给 pytest-benchmark 自动校准轮次，大规模用例固定轮次。
+    """
+    benchmark.extra_info["size"] = size
+
+    def run(func: Callable[..., Any], *args: Any) -> Any:
+        if size >= LARGE_SIZE:
+            return benchmark.pedantic(func, args=args, rounds=LARGE_ROUNDS, iterations=1)
+        return benchmark(func, *args)
+
+    return run
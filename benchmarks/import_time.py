@@ -0,0 +1,83 @@
+"""导入耗时基准
+
+在独立的解释器中逐个导入模块，报告冷启动耗时和被加载的重量级依赖。
+
+用法:
+    python benchmarks/import_time.py [模块名 ...] [--repeat N]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from statistics import median
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = [
+    "numpy",
+    "src.optimization.calculator",
+    "src.optimization.optimizer",
+    "src.impedance_matching.batch",
+    "src.cli",
+    "src.visualization.plotter",
+    "src.visualization.result_saver",
+    "src.gui.main",
+]
+
+HEAVY_MODULES = ["matplotlib", "scipy", "skrf", "microwave_gui"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module: str, repeat: int = 5) -> Dict[str, object]:
+    """
+    测量模块的冷启动导入耗时
+
+    参数:
+        module: str, 模块名
+        repeat: int, 重复次数，取中位数
+
+    返回:
+        Dict[str, object]: 耗时 (ms) 和加载的重量级依赖
+    """
+    samples: List[float] = []
+    loaded: List[str] = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            capture_output=True, text=True, cwd=ROOT
+        )
+        if completed.returncode != 0:
+            return {"module": module, "error": completed.stderr.strip().splitlines()[-1]}
+        data = json.loads(completed.stdout)
+        samples.append(data["seconds"] * 1000)
+        loaded = data["loaded"]
+    return {"module": module, "milliseconds": median(samples), "heavy_modules": loaded}
+
+
+def main() -> None:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        result = measure(module, args.repeat)
+        if "error" in result:
+            print(f"{module:<35} 导入失败: {result['error']}")
+        else:
+            heavy = ", ".join(result["heavy_modules"]) or "-"
+            print(f"{module:<35} {result['milliseconds']:8.1f} ms   重量级依赖: {heavy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""结果保存与绘图基准
+
+绘图基准包含一次完整的画布渲染，否则 matplotlib 只构造对象而不实际绘制。
+"""
+import numpy as np
+import pytest
+from types import SimpleNamespace
+
+from src.cli import write_results
+from src.visualization.plotter import plot_s_parameters, plot_smith_chart, plot_vswr
+from src.visualization.result_saver import ResultSaver
+
+
+@pytest.fixture
+def response(size):
+    """规模为 size 的频率响应"""
+    frequencies = np.linspace(1e9, 10e9, size)
+    theta = np.linspace(0, np.pi, size)
+    s11 = 0.5 * np.exp(1j * theta)
+    s21 = np.sqrt(1 - np.abs(s11) ** 2).astype(complex)
+    return frequencies, s11, s21
+
+
+@pytest.fixture
+def result_saver(tmp_path):
+    """保存到临时目录的结果保存器"""
+    return ResultSaver(str(tmp_path))
+
+
+class TestResultSaver:
+    """ResultSaver 写入基准"""
+
+    def test_save_network_data(self, benchmark, result_saver, tmp_path):
+        """保存单个网络的数据文件"""
+        network = SimpleNamespace(
+            s_parameters=np.array([0.2 + 0.1j, 0.9, 0.9, 0.2 + 0.1j]),
+            vswr=1.5,
+            reflection_coefficient=0.2 + 0.1j,
+            input_impedance=60 + 10j,
+            frequency=5e9
+        )
+        benchmark(result_saver.save_network_data, network, str(tmp_path / "network"))
+
+    def test_save_plots(self, measure, result_saver, response, tmp_path):
+        """保存S参数和驻波比图"""
+        _, s11, s21 = response
+        network = SimpleNamespace(s_parameters=np.array([s11, s21, s21, s11]), vswr=1.5)
+        measure(result_saver.save_plots, network, str(tmp_path / "network"))
+
+    def test_save_optimization_results(self, measure, result_saver, response, tmp_path):
+        """按行写出优化结果CSV"""
+        frequencies, s11, _ = response
+        results = [{"freq": f, "vswr": v} for f, v in zip(frequencies.tolist(), np.abs(s11).tolist())]
+        measure(result_saver.save_optimization_results, results, str(tmp_path / "opt"))
+
+    def test_save_parameter_sweep(self, measure, result_saver, response, tmp_path):
+        """保存参数扫描图和数据"""
+        frequencies, s11, _ = response
+        results = [{"freq": f, "优化目标值": v}
+                   for f, v in zip(frequencies.tolist(), np.abs(s11).tolist())]
+        measure(result_saver.save_parameter_sweep, results, str(tmp_path / "sweep"), "freq")
+
+    @pytest.mark.parametrize("suffix", [".csv", ".npz"])
+    def test_write_results(self, measure, response, tmp_path, suffix):
+        """命令行按列写出结果"""
+        frequencies, s11, _ = response
+        columns = {"freq": frequencies, "s11_real": s11.real, "s11_imag": s11.imag}
+        measure(write_results, columns, str(tmp_path / f"results{suffix}"))
+
+
+class TestPlotter:
+    """绘图函数基准"""
+
+    @staticmethod
+    def _render(plot, *args):
+        """绘制、渲染并关闭图形"""
+        import matplotlib.pyplot as plt
+
+        def run():
+            fig = plot(*args)
+            fig.canvas.draw()
+            plt.close(fig)
+        return run
+
+    def test_plot_s_parameters(self, measure, response):
+        """S参数曲线"""
+        frequencies, s11, s21 = response
+        measure(self._render(plot_s_parameters, frequencies, np.column_stack([s11, s21])))
+
+    def test_plot_smith_chart(self, measure, response):
+        """史密斯圆图"""
+        _, s11, _ = response
+        measure(self._render(plot_smith_chart, s11))
+
+    def test_plot_vswr(self, measure, response):
+        """驻波比曲线"""
+        frequencies, s11, _ = response
+        measure(self._render(plot_vswr, frequencies, s11))
@@ -0,0 +1,117 @@
+"""匹配计算基准
+
+逐点实现按规模循环构造对象，向量化实现一次处理整个数组，
+两者在同一规模下的耗时可直接比较。
+"""
+import numpy as np
+import pytest
+
+from src.impedance_matching import core
+from src.impedance_matching.batch import quarter_wave_batch, stub_batch
+from src.impedance_matching.cascade import quarter_wave_sweep, stub_sweep
+from src.impedance_matching.kernels import KERNELS, backend
+from src.impedance_matching.parallel import process_pool, solve_shared
+from src.impedance_matching.quarter_wave import QuarterWaveTransformer
+from src.impedance_matching.stub_matching import StubMatcher
+from src.impedance_matching.synthesis import MicrostripSynthesizer, Substrate
+from src.optimization.calculator import calculate_matching
+
+
+def _each(factory, workload):
+    """对每个负载调用一次 factory(freq, z0, zl)"""
+    def run():
+        return [factory(f, z0, zl)
+                for f, z0, zl in zip(workload["freq"].tolist(), workload["z0"].tolist(),
+                                     workload["zl"].tolist())]
+    return run
+
+
+class TestScalarMatching:
+    """逐点匹配计算"""
+
+    def test_calculate_matching(self, measure, workload):
+        """calculate_matching 比较全部匹配网络"""
+        results = measure(_each(calculate_matching, workload))
+        assert len(results) == len(workload["freq"])
+
+    def test_quarter_wave(self, measure, workload):
+        """独立模块的四分之一波长变换器"""
+        results = measure(_each(QuarterWaveTransformer, workload))
+        assert results[0].vswr >= 1
+
+    def test_quarter_wave_core(self, measure, workload):
+        """core 模块的四分之一波长变换器"""
+        results = measure(_each(lambda f, z0, zl: core.QuarterWaveTransformer(f, z0, zl).calculate(),
+                                workload))
+        assert "s_parameters" in results[0]
+
+    def test_stub(self, measure, workload):
+        """独立模块的单支节匹配器"""
+        results = measure(_each(StubMatcher, workload))
+        assert results[0].vswr >= 1
+
+    def test_stub_core(self, measure, workload):
+        """core 模块的单支节匹配器"""
+        results = measure(_each(lambda f, z0, zl: core.StubMatcher(f, z0, zl).calculate(), workload))
+        assert "s_parameters" in results[0]
+
+
+class TestVectorizedMatching:
+    """向量化匹配计算"""
+
+    @pytest.mark.parametrize("solver", [quarter_wave_batch, stub_batch],
+                             ids=["quarter_wave", "stub"])
+    def test_batch_solver(self, measure, workload, solver):
+        """批量求解整个参数数组"""
+        result = measure(solver, workload["freq"], workload["z0"], workload["zl"])
+        assert result["s11"].shape == workload["freq"].shape
+
+    @pytest.mark.parametrize("method", ["quarter_wave", "stub"])
+    def test_kernel(self, benchmark, measure, workload, method):
+        """自动选择实现的逐负载内核，与 test_batch_solver 对比"""
+        benchmark.extra_info["backend"] = backend()
+        KERNELS[method](workload["freq"][:1], workload["z0"][:1], workload["zl"][:1])  # 编译不计入耗时
+        result = measure(KERNELS[method], workload["freq"], workload["z0"], workload["zl"])
+        assert result["s11"].shape == workload["freq"].shape
+
+    @pytest.mark.parametrize("transfer", ["pickle", "shared_memory"])
+    def test_parallel_solver(self, measure, workload, transfer):
+        """两个进程分块求解，比较结果序列化回主进程与写入共享内存"""
+        freq, z0, zl = workload["freq"], workload["z0"], workload["zl"]
+        chunk_size = max(len(freq) // 8, 1)
+        bounds = [(a, min(a + chunk_size, len(freq))) for a in range(0, len(freq), chunk_size)]
+        with process_pool(2) as executor:
+            if transfer == "pickle":
+                def run():
+                    futures = [executor.submit(KERNELS["stub"], freq[a:b], z0[a:b], zl[a:b]) for a, b in bounds]
+                    return [future.result() for future in futures]
+            else:
+                def run():
+                    return solve_shared("stub", freq, z0, zl, 2, chunk_size, "double", executor)
+            run()  # 进程启动不计入耗时
+            with np.errstate(invalid="ignore"):
+                result = measure(run)
+        assert result is not None
+
+    def test_quarter_wave_sweep(self, measure, size):
+        """四分之一波长变换器频率扫描"""
+        frequencies = np.linspace(2.5e9, 7.5e9, size)
+        s11, s21 = measure(quarter_wave_sweep, frequencies, 5e9, 50.0, 100 + 50j,
+                           float(np.sqrt(50.0 * abs(100 + 50j))))
+        assert s11.shape == frequencies.shape
+
+    def test_stub_sweep(self, measure, size):
+        """单支节匹配器频率扫描"""
+        matcher = StubMatcher(5e9, 50.0, 100 + 50j)
+        frequencies = np.linspace(2.5e9, 7.5e9, size)
+        s11, s21 = measure(stub_sweep, frequencies, 5e9, 50.0, 100 + 50j,
+                           matcher.distance, matcher.stub_length, matcher.wavelength)
+        assert s21.shape == frequencies.shape
+
+    def test_microstrip_synthesis(self, measure, workload):
+        """按反查表批量综合变换段的微带线尺寸"""
+        synthesizer = MicrostripSynthesizer(Substrate(eps_r=4.4, height=1.6e-3, thickness=35e-6))
+        zt = quarter_wave_batch(workload["freq"], workload["z0"], workload["zl"])["transformer_impedance"]
+        synthesizer.table  # 建表不计入耗时
+        geometry = measure(synthesizer.synthesize, zt, 90.0, workload["freq"])
+        assert geometry["width"].shape == zt.shape
@@ -0,0 +1,144 @@
+"""批量计算与优化基准"""
+import numpy as np
+import pytest
+
+from src.cli import solve_jobs
+from src.optimization.calculator import BatchCalculator, CalculationParameters
+from src.optimization.optimizer import Optimizer
+from src.optimization.design_index import DesignIndex, design_key
+from src.optimization.yield_analysis import Tolerance, YieldAnalysis
+from src.optimization.pareto import ParetoOptimizer, crowding_distance, non_dominated_sort
+from src.impedance_matching.quarter_wave import QuarterWaveTransformer
+from src.impedance_matching.topology import Topology
+
+
+def _param_list(workload):
+    """把负载数据转换为参数对象列表"""
+    return [CalculationParameters(freq=f, z0=z0, z_load_real=zl.real, z_load_imag=zl.imag)
+            for f, z0, zl in zip(workload["freq"].tolist(), workload["z0"].tolist(),
+                                 workload["zl"].tolist())]
+
+
+class TestBatchCalculator:
+    """BatchCalculator 基准"""
+
+    def test_parameters_from_arrays(self, measure, workload):
+        """由数组批量创建参数对象"""
+        zl = workload["zl"]
+        params = measure(CalculationParameters.from_arrays, workload["freq"], workload["z0"],
+                         zl.real, zl.imag)
+        assert len(params) == len(zl)
+
+    def test_batch_calculate(self, measure, workload):
+        """逐个参数对象批量计算"""
+        param_list = _param_list(workload)
+        calculator = BatchCalculator(CalculationParameters())
+        results = measure(calculator.batch_calculate, param_list)
+        assert len(results) == len(param_list)
+
+    def test_optimize(self, measure, size):
+        """在频率范围内按采样点数优化"""
+        calculator = BatchCalculator(CalculationParameters())
+        best = measure(calculator.optimize, {"freq": (1e9, 10e9)}, size)
+        assert "vswr" in best
+
+    def test_solve_jobs(self, measure, workload):
+        """命令行批量求解（向量化，单进程）"""
+        jobs = {
+            "freq": workload["freq"],
+            "z0": workload["z0"],
+            "z_load_real": workload["zl"].real,
+            "z_load_imag": workload["zl"].imag
+        }
+        results = measure(solve_jobs, jobs, ["quarter_wave", "stub"])
+        assert len(results["quarter_wave_vswr"]) == len(workload["freq"])
+
+
+class TestOptimizer:
+    """Optimizer 各方法基准，规模为被优化的负载个数"""
+
+    @pytest.mark.parametrize("method", ["gradient_descent", "genetic", "particle_swarm"])
+    def test_optimize(self, measure, workload, method):
+        """逐个负载运行优化器"""
+        optimizer = Optimizer(method=method)
+
+        def run():
+            return [optimizer.optimize(f, z0, zl, max_iterations=10)
+                    for f, z0, zl in zip(workload["freq"].tolist(), workload["z0"].tolist(),
+                                         workload["zl"].tolist())]
+
+        results = measure(run)
+        assert len(results) == len(workload["freq"])
+
+
+class TestDesignIndex:
+    """设计索引基准"""
+
+    def test_nearest(self, measure, workload):
+        """索引中有规模个设计时，查询 1000 个负载的最近设计（含首次查询时建树）"""
+        gamma = (workload["zl"] - 50) / (workload["zl"] + 50)
+        queries = gamma[:1000] * 0.99
+        key = design_key("quarter_wave", 0.2)
+
+        def run():
+            index = DesignIndex()
+            for row, point in enumerate(gamma.tolist()):
+                index.add(key, point, {"row": row})
+            return [index.nearest(key, query) for query in queries.tolist()]
+
+        assert len(measure(run)) == len(queries)
+
+    def test_nearest_interleaved(self, measure, workload):
+        """索引中有规模个设计时，交替查询和加入 1000 个负载，与优化器使用索引的方式相同"""
+        gamma = (workload["zl"] - 50) / (workload["zl"] + 50)
+        queries = gamma[:1000] * 0.99
+        key = design_key("quarter_wave", 0.2)
+        index = DesignIndex()
+        for row, point in enumerate(gamma.tolist()):
+            index.add(key, point, {"row": row})
+        index.nearest(key, 0j)  # 建树不计入耗时
+
+        def run():
+            hits = []
+            for query in queries.tolist():
+                hits.append(index.nearest(key, query))
+                index.add(key, query, {"row": -1})
+            return hits
+
+        assert len(measure(run)) == len(queries)
+
+
+class TestYieldAnalysis:
+    """蒙特卡洛良率分析基准"""
+
+    def test_run(self, measure, size):
+        """样本数为规模、21 个频点的四分之一波长变换器"""
+        analysis = YieldAnalysis(Topology.quarter_wave(QuarterWaveTransformer(1e9, 50, 100)), 50, 100,
+                                 np.linspace(0.9e9, 1.1e9, 21),
+                                 {"transformer.impedance": Tolerance(0.05),
+                                  "transformer.length": Tolerance(0.02, distribution="normal")},
+                                 vswr_max=1.2)
+        result = measure(analysis.run, size, 0)
+        assert result["samples"] == size
+
+
+class TestPareto:
+    """多目标优化基准"""
+
+    @pytest.mark.parametrize("population", [100, 1000])
+    def test_sorting(self, benchmark, population):
+        """非支配排序加拥挤距离，规模为种群数"""
+        objectives = np.random.default_rng(0).random((population, 4))
+        benchmark.extra_info["size"] = population
+
+        def run():
+            ranks = non_dominated_sort(objectives)
+            return crowding_distance(objectives, ranks)
+
+        assert benchmark(run).shape == (population,)
+
+    def test_run(self, benchmark):
+        """100 个个体、20 代的完整优化"""
+        optimizer = ParetoOptimizer(1e9, 50, 200, max_sections=3)
+        result = benchmark(optimizer.run, 100, 20, 0)
+        assert len(result["front"]["vswr"]) > 0
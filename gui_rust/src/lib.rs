@@ -1,9 +1,17 @@
 use pyo3::prelude::*;
 use iced::{Application, Settings, Theme, window};
+use std::sync::Arc;
+use std::time::Duration;
 
+mod plot;
+mod sweep;
 mod view;
+use sweep::SweepData;
 use view::Message;
 
+/// 输入停止变化多久后触发实时计算
+const DEBOUNCE_DELAY: Duration = Duration::from_millis(100);
+
 #[pyclass]
 #[derive(Clone, Default)]
 pub struct MicrowaveGUI {
@@ -14,6 +22,13 @@ pub struct MicrowaveGUI {
     z_load_imag: String,
     z0: String,
     result: String,
+    sweep: Option<Arc<SweepData>>,
+    calculating: bool,
+    calculation_id: u64,
+    worker_busy: bool,
+    recalc_pending: bool,
+    live_update: bool,
+    edit_generation: u64,
 }
 
 #[derive(Debug, Clone, Copy, PartialEq, Eq, Default)]
@@ -23,6 +38,73 @@ pub enum MatchingMethod {
     Stub,
 }
 
+impl MatchingMethod {
+    fn as_str(self) -> &'static str {
+        match self {
+            MatchingMethod::QuarterWave => "quarter_wave",
+            MatchingMethod::Stub => "stub",
+        }
+    }
+}
+
+/// 一次计算所需的输入快照，可以在后台线程中独立使用
+#[derive(Debug, Clone)]
+struct CalculationRequest {
+    frequency: String,
+    z0: String,
+    z_load_real: String,
+    z_load_imag: String,
+    matching_method: MatchingMethod,
+}
+
+/// 一次计算的结果：文字说明和可选的频率扫描数据
+#[derive(Debug, Clone)]
+pub struct CalculationOutput {
+    summary: String,
+    sweep: Option<Arc<SweepData>>,
+}
+
+impl CalculationOutput {
+    fn message(summary: impl Into<String>) -> Self {
+        CalculationOutput {
+            summary: summary.into(),
+            sweep: None,
+        }
+    }
+}
+
+/// 调用 Python 端完成参数验证和计算，会获取 GIL
+///
+/// Python 端返回 `DesignResult`，扫描数组通过缓冲区协议直接读取
+fn run_calculation(py_app: &PyObject, request: &CalculationRequest) -> PyResult<CalculationOutput> {
+    Python::with_gil(|py| {
+        let valid = py_app.call_method1(
+            py,
+            "validate_parameters",
+            (
+                &request.frequency,
+                &request.z0,
+                &request.z_load_real,
+                &request.z_load_imag,
+                request.matching_method.as_str(),
+            ),
+        )?;
+
+        if !valid.extract::<bool>(py)? {
+            return Ok(CalculationOutput::message("参数无效，请检查输入"));
+        }
+
+        let response = py_app.call_method0(py, "calculate_response")?;
+        let response = response.bind(py);
+        let summary = response.getattr("summary")?.extract::<String>()?;
+        let sweep = SweepData::from_buffer(&response.getattr("sweep")?)?;
+        Ok(CalculationOutput {
+            summary,
+            sweep: (!sweep.is_empty()).then(|| Arc::new(sweep)),
+        })
+    })
+}
+
 #[pymethods]
 impl MicrowaveGUI {
     #[new]
@@ -36,6 +118,13 @@ impl MicrowaveGUI {
             z_load_imag: String::new(),
             z0: String::new(),
             result: String::new(),
+            sweep: None,
+            calculating: false,
+            calculation_id: 0,
+            worker_busy: false,
+            recalc_pending: false,
+            live_update: true,
+            edit_generation: 0,
         }
     }
 
@@ -57,37 +146,111 @@ impl MicrowaveGUI {
 
     fn validate_and_calculate(&mut self) -> PyResult<()> {
         if let Some(ref py_app) = self.py_app {
-            Python::with_gil(|py| {
-                let matching_method = match self.matching_method {
-                    MatchingMethod::QuarterWave => "quarter_wave",
-                    MatchingMethod::Stub => "stub",
-                };
-
-                let valid = py_app.call_method1(
-                    py,
-                    "validate_parameters",
-                    (
-                        &self.frequency,
-                        &self.z0,
-                        &self.z_load_real,
-                        &self.z_load_imag,
-                        matching_method,
-                    ),
-                )?;
-
-                if valid.extract::<bool>(py)? {
-                    if let Ok(result) = py_app.call_method0(py, "calculate") {
-                        if let Ok(result_str) = result.extract::<String>(py) {
-                            self.result = result_str;
-                        }
-                    }
-                } else {
-                    self.result = "参数无效，请检查输入".to_string();
+            let request = self.calculation_request();
+            let output = run_calculation(py_app, &request)?;
+            self.result = output.summary;
+            self.sweep = output.sweep;
+        }
+        Ok(())
+    }
+}
+
+impl MicrowaveGUI {
+    fn calculation_request(&self) -> CalculationRequest {
+        CalculationRequest {
+            frequency: self.frequency.clone(),
+            z0: self.z0.clone(),
+            z_load_real: self.z_load_real.clone(),
+            z_load_imag: self.z_load_imag.clone(),
+            matching_method: self.matching_method,
+        }
+    }
+
+    /// 请求一次计算
+    ///
+    /// 同一时刻最多只有一个 Python 调用在运行：若已有调用在进行，
+    /// 先使其结果失效，待其结束后再用最新输入重新计算
+    fn request_calculation(&mut self) -> iced::Command<Message> {
+        self.calculation_id += 1;
+        self.calculating = true;
+        if self.worker_busy {
+            self.recalc_pending = true;
+            return iced::Command::none();
+        }
+        self.spawn_calculation()
+    }
+
+    /// 在阻塞线程池中执行计算，UI 线程只负责接收结果
+    fn spawn_calculation(&mut self) -> iced::Command<Message> {
+        let Some(py_app) = self.py_app.as_ref() else {
+            self.calculating = false;
+            return iced::Command::none();
+        };
+        let py_app = Python::with_gil(|py| py_app.clone_ref(py));
+        let request = self.calculation_request();
+        let id = self.calculation_id;
+        self.worker_busy = true;
+
+        iced::Command::perform(
+            async move {
+                tokio::task::spawn_blocking(move || {
+                    run_calculation(&py_app, &request).map_err(|e| e.to_string())
+                })
+                .await
+                .unwrap_or_else(|e| Err(e.to_string()))
+            },
+            move |outcome| Message::CalculationFinished(id, outcome),
+        )
+    }
+
+    fn finish_calculation(&mut self, id: u64, outcome: Result<CalculationOutput, String>) -> iced::Command<Message> {
+        self.worker_busy = false;
+        // 忽略已取消或已被新计算替代的结果
+        if id == self.calculation_id {
+            self.calculating = false;
+            match outcome {
+                Ok(output) => {
+                    self.result = output.summary;
+                    self.sweep = output.sweep;
                 }
-                Ok(())
-            })
-        } else {
-            Ok(())
+                Err(e) => {
+                    self.result = format!("计算错误: {}", e);
+                    self.sweep = None;
+                }
+            }
+        }
+        if self.recalc_pending {
+            self.recalc_pending = false;
+            return self.spawn_calculation();
+        }
+        iced::Command::none()
+    }
+
+    /// 输入变化后延迟触发计算，连续的编辑只会触发最后一次
+    fn schedule_recalculation(&mut self) -> iced::Command<Message> {
+        if !self.live_update {
+            return iced::Command::none();
+        }
+        self.edit_generation += 1;
+        let generation = self.edit_generation;
+        iced::Command::perform(
+            async move {
+                tokio::time::sleep(DEBOUNCE_DELAY).await;
+                generation
+            },
+            Message::DebounceElapsed,
+        )
+    }
+
+    /// 取消当前计算
+    ///
+    /// Python 端的调用无法被中断，这里只丢弃其结果，使界面立即恢复可用
+    fn cancel_calculation(&mut self) {
+        if self.calculating {
+            self.calculation_id += 1;
+            self.calculating = false;
+            self.recalc_pending = false;
+            self.result = "计算已取消".to_string();
         }
     }
 }
@@ -109,6 +272,13 @@ impl Application for MicrowaveGUI {
                 z_load_imag: String::new(),
                 z0: String::new(),
                 result: String::new(),
+                sweep: None,
+                calculating: false,
+                calculation_id: 0,
+                worker_busy: false,
+                recalc_pending: false,
+                live_update: true,
+                edit_generation: 0,
             },
             iced::Command::none()
         )
@@ -120,16 +290,36 @@ impl Application for MicrowaveGUI {
 
     fn update(&mut self, message: Message) -> iced::Command<Message> {
         match message {
-            Message::FrequencyChanged(value) => self.frequency = value,
-            Message::ZLoadRealChanged(value) => self.z_load_real = value,
-            Message::ZLoadImagChanged(value) => self.z_load_imag = value,
-            Message::Z0Changed(value) => self.z0 = value,
-            Message::MatchingMethodChanged(method) => self.matching_method = method,
-            Message::Calculate => {
-                if let Err(e) = self.validate_and_calculate() {
-                    self.result = format!("计算错误: {}", e);
+            Message::FrequencyChanged(value) => {
+                self.frequency = value;
+                return self.schedule_recalculation();
+            }
+            Message::ZLoadRealChanged(value) => {
+                self.z_load_real = value;
+                return self.schedule_recalculation();
+            }
+            Message::ZLoadImagChanged(value) => {
+                self.z_load_imag = value;
+                return self.schedule_recalculation();
+            }
+            Message::Z0Changed(value) => {
+                self.z0 = value;
+                return self.schedule_recalculation();
+            }
+            Message::MatchingMethodChanged(method) => {
+                self.matching_method = method;
+                return self.schedule_recalculation();
+            }
+            Message::LiveUpdateToggled(enabled) => self.live_update = enabled,
+            Message::DebounceElapsed(generation) => {
+                // 期间又有新的输入时，等待最后一次输入的延迟结束
+                if generation == self.edit_generation {
+                    return self.request_calculation();
                 }
             }
+            Message::Calculate => return self.request_calculation(),
+            Message::CancelCalculation => self.cancel_calculation(),
+            Message::CalculationFinished(id, outcome) => return self.finish_calculation(id, outcome),
         }
         iced::Command::none()
     }
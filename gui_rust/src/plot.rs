@@ -0,0 +1,496 @@
+use std::cell::Cell;
+use std::sync::Arc;
+
+use iced::mouse;
+use iced::widget::canvas::{self, event, Cache, Event, Frame, Geometry, Path, Stroke, Text};
+use iced::{Color, Pixels, Point, Rectangle, Renderer, Size, Theme, Vector};
+
+use crate::sweep::SweepData;
+use crate::view::Message;
+
+const MARGIN_LEFT: f32 = 52.0;
+const MARGIN_RIGHT: f32 = 12.0;
+const MARGIN_TOP: f32 = 24.0;
+const MARGIN_BOTTOM: f32 = 22.0;
+const SMITH_MARGIN: f32 = 8.0;
+/// 史密斯圆图在未缩放时显示的反射系数范围
+const SMITH_EXTENT: f32 = 1.1;
+const MAX_ZOOM: f32 = 10_000.0;
+/// 显示时 VSWR 的上限，完全反射点不会压扁整条曲线
+const VSWR_CLIP: f64 = 100.0;
+/// S11 显示的最低值 (dB)
+const S11_FLOOR_DB: f64 = -100.0;
+
+const TRACE_COLOR: Color = Color::from_rgb(0.15, 0.4, 0.85);
+const GRID_COLOR: Color = Color::from_rgba(0.5, 0.5, 0.5, 0.45);
+const LABEL_COLOR: Color = Color::from_rgb(0.35, 0.35, 0.35);
+const MARKER_COLOR: Color = Color::from_rgb(0.85, 0.2, 0.2);
+
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum ChartKind {
+    S11Magnitude,
+    Vswr,
+    Smith,
+}
+
+impl ChartKind {
+    fn title(self) -> &'static str {
+        match self {
+            ChartKind::S11Magnitude => "|S11| (dB)",
+            ChartKind::Vswr => "VSWR",
+            ChartKind::Smith => "史密斯圆图",
+        }
+    }
+}
+
+/// 直接由扫描数组绘制的响应曲线
+///
+/// 几何图形缓存在 `ChartState` 中，只有数据、尺寸或视图变化时才重新细分，
+/// 曲线在绘制前按像素列抽取，绘制开销与数据点数无关
+pub struct ResponseChart {
+    data: Arc<SweepData>,
+    kind: ChartKind,
+}
+
+impl ResponseChart {
+    pub fn new(data: Arc<SweepData>, kind: ChartKind) -> Self {
+        ResponseChart { data, kind }
+    }
+
+    fn y_values(&self) -> Vec<f64> {
+        match self.kind {
+            ChartKind::S11Magnitude => self
+                .data
+                .s11_real
+                .iter()
+                .zip(&self.data.s11_imag)
+                .map(|(re, im)| (20.0 * re.hypot(*im).log10()).max(S11_FLOOR_DB))
+                .collect(),
+            _ => self
+                .data
+                .vswr
+                .iter()
+                .map(|v| if v.is_finite() { v.min(VSWR_CLIP) } else { VSWR_CLIP })
+                .collect(),
+        }
+    }
+
+    fn draw_xy(&self, frame: &mut Frame, state: &ChartState) {
+        let plot = xy_plot_area(frame.size());
+        draw_label(frame, self.kind.title(), Point::new(MARGIN_LEFT, 4.0));
+        frame.stroke(
+            &Path::rectangle(plot.position(), plot.size()),
+            Stroke::default().with_color(GRID_COLOR),
+        );
+
+        let xs = &self.data.frequency;
+        if xs.is_empty() {
+            return;
+        }
+        let (x_lo, x_hi) = state.x_window(xs[0], xs[xs.len() - 1]);
+        let points = decimate_min_max(xs, &self.y_values(), x_lo, x_hi, plot.width as usize);
+        let Some((y_lo, y_hi)) = y_range(&points) else {
+            return;
+        };
+
+        let x_span = (x_hi - x_lo).max(f64::MIN_POSITIVE);
+        let to_screen = |(x, y): (f64, f64)| {
+            Point::new(
+                plot.x + ((x - x_lo) / x_span) as f32 * plot.width,
+                plot.y + ((y_hi - y) / (y_hi - y_lo)) as f32 * plot.height,
+            )
+        };
+        let trace = Path::new(|builder| {
+            let mut screen = points.iter().map(|&point| to_screen(point));
+            if let Some(first) = screen.next() {
+                builder.move_to(first);
+                screen.for_each(|point| builder.line_to(point));
+            }
+        });
+        frame.stroke(&trace, Stroke::default().with_color(TRACE_COLOR).with_width(1.5));
+
+        draw_label(frame, &format!("{:.2}", y_hi), Point::new(4.0, plot.y));
+        draw_label(frame, &format!("{:.2}", y_lo), Point::new(4.0, plot.y + plot.height - 12.0));
+        let bottom = plot.y + plot.height + 4.0;
+        draw_label(frame, &format!("{:.3} GHz", x_lo / 1e9), Point::new(plot.x, bottom));
+        draw_label(
+            frame,
+            &format!("{:.3} GHz", x_hi / 1e9),
+            Point::new(plot.x + plot.width - 70.0, bottom),
+        );
+    }
+
+    fn draw_smith(&self, frame: &mut Frame, state: &ChartState) {
+        let transform = SmithTransform::new(frame.size(), state);
+        draw_label(frame, self.kind.title(), Point::new(4.0, 4.0));
+
+        let grid = Stroke::default().with_color(GRID_COLOR);
+        frame.stroke(&Path::circle(transform.to_screen(0.0, 0.0), transform.scale), grid.clone());
+        frame.stroke(
+            &Path::line(transform.to_screen(-1.0, 0.0), transform.to_screen(1.0, 0.0)),
+            grid.clone(),
+        );
+        // 等电阻圆
+        for r in [0.2_f64, 0.5, 1.0, 2.0, 5.0] {
+            let center = transform.to_screen(r / (1.0 + r), 0.0);
+            frame.stroke(&Path::circle(center, transform.scale / (1.0 + r) as f32), grid.clone());
+        }
+        // 等电抗圆弧，沿电阻取样后映射到反射系数平面
+        for x in [0.2_f64, 0.5, 1.0, 2.0, 5.0, -0.2, -0.5, -1.0, -2.0, -5.0] {
+            let arc = Path::new(|builder| {
+                for (i, r) in REACTANCE_ARC_SAMPLES.iter().enumerate() {
+                    let denominator = (r + 1.0).powi(2) + x * x;
+                    let point = transform.to_screen(
+                        (r * r - 1.0 + x * x) / denominator,
+                        2.0 * x / denominator,
+                    );
+                    if i == 0 {
+                        builder.move_to(point);
+                    } else {
+                        builder.line_to(point);
+                    }
+                }
+            });
+            frame.stroke(&arc, grid.clone());
+        }
+
+        let data = &self.data;
+        if data.is_empty() {
+            return;
+        }
+        let points = decimate_by_distance(&data.s11_real, &data.s11_imag, 0.75 / transform.scale as f64);
+        let trace = Path::new(|builder| {
+            let mut screen = points.iter().map(|&(re, im)| transform.to_screen(re, im));
+            if let Some(first) = screen.next() {
+                builder.move_to(first);
+                screen.for_each(|point| builder.line_to(point));
+            }
+        });
+        frame.stroke(&trace, Stroke::default().with_color(TRACE_COLOR).with_width(1.5));
+
+        // 标出扫描中心（设计频率）对应的点
+        let center = data.len() / 2;
+        frame.fill(
+            &Path::circle(transform.to_screen(data.s11_real[center], data.s11_imag[center]), 3.5),
+            MARKER_COLOR,
+        );
+    }
+}
+
+const REACTANCE_ARC_SAMPLES: [f64; 18] = [
+    0.0, 0.05, 0.1, 0.2, 0.35, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 8.0, 12.0, 20.0, 50.0, 200.0, 1e4,
+];
+
+/// 每个图表的交互状态和几何缓存
+pub struct ChartState {
+    /// 缩放倍数，1.0 表示显示全部数据
+    zoom: f32,
+    /// 平移量：曲线图为频率窗口中心相对全范围中点的偏移（归一化），
+    /// 史密斯圆图为视图中心的反射系数坐标
+    pan: Vector,
+    drag_origin: Option<Point>,
+    cache: Cache,
+    data_id: Cell<usize>,
+}
+
+impl Default for ChartState {
+    fn default() -> Self {
+        ChartState {
+            zoom: 1.0,
+            pan: Vector::new(0.0, 0.0),
+            drag_origin: None,
+            cache: Cache::new(),
+            data_id: Cell::new(0),
+        }
+    }
+}
+
+impl ChartState {
+    /// 可见频率窗口在全范围中的位置 (起点, 宽度)，均为归一化值
+    fn x_fraction(&self) -> (f32, f32) {
+        let width = 1.0 / self.zoom;
+        let start = (0.5 + self.pan.x - width / 2.0).clamp(0.0, 1.0 - width);
+        (start, width)
+    }
+
+    fn x_window(&self, x_min: f64, x_max: f64) -> (f64, f64) {
+        let (start, width) = self.x_fraction();
+        let span = x_max - x_min;
+        let lo = x_min + start as f64 * span;
+        (lo, lo + width as f64 * span)
+    }
+
+    fn set_x_fraction(&mut self, start: f32, width: f32) {
+        self.zoom = (1.0 / width).clamp(1.0, MAX_ZOOM);
+        self.pan.x = start + width / 2.0 - 0.5;
+        let (start, width) = self.x_fraction();
+        self.pan.x = start + width / 2.0 - 0.5;
+    }
+
+    fn zoom_at(&mut self, kind: ChartKind, position: Point, size: Size, factor: f32) {
+        match kind {
+            ChartKind::Smith => {
+                let transform = SmithTransform::new(size, self);
+                let (re, im) = transform.to_gamma(position);
+                self.zoom = (self.zoom * factor).clamp(1.0, MAX_ZOOM);
+                let transform = SmithTransform::new(size, self);
+                let (new_re, new_im) = transform.to_gamma(position);
+                self.pan.x += (re - new_re) as f32;
+                self.pan.y += (im - new_im) as f32;
+            }
+            _ => {
+                let plot = xy_plot_area(size);
+                let cursor = ((position.x - plot.x) / plot.width).clamp(0.0, 1.0);
+                let (start, width) = self.x_fraction();
+                let anchor = start + cursor * width;
+                let new_width = 1.0 / (self.zoom * factor).clamp(1.0, MAX_ZOOM);
+                self.set_x_fraction(anchor - cursor * new_width, new_width);
+            }
+        }
+    }
+
+    fn pan_by(&mut self, kind: ChartKind, delta: Vector, size: Size) {
+        match kind {
+            ChartKind::Smith => {
+                let scale = SmithTransform::new(size, self).scale;
+                self.pan.x -= delta.x / scale;
+                self.pan.y += delta.y / scale;
+            }
+            _ => {
+                let plot = xy_plot_area(size);
+                let (start, width) = self.x_fraction();
+                self.set_x_fraction(start - delta.x / plot.width * width, width);
+            }
+        }
+    }
+
+    fn reset(&mut self) {
+        self.zoom = 1.0;
+        self.pan = Vector::new(0.0, 0.0);
+    }
+}
+
+impl canvas::Program<Message> for ResponseChart {
+    type State = ChartState;
+
+    fn update(
+        &self,
+        state: &mut ChartState,
+        event: Event,
+        bounds: Rectangle,
+        cursor: mouse::Cursor,
+    ) -> (event::Status, Option<Message>) {
+        let Event::Mouse(mouse_event) = event else {
+            return (event::Status::Ignored, None);
+        };
+        if let mouse::Event::ButtonReleased(mouse::Button::Left) = mouse_event {
+            state.drag_origin = None;
+            return (event::Status::Ignored, None);
+        }
+        let Some(position) = cursor.position_in(bounds) else {
+            return (event::Status::Ignored, None);
+        };
+
+        match mouse_event {
+            mouse::Event::WheelScrolled { delta } => {
+                let steps = match delta {
+                    mouse::ScrollDelta::Lines { y, .. } => y,
+                    mouse::ScrollDelta::Pixels { y, .. } => y / 60.0,
+                };
+                state.zoom_at(self.kind, position, bounds.size(), 1.2_f32.powf(steps));
+            }
+            mouse::Event::ButtonPressed(mouse::Button::Left) => {
+                state.drag_origin = Some(position);
+                return (event::Status::Captured, None);
+            }
+            mouse::Event::ButtonPressed(mouse::Button::Right) => state.reset(),
+            mouse::Event::CursorMoved { .. } => {
+                let Some(origin) = state.drag_origin else {
+                    return (event::Status::Ignored, None);
+                };
+                state.pan_by(self.kind, position - origin, bounds.size());
+                state.drag_origin = Some(position);
+            }
+            _ => return (event::Status::Ignored, None),
+        }
+        state.cache.clear();
+        (event::Status::Captured, None)
+    }
+
+    fn draw(
+        &self,
+        state: &ChartState,
+        renderer: &Renderer,
+        _theme: &Theme,
+        bounds: Rectangle,
+        _cursor: mouse::Cursor,
+    ) -> Vec<Geometry> {
+        // 每次计算产生新的 Arc，据此判断数据是否变化
+        let data_id = Arc::as_ptr(&self.data) as usize;
+        if state.data_id.replace(data_id) != data_id {
+            state.cache.clear();
+        }
+
+        let geometry = state.cache.draw(renderer, bounds.size(), |frame| match self.kind {
+            ChartKind::Smith => self.draw_smith(frame, state),
+            _ => self.draw_xy(frame, state),
+        });
+        vec![geometry]
+    }
+
+    fn mouse_interaction(
+        &self,
+        state: &ChartState,
+        bounds: Rectangle,
+        cursor: mouse::Cursor,
+    ) -> mouse::Interaction {
+        if state.drag_origin.is_some() {
+            mouse::Interaction::Grabbing
+        } else if cursor.is_over(bounds) {
+            mouse::Interaction::Grab
+        } else {
+            mouse::Interaction::default()
+        }
+    }
+}
+
+/// 史密斯圆图的反射系数平面与屏幕坐标之间的变换
+struct SmithTransform {
+    center: Point,
+    /// 每单位反射系数对应的像素数
+    scale: f32,
+    pan: Vector,
+}
+
+impl SmithTransform {
+    fn new(size: Size, state: &ChartState) -> Self {
+        let side = (size.width.min(size.height) - 2.0 * SMITH_MARGIN).max(1.0);
+        SmithTransform {
+            center: Point::new(size.width / 2.0, size.height / 2.0),
+            scale: side / 2.0 / (SMITH_EXTENT / state.zoom),
+            pan: state.pan,
+        }
+    }
+
+    fn to_screen(&self, re: f64, im: f64) -> Point {
+        Point::new(
+            self.center.x + (re as f32 - self.pan.x) * self.scale,
+            self.center.y - (im as f32 - self.pan.y) * self.scale,
+        )
+    }
+
+    fn to_gamma(&self, point: Point) -> (f64, f64) {
+        (
+            (self.pan.x + (point.x - self.center.x) / self.scale) as f64,
+            (self.pan.y - (point.y - self.center.y) / self.scale) as f64,
+        )
+    }
+}
+
+fn xy_plot_area(size: Size) -> Rectangle {
+    Rectangle::new(
+        Point::new(MARGIN_LEFT, MARGIN_TOP),
+        Size::new(
+            (size.width - MARGIN_LEFT - MARGIN_RIGHT).max(1.0),
+            (size.height - MARGIN_TOP - MARGIN_BOTTOM).max(1.0),
+        ),
+    )
+}
+
+fn draw_label(frame: &mut Frame, content: &str, position: Point) {
+    frame.fill_text(Text {
+        content: content.to_string(),
+        position,
+        color: LABEL_COLOR,
+        size: Pixels(11.0),
+        ..Text::default()
+    });
+}
+
+/// 带 5% 余量的纵轴范围，没有有效数据点时返回 None
+fn y_range(points: &[(f64, f64)]) -> Option<(f64, f64)> {
+    let (lo, hi) = points
+        .iter()
+        .map(|&(_, y)| y)
+        .filter(|y| y.is_finite())
+        .fold((f64::INFINITY, f64::NEG_INFINITY), |(lo, hi), y| (lo.min(y), hi.max(y)));
+    if lo > hi {
+        return None;
+    }
+    let pad = if hi > lo { 0.05 * (hi - lo) } else { 1.0 };
+    Some((lo - pad, hi + pad))
+}
+
+/// 按像素列抽取曲线：每列只保留最小值和最大值两个点
+///
+/// `xs` 必须单调递增。结果点数不超过 `2 * columns`，
+/// 且保留了每列的峰谷，因此与逐点绘制在屏幕上没有差别
+pub fn decimate_min_max(
+    xs: &[f64],
+    ys: &[f64],
+    x_lo: f64,
+    x_hi: f64,
+    columns: usize,
+) -> Vec<(f64, f64)> {
+    let start = xs.partition_point(|&x| x < x_lo);
+    let end = xs.partition_point(|&x| x <= x_hi).min(ys.len());
+    if end <= start {
+        return Vec::new();
+    }
+    let columns = columns.max(1);
+    if end - start <= 2 * columns {
+        return (start..end).map(|i| (xs[i], ys[i])).collect();
+    }
+
+    let span = (x_hi - x_lo).max(f64::MIN_POSITIVE);
+    let mut points = Vec::with_capacity(2 * columns);
+    let mut bucket = usize::MAX;
+    let (mut min_i, mut max_i) = (start, start);
+    for i in start..end {
+        let b = (((xs[i] - x_lo) / span * columns as f64) as usize).min(columns - 1);
+        if b != bucket {
+            if bucket != usize::MAX {
+                push_bucket(&mut points, xs, ys, min_i, max_i);
+            }
+            bucket = b;
+            min_i = i;
+            max_i = i;
+        } else {
+            if ys[i] < ys[min_i] {
+                min_i = i;
+            }
+            if ys[i] > ys[max_i] {
+                max_i = i;
+            }
+        }
+    }
+    push_bucket(&mut points, xs, ys, min_i, max_i);
+    points
+}
+
+fn push_bucket(points: &mut Vec<(f64, f64)>, xs: &[f64], ys: &[f64], a: usize, b: usize) {
+    let (first, second) = if a <= b { (a, b) } else { (b, a) };
+    points.push((xs[first], ys[first]));
+    if second != first {
+        points.push((xs[second], ys[second]));
+    }
+}
+
+/// 丢弃与上一个保留点距离小于 `min_distance` 的点，首尾点总是保留
+pub fn decimate_by_distance(re: &[f64], im: &[f64], min_distance: f64) -> Vec<(f64, f64)> {
+    let n = re.len().min(im.len());
+    let mut points = Vec::new();
+    if n == 0 {
+        return points;
+    }
+    let threshold = min_distance * min_distance;
+    points.push((re[0], im[0]));
+    for i in 1..n {
+        let (last_re, last_im) = points[points.len() - 1];
+        let distance = (re[i] - last_re).powi(2) + (im[i] - last_im).powi(2);
+        if distance >= threshold || i == n - 1 {
+            points.push((re[i], im[i]));
+        }
+    }
+    points
+}
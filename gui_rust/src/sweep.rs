@@ -0,0 +1,71 @@
+use pyo3::buffer::PyBuffer;
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+
+/// 扫描数组的列数，与 Python 端 `src.gui.result.SWEEP_COLUMNS` 保持一致
+pub const SWEEP_COLUMNS: usize = 6;
+
+/// 按列存放的频率扫描结果
+#[derive(Debug, Clone, Default, PartialEq)]
+pub struct SweepData {
+    pub frequency: Vec<f64>,
+    pub s11_real: Vec<f64>,
+    pub s11_imag: Vec<f64>,
+    pub s21_real: Vec<f64>,
+    pub s21_imag: Vec<f64>,
+    pub vswr: Vec<f64>,
+}
+
+impl SweepData {
+    pub fn len(&self) -> usize {
+        self.frequency.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.frequency.is_empty()
+    }
+
+    /// 从行优先的扁平数组构造，每行依次为
+    /// frequency, s11_real, s11_imag, s21_real, s21_imag, vswr
+    pub fn from_rows(mut values: impl ExactSizeIterator<Item = f64>) -> Self {
+        let n = values.len() / SWEEP_COLUMNS;
+        let mut data = SweepData {
+            frequency: Vec::with_capacity(n),
+            s11_real: Vec::with_capacity(n),
+            s11_imag: Vec::with_capacity(n),
+            s21_real: Vec::with_capacity(n),
+            s21_imag: Vec::with_capacity(n),
+            vswr: Vec::with_capacity(n),
+        };
+        for _ in 0..n {
+            for column in [
+                &mut data.frequency,
+                &mut data.s11_real,
+                &mut data.s11_imag,
+                &mut data.s21_real,
+                &mut data.s21_imag,
+                &mut data.vswr,
+            ] {
+                column.extend(values.next());
+            }
+        }
+        data
+    }
+
+    /// 通过缓冲区协议直接读取 Python 端的 float64 数组，不经过字符串或 Python 列表
+    pub fn from_buffer(obj: &Bound<'_, PyAny>) -> PyResult<Self> {
+        let buffer = PyBuffer::<f64>::get_bound(obj)?;
+        let shape = buffer.shape();
+        if buffer.dimensions() != 2 || shape[1] != SWEEP_COLUMNS {
+            return Err(PyValueError::new_err(format!(
+                "扫描数组形状必须为 (N, {})",
+                SWEEP_COLUMNS
+            )));
+        }
+
+        let cells = buffer
+            .as_slice(obj.py())
+            .ok_or_else(|| PyValueError::new_err("扫描数组必须是C连续的"))?;
+        Ok(Self::from_rows(cells.iter().map(|cell| cell.get())))
+    }
+}
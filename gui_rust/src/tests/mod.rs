@@ -6,6 +6,8 @@ pub mod theme_tests;
 pub mod error_handling_tests;
 pub mod python_interaction_tests;
 pub mod performance_tests;
+pub mod sweep_tests;
+pub mod plot_tests;
 
 use std::sync::Once;
 
@@ -0,0 +1,56 @@
+use crate::plot::{decimate_by_distance, decimate_min_max};
+use std::time::Instant;
+
+#[test]
+fn test_decimate_keeps_small_traces() {
+    let xs = [1.0, 2.0, 3.0];
+    let ys = [4.0, 5.0, 6.0];
+    let points = decimate_min_max(&xs, &ys, 0.0, 10.0, 100);
+    assert_eq!(points, vec![(1.0, 4.0), (2.0, 5.0), (3.0, 6.0)]);
+}
+
+#[test]
+fn test_decimate_preserves_peaks() {
+    let n = 100_000;
+    let xs: Vec<f64> = (0..n).map(|i| i as f64).collect();
+    let mut ys = vec![0.0; n];
+    ys[12_345] = 10.0;
+    ys[54_321] = -10.0;
+
+    let points = decimate_min_max(&xs, &ys, 0.0, (n - 1) as f64, 800);
+    assert!(points.len() <= 1600);
+    assert!(points.contains(&(12_345.0, 10.0)));
+    assert!(points.contains(&(54_321.0, -10.0)));
+}
+
+#[test]
+fn test_decimate_visible_window() {
+    let xs: Vec<f64> = (0..1000).map(|i| i as f64).collect();
+    let points = decimate_min_max(&xs, &xs, 100.0, 199.0, 1000);
+    assert_eq!(points.len(), 100);
+    assert_eq!(points[0], (100.0, 100.0));
+}
+
+#[test]
+fn test_decimate_by_distance() {
+    let re: Vec<f64> = (0..1000).map(|i| i as f64 * 1e-4).collect();
+    let im = vec![0.0; 1000];
+    let points = decimate_by_distance(&re, &im, 0.01);
+    assert!(points.len() < 20);
+    assert_eq!(points[0], (0.0, 0.0));
+    assert_eq!(points[points.len() - 1], (re[999], 0.0));
+}
+
+#[test]
+fn test_decimate_large_trace_performance() {
+    let n = 100_000;
+    let xs: Vec<f64> = (0..n).map(|i| i as f64).collect();
+    let ys: Vec<f64> = xs.iter().map(|x| (x * 0.01).sin()).collect();
+
+    let start = Instant::now();
+    for _ in 0..60 {
+        decimate_min_max(&xs, &ys, 0.0, n as f64, 1000);
+    }
+    let duration = start.elapsed();
+    println!("10万点曲线抽取60帧耗时: {:?}", duration);
+}
@@ -0,0 +1,25 @@
+use crate::sweep::{SweepData, SWEEP_COLUMNS};
+
+#[test]
+fn test_from_rows_splits_columns() {
+    let rows: Vec<f64> = (0..3 * SWEEP_COLUMNS).map(|i| i as f64).collect();
+    let data = SweepData::from_rows(rows.into_iter());
+
+    assert_eq!(data.len(), 3);
+    assert_eq!(data.frequency, vec![0.0, 6.0, 12.0]);
+    assert_eq!(data.s11_real, vec![1.0, 7.0, 13.0]);
+    assert_eq!(data.vswr, vec![5.0, 11.0, 17.0]);
+}
+
+#[test]
+fn test_from_rows_ignores_partial_row() {
+    let rows: Vec<f64> = (0..SWEEP_COLUMNS + 2).map(|i| i as f64).collect();
+    let data = SweepData::from_rows(rows.into_iter());
+    assert_eq!(data.len(), 1);
+}
+
+#[test]
+fn test_empty_sweep() {
+    let data = SweepData::from_rows(std::iter::empty::<f64>());
+    assert!(data.is_empty());
+}
@@ -1,9 +1,20 @@
+use std::sync::Arc;
+
 use iced::{
-    widget::{button, column, container, radio, row, scrollable, text, text_input, tooltip, Space},
+    widget::{button, canvas, checkbox, column, container, radio, row, scrollable, text, text_input, tooltip, Space},
     Alignment, Length, Element,
 };
 
-use crate::{MicrowaveGUI, MatchingMethod};
+use crate::plot::{ChartKind, ResponseChart};
+use crate::sweep::SweepData;
+use crate::{CalculationOutput, MicrowaveGUI, MatchingMethod};
+
+fn chart<'a>(data: &Arc<SweepData>, kind: ChartKind, width: Length, height: f32) -> Element<'a, Message> {
+    canvas(ResponseChart::new(data.clone(), kind))
+        .width(width)
+        .height(Length::Fixed(height))
+        .into()
+}
 
 impl MicrowaveGUI {
     pub(crate) fn view_content(&self) -> Element<Message> {
@@ -83,22 +94,39 @@ impl MicrowaveGUI {
                         tooltip::Position::Bottom,
                     )
                 ]
-                .spacing(10)
+                .spacing(10),
+                checkbox("实时计算", self.live_update)
+                    .on_toggle(Message::LiveUpdateToggled)
             ]
             .spacing(10)
             .padding(10)
         );
 
-        let calculate_button = container(
-            tooltip(
-                button("计算")
-                    .on_press(Message::Calculate)
-                    .width(Length::Fill)
-                    .padding(10),
-                "计算匹配网络",
-                tooltip::Position::Bottom,
+        let calculate_button = if self.calculating {
+            container(
+                row![
+                    button("计算中...")
+                        .width(Length::FillPortion(3))
+                        .padding(10),
+                    button("取消")
+                        .on_press(Message::CancelCalculation)
+                        .width(Length::FillPortion(1))
+                        .padding(10),
+                ]
+                .spacing(10)
             )
-        )
+        } else {
+            container(
+                tooltip(
+                    button("计算")
+                        .on_press(Message::Calculate)
+                        .width(Length::Fill)
+                        .padding(10),
+                    "计算匹配网络",
+                    tooltip::Position::Bottom,
+                )
+            )
+        }
         .width(Length::Fill)
         .padding(10);
 
@@ -113,6 +141,25 @@ impl MicrowaveGUI {
             container(text("")).padding(0)
         };
 
+        let chart_section = match &self.sweep {
+            Some(sweep) => container(
+                column![
+                    row![
+                        chart(sweep, ChartKind::S11Magnitude, Length::FillPortion(1), 240.0),
+                        chart(sweep, ChartKind::Vswr, Length::FillPortion(1), 240.0),
+                    ]
+                    .spacing(10),
+                    chart(sweep, ChartKind::Smith, Length::Fixed(360.0), 360.0),
+                    text("滚轮缩放，左键拖动平移，右键复位").size(12),
+                ]
+                .spacing(10)
+                .align_items(Alignment::Center)
+            )
+            .width(Length::Fill)
+            .padding(10),
+            None => container(text("")).padding(0),
+        };
+
         scrollable(
             column![
                 title,
@@ -123,6 +170,7 @@ impl MicrowaveGUI {
                 Space::with_height(Length::Fixed(20.0)),
                 calculate_button,
                 result_section,
+                chart_section,
             ]
             .spacing(10)
             .padding(20)
@@ -140,5 +188,9 @@ pub enum Message {
     ZLoadImagChanged(String),
     Z0Changed(String),
     MatchingMethodChanged(MatchingMethod),
+    LiveUpdateToggled(bool),
+    DebounceElapsed(u64),
     Calculate,
+    CancelCalculation,
+    CalculationFinished(u64, Result<CalculationOutput, String>),
 } 
\ No newline at end of file
@@ -21,6 +21,9 @@ setup(
         "setuptools_rust"
     ],
     extras_require={
+        "fast": [
+            "numba"
+        ],
         "dev": [
             "pytest",
             "pytest-cov",
@@ -1,10 +1,6 @@
 """程序入口点"""
-from src.gui.main import MicrowaveDesignApp
-
-def main():
-    """主函数"""
-    app = MicrowaveDesignApp()
-    app.run()
+import sys
+from src.cli import main
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""命令行入口模块
+
+``batch``/``sweep`` 子命令只依赖 numpy，不会导入GUI、matplotlib或Rust扩展，
+适合在无界面的计算节点上运行。
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+from src import instrumentation
+from src.impedance_matching.batch import PRECISIONS
+from src.impedance_matching.kernels import KERNELS
+from src.impedance_matching.parallel import process_pool, solve_shared
+from src.impedance_matching.synthesis import MicrostripSynthesizer, Substrate, synthesize_solution
+from src.optimization.validation import OPTIMIZATION_TARGETS, ValidationResult, validate_arrays
+
+INPUT_COLUMNS = ("freq", "z0", "z_load_real", "z_load_imag")
+MAX_REPORTED_ERRORS = 20  # 跳过无效作业时最多逐行列出的条数
+
+
+def load_job_spec(path: str, default_z0: float = 50.0, validate: bool = True) -> Dict[str, np.ndarray]:
+    """
+    读取作业描述文件
+
+    CSV 文件每行一个作业，表头包含 freq、z_load_real、z_load_imag，z0 可选；
+    JSON 文件给出 frequencies 和 loads 列表，按两者的笛卡尔积生成作业。
+
+    参数:
+        path: str, 作业文件路径 (.csv 或 .json)
+        default_z0: float, 文件未给出特征阻抗时使用的值 (Ω)
+        validate: bool, 是否检查参数，存在无效行时抛出 ValueError
+
+    返回:
+        Dict[str, np.ndarray]: 按 INPUT_COLUMNS 组织的参数列
+    """
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            spec = json.load(f)
+        frequencies = np.asarray(spec["frequencies"], dtype=float)
+        loads = np.asarray([complex(*load) if isinstance(load, (list, tuple)) else complex(load)
+                            for load in spec["loads"]])
+        freq_grid, load_grid = np.meshgrid(frequencies, loads, indexing="ij")
+        columns = {
+            "freq": freq_grid.ravel(),
+            "z_load_real": load_grid.real.ravel(),
+            "z_load_imag": load_grid.imag.ravel()
+        }
+        columns["z0"] = np.full(columns["freq"].shape, float(spec.get("z0", default_z0)))
+    else:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = [name.strip() for name in next(reader)]
+            rows = np.array([[float(value) for value in row] for row in reader if row], dtype=float)
+        rows = rows.reshape(-1, len(header))
+        missing = {"freq", "z_load_real", "z_load_imag"} - set(header)
+        if missing:
+            raise ValueError(f"作业文件缺少列: {', '.join(sorted(missing))}")
+        columns = {name: rows[:, header.index(name)] for name in header if name in INPUT_COLUMNS}
+        if "z0" not in columns:
+            columns["z0"] = np.full(len(rows), default_z0)
+
+    jobs = {name: columns[name] for name in INPUT_COLUMNS}
+    if validate:
+        validate_jobs(jobs).raise_if_invalid()
+    return jobs
+
+
+def validate_jobs(jobs: Dict[str, np.ndarray]) -> ValidationResult:
+    """
+    批量检查作业参数
+
+    参数:
+        jobs: Dict[str, np.ndarray], 按 INPUT_COLUMNS 组织的参数列
+
+    返回:
+        ValidationResult: 有效行掩码和错误码
+    """
+    return validate_arrays(jobs["freq"], jobs["z0"], jobs["z_load_real"], jobs["z_load_imag"])
+
+
+def solve_jobs(jobs: Dict[str, np.ndarray], methods: Sequence[str], workers: int = 1,
+               chunk_size: int = 100_000,
+               synthesizer: Optional[MicrostripSynthesizer] = None,
+               precision: str = "double") -> Dict[str, np.ndarray]:
+    """
+    批量求解作业
+
+    参数:
+        jobs: Dict[str, np.ndarray], 按 INPUT_COLUMNS 组织的参数列
+        methods: Sequence[str], 匹配方法列表
+        workers: int, 并行进程数，为1时在当前进程计算；多进程时输入和结果经共享内存传递
+        chunk_size: int, 每个任务块的作业数
+        synthesizer: Optional[MicrostripSynthesizer], 给出时增加微带线宽度和物理长度列
+        precision: str, 计算精度，single 时结果列为 float32，误差界见 ``batch`` 模块
+
+    返回:
+        Dict[str, np.ndarray]: 输入列加上以方法名为前缀的结果列
+    """
+    freq = jobs["freq"]
+    z0 = jobs["z0"]
+    zl = jobs["z_load_real"] + 1j * jobs["z_load_imag"]
+
+    results: Dict[str, np.ndarray] = dict(jobs)
+    executor = None
+    if workers > 1 and len(freq) > chunk_size:
+        executor = process_pool(workers)
+    try:
+        for method in methods:
+            with instrumentation.stage(f"solve_{method}"):
+                solution = solve_shared(method, freq, z0, zl, chunk_size=chunk_size,
+                                        precision=precision, executor=executor)
+            if synthesizer is not None:
+                with instrumentation.stage("synthesis"):
+                    solution.update(synthesize_solution(synthesizer, method, freq, z0, solution))
+            for key, values in solution.items():
+                if np.iscomplexobj(values):
+                    results[f"{method}_{key}_real"] = values.real
+                    results[f"{method}_{key}_imag"] = values.imag
+                else:
+                    results[f"{method}_{key}"] = values
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return results
+
+
+def write_results(results: Dict[str, np.ndarray], path: str) -> None:
+    """
+    按列写出结果
+
+    参数:
+        results: Dict[str, np.ndarray], 结果列
+        path: str, 输出路径，.npz 写为 numpy 归档，其他扩展名写为 CSV
+    """
+    save_dir = os.path.dirname(path)
+    if save_dir:
+        os.makedirs(save_dir, exist_ok=True)
+    if path.endswith(".npz"):
+        np.savez(path, **results)
+    else:
+        names = list(results)
+        # 单精度列只写出其有效位数
+        fmt = ["%.8g" if results[name].dtype == np.float32 else "%.10g" for name in names]
+        np.savetxt(path, np.column_stack([results[name] for name in names]),
+                   delimiter=",", header=",".join(names), comments="", fmt=fmt)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """构造命令行参数解析器"""
+    parser = argparse.ArgumentParser(prog="python -m src", description="微波阻抗匹配设计工具")
+    subparsers = parser.add_subparsers(dest="command")
+
+    subparsers.add_parser("gui", help="启动图形界面（默认）")
+
+    batch = subparsers.add_parser("batch", aliases=["sweep"], help="无界面批量计算")
+    batch.add_argument("spec", help="作业文件 (.csv 或 .json)")
+    batch.add_argument("-o", "--output", required=True, help="结果文件 (.csv 或 .npz)")
+    batch.add_argument("-m", "--method", action="append", choices=sorted(KERNELS),
+                       help="匹配方法，可重复指定，默认全部")
+    batch.add_argument("--z0", type=float, default=50.0, help="作业文件未给出时的特征阻抗 (Ω)")
+    batch.add_argument("-j", "--workers", type=int, default=1, help="并行进程数")
+    batch.add_argument("--chunk-size", type=int, default=100_000, help="每个任务块的作业数")
+    batch.add_argument("--precision", choices=sorted(PRECISIONS), default="double",
+                       help="计算精度，single 用于大规模初筛，内存和输出减半")
+    batch.add_argument("--skip-invalid", action="store_true",
+                       help="跳过无效作业并报告，而不是在第一个无效作业处停止")
+    batch.add_argument("--eps-r", type=float, help="基板相对介电常数，给出时输出微带线宽度和物理长度")
+    batch.add_argument("--substrate-height", type=float, default=1.6e-3, help="基板介质厚度 (m)")
+    batch.add_argument("--trace-thickness", type=float, default=35e-6, help="导带厚度 (m)")
+    batch.add_argument("--synthesis-cache", metavar="DIR", help="微带线反查表缓存目录")
+    batch.add_argument("--profile", metavar="PATH", help="将各阶段耗时统计写为JSON")
+    batch.add_argument("--trace", metavar="PATH", help="将各阶段耗时写为Chrome trace文件")
+
+    distribute = subparsers.add_parser("distribute", help="将扫描切分为分片并提交到扫描目录的队列")
+    distribute.add_argument("spec", help="作业文件 (.csv 或 .json)")
+    distribute.add_argument("directory", help="扫描目录，各节点都应能访问")
+    distribute.add_argument("-m", "--method", choices=sorted(KERNELS), default="quarter_wave", help="匹配方法")
+    distribute.add_argument("--target", choices=OPTIMIZATION_TARGETS, default="vswr", help="优化目标")
+    distribute.add_argument("--z0", type=float, default=50.0, help="作业文件未给出时的特征阻抗 (Ω)")
+    distribute.add_argument("--shard-size", type=int, default=100_000, help="每个分片的作业数")
+    distribute.add_argument("--precision", choices=sorted(PRECISIONS), default="double", help="计算精度")
+
+    worker = subparsers.add_parser("worker", help="领取并执行扫描目录中的分片")
+    worker.add_argument("directory", help="扫描目录")
+    worker.add_argument("--id", help="工作进程标识，默认为主机名和进程号")
+    worker.add_argument("--max-shards", type=int, help="最多执行的分片数")
+
+    merge = subparsers.add_parser("merge", help="合并扫描目录中全部分片的结果")
+    merge.add_argument("directory", help="扫描目录")
+    merge.add_argument("-o", "--output", help="结果文件 (.npz)，默认为扫描目录中的 results.npz")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行主函数
+
+    参数:
+        argv: Optional[List[str]], 命令行参数，为None时使用 sys.argv
+
+    返回:
+        int: 退出码
+    """
+    args = _build_parser().parse_args(argv)
+
+    if args.command in (None, "gui"):
+        # 仅在启动界面时才导入GUI及其依赖
+        from src.gui.main import MicrowaveDesignApp
+        app = MicrowaveDesignApp()
+        app.run()
+        return 0
+
+    if args.command in ("distribute", "worker", "merge"):
+        return _run_distributed(args)
+
+    if not (args.profile or args.trace):
+        return _run_batch(args)
+
+    instrumentation.enable()
+    try:
+        return _run_batch(args)
+    finally:
+        instrumentation.disable()
+        if args.profile:
+            instrumentation.profiler.export_json(args.profile)
+        if args.trace:
+            instrumentation.profiler.export_chrome_trace(args.trace)
+
+
+def _run_batch(args: argparse.Namespace) -> int:
+    """执行批量计算子命令，返回退出码"""
+    try:
+        with instrumentation.stage("load"):
+            jobs = load_job_spec(args.spec, default_z0=args.z0, validate=not args.skip_invalid)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"读取作业文件失败: {e}", file=sys.stderr)
+        return 1
+
+    if args.skip_invalid:
+        validation = validate_jobs(jobs)
+        if not validation.all_valid:
+            skipped = validation.invalid_rows()
+            print(f"跳过 {len(skipped)} 个无效作业:", file=sys.stderr)
+            for message in validation.messages(limit=MAX_REPORTED_ERRORS):
+                print(f"  {message}", file=sys.stderr)
+            if len(skipped) > MAX_REPORTED_ERRORS:
+                print(f"  ……其余 {len(skipped) - MAX_REPORTED_ERRORS} 个未列出", file=sys.stderr)
+            jobs = {name: values[validation.mask] for name, values in jobs.items()}
+            if not validation.mask.any():
+                print("没有有效作业", file=sys.stderr)
+                return 1
+
+    synthesizer = None
+    if args.eps_r is not None:
+        try:
+            substrate = Substrate(args.eps_r, args.substrate_height, args.trace_thickness)
+        except ValueError as e:
+            print(f"基板参数无效: {e}", file=sys.stderr)
+            return 1
+        synthesizer = MicrostripSynthesizer(substrate, cache_dir=args.synthesis_cache)
+
+    methods = args.method or sorted(KERNELS)
+    start = time.perf_counter()
+    results = solve_jobs(jobs, methods, workers=args.workers, chunk_size=args.chunk_size,
+                         synthesizer=synthesizer, precision=args.precision)
+    stats = instrumentation.throughput(len(jobs["freq"]) * len(methods), time.perf_counter() - start)
+    with instrumentation.stage("write"):
+        write_results(results, args.output)
+    print(f"已完成 {len(jobs['freq'])} 个作业，结果保存到 {args.output}"
+          f"（{stats['designs_per_second']:.0f} 个设计/秒）")
+    return 0
+
+
+def _run_distributed(args: argparse.Namespace) -> int:
+    """执行分布式扫描子命令，返回退出码"""
+    from src.optimization.calculator import CalculationParameters
+    from src.optimization.distributed import DistributedSweep
+
+    try:
+        sweep = DistributedSweep(args.directory)
+        if args.command == "distribute":
+            jobs = load_job_spec(args.spec, default_z0=args.z0)
+            params = CalculationParameters(matching_method=args.method, optimization_target=args.target)
+            shards = sweep.submit(params, jobs, shard_size=args.shard_size, precision=args.precision)
+            print(f"已提交 {len(jobs['freq'])} 个作业，共 {shards} 个分片")
+        elif args.command == "worker":
+            completed = sweep.run_worker(args.id, args.max_shards)
+            print(f"已完成 {completed} 个分片")
+        else:
+            merged = sweep.merge(args.output)
+            print(f"已合并 {len(merged['row'])} 个作业的结果")
+    except (OSError, ValueError, KeyError, RuntimeError) as e:
+        print(f"分布式扫描失败: {e}", file=sys.stderr)
+        return 1
+    return 0
@@ -2,12 +2,12 @@
 import os
 import sys
 import numpy as np
-from microwave_gui import MicrowaveGUI, start_gui
 from src.impedance_matching.quarter_wave import QuarterWaveTransformer
 from src.impedance_matching.stub_matching import StubMatcher
+from src.impedance_matching.cascade import quarter_wave_sweep, stub_sweep
 from src.optimization.calculator import CalculationParameters
-from src.help.help_system import HelpSystem
-from src.visualization.result_saver import ResultSaver
+from src.optimization.validation import validate_arrays
+from src.gui.result import DesignResult, build_sweep
 
 class MicrowaveDesignApp:
     def __init__(self):
@@ -16,6 +16,9 @@ class MicrowaveDesignApp:
         self.current_theme = "light"
         self.is_calculating = False
         self.current_parameters = None
+        self.sweep_points = 401
+        # 编译的GUI扩展在创建界面时才导入
+        from microwave_gui import MicrowaveGUI
         self.gui = MicrowaveGUI(self)
         print("GUI实例已创建")
 
@@ -26,41 +29,58 @@ class MicrowaveDesignApp:
         返回:
             str, 计算结果的字符串表示
         """
+        return self.calculate_response().summary
+
+    def calculate_response(self):
+        """
+        执行计算并返回结构化结果
+
+        返回:
+            DesignResult, 包含文字说明、设计参数和频率扫描数组的结果
+        """
         if not self.current_parameters:
-            return "请先输入参数"
+            return DesignResult("请先输入参数")
             
         self.is_calculating = True
         try:
-            if self.current_parameters.matching_method == "quarter_wave":
+            params = self.current_parameters
+            zl = params.get_complex_load()
+            frequencies = np.linspace(0.5, 1.5, self.sweep_points) * params.freq
+            if params.matching_method == "quarter_wave":
                 transformer = QuarterWaveTransformer(
-                    z0=self.current_parameters.z0,
-                    zl=self.current_parameters.get_complex_load(),
-                    freq=self.current_parameters.freq
+                    z0=params.z0,
+                    zl=zl,
+                    freq=params.freq
                 )
                 result = transformer.get_results()
-                if result:
-                    return f"""四分之一波长变换器设计结果:
-特征阻抗: {result['z0']:.2f} Ω
-负载阻抗: {result['zl']:.2f} Ω
-变换器阻抗: {result['z1']:.2f} Ω
-变换器长度: {result['length']*1000:.2f} mm"""
+                length = result["wavelength"] / 4
+                s11, s21 = quarter_wave_sweep(frequencies, params.freq, params.z0, zl,
+                                              result["transformer_impedance"])
+                summary = f"""四分之一波长变换器设计结果:
+特征阻抗: {params.z0:.2f} Ω
+负载阻抗: {zl:.2f} Ω
+变换器阻抗: {result['transformer_impedance']:.2f} Ω
+变换器长度: {length*1000:.2f} mm"""
+                design = {"transformer_impedance": result["transformer_impedance"], "length": length}
             else:
                 matcher = StubMatcher(
-                    z0=self.current_parameters.z0,
-                    zl=self.current_parameters.get_complex_load(),
-                    freq=self.current_parameters.freq
+                    z0=params.z0,
+                    zl=zl,
+                    freq=params.freq
                 )
                 result = matcher.get_results()
-                if result:
-                    return f"""单枝节匹配设计结果:
-特征阻抗: {result['z0']:.2f} Ω
-负载阻抗: {result['zl']:.2f} Ω
-主线距离: {result['d']*1000:.2f} mm
-支节长度: {result['l']*1000:.2f} mm"""
-                
-            return "计算失败，请检查参数"
+                s11, s21 = stub_sweep(frequencies, params.freq, params.z0, zl,
+                                      result["distance"], result["stub_length"], result["wavelength"])
+                summary = f"""单枝节匹配设计结果:
+特征阻抗: {params.z0:.2f} Ω
+负载阻抗: {zl:.2f} Ω
+主线距离: {result['distance']*1000:.2f} mm
+支节长度: {result['stub_length']*1000:.2f} mm"""
+                design = {"distance": result["distance"], "stub_length": result["stub_length"]}
+
+            return DesignResult(summary, design, build_sweep(frequencies, s11, s21))
         except Exception as e:
-            return f"计算错误: {str(e)}"
+            return DesignResult(f"计算错误: {str(e)}")
         finally:
             self.is_calculating = False
             
@@ -94,11 +114,7 @@ class MicrowaveDesignApp:
             z_load_real = float(z_load_real)
             z_load_imag = float(z_load_imag)
             
-            if freq <= 0:
-                return False
-            if z0 <= 0:
-                return False
-            if z_load_real <= 0:
+            if not validate_arrays(freq, z0, z_load_real, z_load_imag).all_valid:
                 return False
             if matching_method not in ["quarter_wave", "stub"]:
                 return False
@@ -118,6 +134,7 @@ class MicrowaveDesignApp:
         """运行GUI应用"""
         print("运行应用...")
         print("启动GUI应用...")
+        from microwave_gui import start_gui
         try:
             start_gui(self.gui)
         except Exception as e:
@@ -0,0 +1,87 @@
+"""GUI计算结果模块"""
+import numpy as np
+from typing import Any, Dict, Optional
+
+# 扫描数组的列布局，Rust 端按相同顺序读取
+SWEEP_COLUMNS = ("frequency", "s11_real", "s11_imag", "s21_real", "s21_imag", "vswr")
+
+
+def build_sweep(frequencies: np.ndarray, s11: np.ndarray, s21: np.ndarray) -> np.ndarray:
+    """
+    将频率扫描结果打包为 C 连续的 float64 二维数组
+
+    参数:
+        frequencies: np.ndarray, 频率数组 (Hz)
+        s11: np.ndarray, 反射系数数组
+        s21: np.ndarray, 传输系数数组
+
+    返回:
+        np.ndarray: 形状为 (N, len(SWEEP_COLUMNS)) 的数组
+    """
+    s11 = np.asarray(s11, dtype=complex)
+    s21 = np.asarray(s21, dtype=complex)
+    magnitude = np.abs(s11)
+    with np.errstate(divide="ignore"):
+        vswr = np.where(magnitude < 1, (1 + magnitude) / (1 - magnitude), np.inf)
+
+    sweep = np.empty((len(frequencies), len(SWEEP_COLUMNS)), dtype=np.float64)
+    sweep[:, 0] = frequencies
+    sweep[:, 1] = s11.real
+    sweep[:, 2] = s11.imag
+    sweep[:, 3] = s21.real
+    sweep[:, 4] = s21.imag
+    sweep[:, 5] = vswr
+    return sweep
+
+
+class DesignResult:
+    """
+    结构化的设计结果
+
+    sweep 是实现了缓冲区协议的 float64 数组，Rust 端可以直接读取而无需解析字符串
+    """
+
+    __slots__ = ("summary", "design", "sweep")
+
+    def __init__(self, summary: str, design: Optional[Dict[str, Any]] = None,
+                 sweep: Optional[np.ndarray] = None):
+        """
+        初始化设计结果
+
+        参数:
+            summary: str, 结果的文字说明
+            design: Optional[Dict[str, Any]], 设计参数
+            sweep: Optional[np.ndarray], 频率扫描数组，列布局见 SWEEP_COLUMNS
+        """
+        if sweep is None:
+            sweep = np.empty((0, len(SWEEP_COLUMNS)), dtype=np.float64)
+        if sweep.ndim != 2 or sweep.shape[1] != len(SWEEP_COLUMNS):
+            raise ValueError("扫描数组形状必须为 (N, %d)" % len(SWEEP_COLUMNS))
+
+        self.summary = summary
+        self.design = design or {}
+        self.sweep = np.ascontiguousarray(sweep, dtype=np.float64)
+
+    @property
+    def frequencies(self) -> np.ndarray:
+        """频率数组 (Hz)"""
+        return self.sweep[:, 0]
+
+    @property
+    def s11(self) -> np.ndarray:
+        """反射系数数组"""
+        return self.sweep[:, 1] + 1j * self.sweep[:, 2]
+
+    @property
+    def s21(self) -> np.ndarray:
+        """传输系数数组"""
+        return self.sweep[:, 3] + 1j * self.sweep[:, 4]
+
+    @property
+    def vswr(self) -> np.ndarray:
+        """驻波比数组"""
+        return self.sweep[:, 5]
+
+    def __str__(self):
+        """返回结果的文字说明"""
+        return self.summary
@@ -0,0 +1,183 @@
+"""批量匹配计算模块
+
+与 ``quarter_wave.QuarterWaveTransformer`` 和 ``stub_matching.StubMatcher``
+使用相同的公式，但一次对整个参数数组求解，结果与逐个构造对象完全一致。
+输入假定已通过有效性检查。
+
+``precision="single"`` 时全部以 float32/complex64 计算和输出，内存带宽减半，适合大规模初筛。
+单精度的误差界（相对双精度结果，负载在 1–500 Ω、频率在 1 MHz–100 GHz 范围内实测后留出余量）：
+
+- 波长、变换器阻抗、线长：相对误差 < 1e-6
+- 支节距离和长度：绝对误差 < 1e-5 个波长
+- 四分之一波长变换器的 S 参数：绝对误差 < 1e-5；驻波比：相对误差 < 1e-6 · VSWR
+- 单支节的 S11：绝对误差 < 1e-4。该模型的 |S11| 恒为1，S21 和驻波比在两种精度下都由舍入误差决定
+"""
+import numpy as np
+from typing import Dict, Tuple, Union
+from src.impedance_matching.loads import LoadModel, resolve_load
+
+SPEED_OF_LIGHT = 3e8  # 光速 (m/s)，与标量实现保持一致
+
+# 计算精度到 (实数类型, 复数类型) 的映射
+PRECISIONS = {
+    "double": (np.float64, np.complex128),
+    "single": (np.float32, np.complex64)
+}
+
+
+def precision_dtypes(precision: str) -> Tuple[type, type]:
+    """
+    计算精度对应的数据类型
+
+    参数:
+        precision: str, double 或 single
+
+    返回:
+        Tuple[type, type]: 实数类型和复数类型
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"精度必须是: {', '.join(PRECISIONS)}")
+    return PRECISIONS[precision]
+
+
+def _inputs(freq: np.ndarray, z0: np.ndarray, zl: Union[np.ndarray, LoadModel],
+            precision: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """按计算精度转换输入，负载模型按各频率求值"""
+    real, complex_ = precision_dtypes(precision)
+    freq = np.asarray(freq, dtype=real)
+    z0 = np.asarray(z0, dtype=real)
+    return freq, z0, resolve_load(zl, freq).astype(complex_, copy=False)
+
+
+def _complex(values: np.ndarray) -> np.ndarray:
+    """转换为与输入精度相同的复数数组"""
+    return values.astype(np.result_type(values, np.complex64))
+
+
+def _vswr(s11: np.ndarray) -> np.ndarray:
+    """由S11计算驻波比，完全反射时为无穷大"""
+    gamma = np.abs(s11)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(gamma < 1, (1 + gamma) / (1 - gamma), np.inf)
+
+
+def quarter_wave_batch(freq: np.ndarray, z0: np.ndarray,
+                       zl: Union[np.ndarray, LoadModel], precision: str = "double") -> Dict[str, np.ndarray]:
+    """
+    批量计算四分之一波长变换器
+
+    参数:
+        freq: np.ndarray, 频率 (Hz)
+        z0: np.ndarray, 特征阻抗 (Ω)
+        zl: np.ndarray, 负载阻抗 (Ω)，负载模型按各频率求值
+        precision: str, 计算精度，double 或 single
+
+    返回:
+        Dict[str, np.ndarray]: 波长、变换器阻抗、长度、S参数和驻波比数组
+    """
+    freq, z0, zl = _inputs(freq, z0, zl, precision)
+
+    return quarter_wave_response(SPEED_OF_LIGHT / freq, z0, zl, np.sqrt(np.abs(z0 * zl)))
+
+
+def quarter_wave_response(wavelength: np.ndarray, z0: np.ndarray, zl: np.ndarray,
+                          zt: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    由变换器阻抗计算四分之一波长变换器的结果
+
+    参数:
+        wavelength: np.ndarray, 波长 (m)
+        z0: np.ndarray, 特征阻抗 (Ω)
+        zl: np.ndarray, 负载阻抗 (Ω)
+        zt: np.ndarray, 变换器阻抗 (Ω)
+
+    返回:
+        Dict[str, np.ndarray]: 同 ``quarter_wave_batch``
+    """
+    gamma_in = (zt - z0) / (zt + z0)
+    gamma_out = (zl - zt) / (zl + zt)
+    with np.errstate(invalid="ignore"):
+        s21 = np.sqrt(1 - np.abs(gamma_in) ** 2) * np.sqrt(1 - np.abs(gamma_out) ** 2)
+
+    return {
+        "wavelength": wavelength,
+        "transformer_impedance": zt,
+        "length": wavelength / 4,
+        "s11": _complex(gamma_in),
+        "s21": _complex(s21),
+        "s22": gamma_out,
+        "vswr": _vswr(gamma_in)
+    }
+
+
+def stub_batch(freq: np.ndarray, z0: np.ndarray,
+               zl: Union[np.ndarray, LoadModel], precision: str = "double") -> Dict[str, np.ndarray]:
+    """
+    批量计算单支节匹配器
+
+    参数:
+        freq: np.ndarray, 频率 (Hz)
+        z0: np.ndarray, 特征阻抗 (Ω)
+        zl: np.ndarray, 负载阻抗 (Ω)，负载模型按各频率求值
+        precision: str, 计算精度，double 或 single
+
+    返回:
+        Dict[str, np.ndarray]: 波长、支节距离、支节长度、S参数和驻波比数组
+    """
+    freq, z0, zl = _inputs(freq, z0, zl, precision)
+
+    wavelength = SPEED_OF_LIGHT / freq
+    yl_norm = 1 / (zl / z0)
+    gl_norm = yl_norm.real
+    bl_norm = yl_norm.imag
+
+    b_stub = np.sqrt(np.abs((gl_norm - 1) ** 2 + bl_norm ** 2 - 1))
+
+    theta = np.arctan2(bl_norm, gl_norm - 1)
+    theta = np.where(theta < 0, theta + np.pi, theta)
+    distance = theta * wavelength / (4 * np.pi)
+
+    with np.errstate(divide="ignore"):
+        stub_angle = -np.arctan(1 / b_stub)
+    stub_angle = np.where(stub_angle < 0, stub_angle + np.pi, stub_angle)
+    stub_length = stub_angle * wavelength / (2 * np.pi)
+    return stub_response(wavelength, yl_norm, distance, stub_length, b_stub)
+
+
+def stub_response(wavelength: np.ndarray, yl_norm: np.ndarray, distance: np.ndarray,
+                  stub_length: np.ndarray, b_stub: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    由支节位置和归一化支节电纳计算单支节匹配器的结果
+
+    参数:
+        wavelength: np.ndarray, 波长 (m)
+        yl_norm: np.ndarray, 归一化负载导纳
+        distance: np.ndarray, 支节距离 (m)
+        stub_length: np.ndarray, 支节长度 (m)
+        b_stub: np.ndarray, 归一化支节电纳
+
+    返回:
+        Dict[str, np.ndarray]: 同 ``stub_batch``
+    """
+    y_stub = 1j * b_stub
+    gamma_in = (y_stub - 1) / (y_stub + 1)
+    gamma_out = (yl_norm - 1) / (yl_norm + 1)
+    # |Γin| 理论上等于1，舍入使其略大于1的行 s21 为 nan
+    with np.errstate(invalid="ignore"):
+        s21 = np.sqrt(1 - np.abs(gamma_in) ** 2) * np.sqrt(1 - np.abs(gamma_out) ** 2)
+
+    return {
+        "wavelength": wavelength,
+        "distance": distance,
+        "stub_length": stub_length,
+        "s11": gamma_in,
+        "s21": _complex(s21),
+        "s22": gamma_out,
+        "vswr": _vswr(gamma_in)
+    }
+
+
+BATCH_SOLVERS = {
+    "quarter_wave": quarter_wave_batch,
+    "stub": stub_batch
+}
@@ -0,0 +1,233 @@
+"""ABCD级联计算模块
+
+所有函数都按元素对 numpy 数组广播，ABCD 矩阵以 (A, B, C, D) 四个数组表示，
+因此一次调用即可完成整个频率扫描（或多个设计 × 多个频点）的计算。
+"""
+import numpy as np
+from typing import Optional, Tuple, Union, TYPE_CHECKING
+from src.impedance_matching.loads import LoadModel, resolve_load
+
+if TYPE_CHECKING:
+    from src.impedance_matching.transmission_line import TransmissionLine
+
+ArrayLike = Union[float, complex, np.ndarray]
+ABCD = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def line_abcd(z_line: ArrayLike, gamma_length: ArrayLike) -> ABCD:
+    """
+    传输线段的ABCD矩阵
+
+    参数:
+        z_line: 传输线特征阻抗 (Ω)
+        gamma_length: 传播常数与线长的乘积 γl，无耗线为 jβl
+
+    返回:
+        ABCD: (A, B, C, D)
+    """
+    cosh = np.cosh(gamma_length)
+    sinh = np.sinh(gamma_length)
+    return cosh, z_line * sinh, sinh / z_line, cosh
+
+
+def series_abcd(z: ArrayLike) -> ABCD:
+    """
+    串联阻抗的ABCD矩阵
+
+    参数:
+        z: 串联阻抗 (Ω)
+
+    返回:
+        ABCD: (A, B, C, D)
+    """
+    z = np.asarray(z)
+    one = np.ones_like(z)
+    return one, z, np.zeros_like(z), one
+
+
+def shunt_abcd(y: ArrayLike) -> ABCD:
+    """
+    并联导纳的ABCD矩阵
+
+    参数:
+        y: 并联导纳 (S)
+
+    返回:
+        ABCD: (A, B, C, D)
+    """
+    y = np.asarray(y)
+    one = np.ones_like(y)
+    return one, np.zeros_like(y), y, one
+
+
+def short_stub_admittance(z_stub: ArrayLike, gamma_length: ArrayLike) -> np.ndarray:
+    """
+    终端短路支节的输入导纳
+
+    参数:
+        z_stub: 支节特征阻抗 (Ω)
+        gamma_length: 支节的 γl
+
+    返回:
+        np.ndarray: 输入导纳 (S)
+    """
+    return 1 / (z_stub * np.tanh(gamma_length))
+
+
+def open_stub_admittance(z_stub: ArrayLike, gamma_length: ArrayLike) -> np.ndarray:
+    """
+    终端开路支节的输入导纳
+
+    参数:
+        z_stub: 支节特征阻抗 (Ω)
+        gamma_length: 支节的 γl
+
+    返回:
+        np.ndarray: 输入导纳 (S)
+    """
+    return np.tanh(gamma_length) / z_stub
+
+
+def cascade(*stages: ABCD) -> ABCD:
+    """
+    按从源到负载的顺序级联多个ABCD矩阵
+
+    参数:
+        stages: ABCD, 各级网络
+
+    返回:
+        ABCD: 总的ABCD矩阵
+    """
+    A, B, C, D = stages[0]
+    for a, b, c, d in stages[1:]:
+        A, B, C, D = A * a + B * c, A * b + B * d, C * a + D * c, C * b + D * d
+    return A, B, C, D
+
+
+def input_impedance(abcd: ABCD, zl: ArrayLike) -> np.ndarray:
+    """
+    端接负载后的输入阻抗
+
+    参数:
+        abcd: ABCD, 网络的ABCD矩阵
+        zl: 负载阻抗 (Ω)
+
+    返回:
+        np.ndarray: 输入阻抗 (Ω)
+    """
+    A, B, C, D = abcd
+    return (A * zl + B) / (C * zl + D)
+
+
+def reflection_coefficient(z: ArrayLike, z0: ArrayLike) -> np.ndarray:
+    """
+    计算反射系数
+
+    参数:
+        z: 阻抗 (Ω)
+        z0: 参考阻抗 (Ω)
+
+    返回:
+        np.ndarray: 反射系数
+    """
+    return (z - z0) / (z + z0)
+
+
+def transmission_coefficient(abcd: ABCD, z0: ArrayLike, zl: ArrayLike) -> np.ndarray:
+    """
+    从 z0 源到负载的功率波传输系数
+
+    |S21|² 即转换功率增益，无耗网络满足 |S11|² + |S21|² = 1
+
+    参数:
+        abcd: ABCD, 网络的ABCD矩阵
+        z0: 源阻抗 (Ω)
+        zl: 负载阻抗 (Ω)
+
+    返回:
+        np.ndarray: 传输系数
+    """
+    A, B, C, D = abcd
+    denominator = A * zl + B + C * z0 * zl + D * z0
+    return 2 * np.sqrt(np.real(z0) * np.real(zl)) / denominator
+
+
+def vswr(gamma: ArrayLike) -> np.ndarray:
+    """
+    由反射系数计算驻波比，完全反射时为无穷大
+
+    参数:
+        gamma: 反射系数
+
+    返回:
+        np.ndarray: 驻波比
+    """
+    magnitude = np.abs(gamma)
+    with np.errstate(divide="ignore"):
+        return np.where(magnitude < 1, (1 + magnitude) / (1 - magnitude), np.inf)
+
+
+def network_response(abcd: ABCD, z0: ArrayLike, zl: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    计算端接负载的匹配网络的 S11 和 S21
+
+    参数:
+        abcd: ABCD, 匹配网络的ABCD矩阵
+        z0: 源阻抗 (Ω)
+        zl: 负载阻抗 (Ω)
+
+    返回:
+        Tuple[np.ndarray, np.ndarray]: (S11, S21)
+    """
+    s11 = reflection_coefficient(input_impedance(abcd, zl), z0)
+    s21 = transmission_coefficient(abcd, z0, zl)
+    return s11, s21
+
+
+def quarter_wave_sweep(frequencies: np.ndarray, f0: float, z0: float, zl: Union[complex, LoadModel],
+                       zt: float, line: Optional["TransmissionLine"] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    四分之一波长变换器的频率响应
+
+    参数:
+        frequencies: 频率数组 (Hz)
+        f0: 设计频率 (Hz)
+        z0: 特征阻抗 (Ω)
+        zl: 负载阻抗 (Ω)，负载模型按各频点求值
+        zt: 变换器特征阻抗 (Ω)
+        line: 变换段的传输线模型，给出时以其阻抗、色散和损耗代替理想的 zt 线，
+            长度取设计频率处导波波长的四分之一
+
+    返回:
+        Tuple[np.ndarray, np.ndarray]: (S11, S21)
+    """
+    if line is not None:
+        abcd = line.abcd(frequencies, float(line.guided_wavelength(f0)) / 4)
+    else:
+        theta = 0.5 * np.pi * np.asarray(frequencies) / f0
+        abcd = line_abcd(zt, 1j * theta)
+    return network_response(abcd, z0, resolve_load(zl, frequencies))
+
+
+def stub_sweep(frequencies: np.ndarray, f0: float, z0: float, zl: Union[complex, LoadModel],
+               distance: float, stub_length: float,
+               wavelength: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    并联短路单支节匹配的频率响应
+
+    参数:
+        frequencies: 频率数组 (Hz)
+        f0: 设计频率 (Hz)
+        z0: 特征阻抗 (Ω)
+        zl: 负载阻抗 (Ω)，负载模型按各频点求值
+        distance: 支节到负载的距离 (m)
+        stub_length: 支节长度 (m)
+        wavelength: 设计频率下的波长 (m)
+
+    返回:
+        Tuple[np.ndarray, np.ndarray]: (S11, S21)
+    """
+    beta = 2 * np.pi / wavelength * np.asarray(frequencies) / f0
+    stub = shunt_abcd(short_stub_admittance(z0, 1j * beta * stub_length))
+    line = line_abcd(z0, 1j * beta * distance)
+    return network_response(cascade(stub, line), z0, resolve_load(zl, frequencies))
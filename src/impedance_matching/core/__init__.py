@@ -1,5 +1,8 @@
 import numpy as np
 from abc import ABC, abstractmethod
+from typing import Optional
+from src.impedance_matching.loads import load_at
+from src.impedance_matching.transmission_line import TransmissionLine
 
 class MatchingNetwork(ABC):
     def __init__(self, frequency: float, z0: float, zl: complex):
@@ -10,13 +13,19 @@ class MatchingNetwork(ABC):
             
         self.frequency = frequency
         self.z0 = z0
-        self.zl = zl
+        # 负载模型在设计频率处求值
+        self.zl = load_at(zl, frequency)
         
     @abstractmethod
     def calculate(self):
         pass
 
 class QuarterWaveTransformer(MatchingNetwork):
+    def __init__(self, frequency: float, z0: float, zl: complex, line: Optional[TransmissionLine] = None):
+        super().__init__(frequency, z0, zl)
+        # 变换段的传输线模型，为None时为理想无耗线
+        self.line = line
+
     def calculate_transformer_impedance(self):
         """计算变压器特征阻抗"""
         return np.sqrt(self.z0 * abs(self.zl))
@@ -24,11 +33,14 @@ class QuarterWaveTransformer(MatchingNetwork):
     def calculate(self):
         """计算匹配结果"""
         z1 = self.calculate_transformer_impedance()
-        wavelength = 3e8 / self.frequency
+        if self.line is not None:
+            wavelength = float(self.line.guided_wavelength(self.frequency))
+        else:
+            wavelength = 3e8 / self.frequency
         length = wavelength / 4
         
         # 计算S参数
-        s_parameters = self._calculate_s_parameters(z1)
+        s_parameters = self._calculate_s_parameters(z1, length)
         
         # 计算驻波比
         gamma = (self.zl - self.z0) / (self.zl + self.z0)
@@ -41,16 +53,20 @@ class QuarterWaveTransformer(MatchingNetwork):
             "s_parameters": s_parameters
         }
         
-    def _calculate_s_parameters(self, z1):
+    def _calculate_s_parameters(self, z1, length):
         """计算S参数矩阵"""
-        # 计算四分之一波长变压器的ABCD矩阵
-        theta = np.pi / 2  # 四分之一波长对应的电角度
-        
-        # ABCD矩阵元素
-        A = np.cos(theta)
-        B = 1j * z1 * np.sin(theta)
-        C = 1j * np.sin(theta) / z1
-        D = np.cos(theta)
+        if self.line is not None:
+            # 传输线模型给出实际阻抗、色散和损耗
+            A, B, C, D = self.line.abcd(self.frequency, length)
+        else:
+            # 计算四分之一波长变压器的ABCD矩阵
+            theta = np.pi / 2  # 四分之一波长对应的电角度
+
+            # ABCD矩阵元素
+            A = np.cos(theta)
+            B = 1j * z1 * np.sin(theta)
+            C = 1j * np.sin(theta) / z1
+            D = np.cos(theta)
         
         # 转换为S参数
         denominator = A + B/self.z0 + C*self.z0 + D
@@ -0,0 +1,199 @@
+"""逐负载匹配公式的编译内核模块
+
+四分之一波长变换器和单支节匹配器的逐负载公式在安装了 Numba 时编译为单次遍历的循环内核，
+不产生中间数组；未安装时使用 ``batch`` 中的 NumPy 实现，结果与其完全一致。
+Numba 只在第一次求解时导入和编译（编译结果缓存到磁盘），导入本模块不会加载它。
+
+两种实现的公式逐项相同，Numba 内核与 NumPy 实现的差别仅在最后一位的舍入。
+单精度时 Numba 内核以单精度读写数组，中间结果可能以双精度计算，误差不大于 NumPy 实现。
+"""
+import math
+import numpy as np
+from typing import Callable, Dict, Optional, Union
+
+from src import instrumentation
+from src.impedance_matching.batch import SPEED_OF_LIGHT, precision_dtypes, quarter_wave_batch, stub_batch
+from src.impedance_matching.loads import LoadModel, resolve_load
+
+BACKENDS = ("numba", "numpy")
+
+_backend: Optional[str] = None
+_compiled: Dict[str, Callable] = {}
+
+
+def _quarter_wave_loop(freq, z0, zl, wavelength, zt, s11, s21, s22, vswr):
+    """四分之一波长变换器的逐负载循环，公式同 ``batch.quarter_wave_batch``"""
+    for k in range(freq.shape[0]):
+        wavelength[k] = SPEED_OF_LIGHT / freq[k]
+        impedance = math.sqrt(abs(z0[k] * zl[k]))
+        gamma_in = (impedance - z0[k]) / (impedance + z0[k])
+        gamma_out = (zl[k] - impedance) / (zl[k] + impedance)
+        zt[k] = impedance
+        s11[k] = gamma_in
+        # |Γ| 因舍入略大于1时 NumPy 的开方得到 nan，未编译运行时 math.sqrt 会抛出异常
+        t_in, t_out = 1 - abs(gamma_in) ** 2, 1 - abs(gamma_out) ** 2
+        s21[k] = (math.sqrt(t_in) if t_in >= 0 else math.nan) * (math.sqrt(t_out) if t_out >= 0 else math.nan)
+        s22[k] = gamma_out
+        gamma = abs(gamma_in)
+        vswr[k] = (1 + gamma) / (1 - gamma) if gamma < 1 else math.inf
+
+
+def _stub_loop(freq, z0, zl, wavelength, distance, stub_length, s11, s21, s22, vswr):
+    """单支节匹配器的逐负载循环，公式同 ``batch.stub_batch``"""
+    for k in range(freq.shape[0]):
+        wavelength[k] = SPEED_OF_LIGHT / freq[k]
+        yl_norm = 1 / (zl[k] / z0[k])
+        gl_norm = yl_norm.real
+        bl_norm = yl_norm.imag
+        b_stub = math.sqrt(abs((gl_norm - 1) ** 2 + bl_norm ** 2 - 1))
+
+        theta = math.atan2(bl_norm, gl_norm - 1)
+        if theta < 0:
+            theta += math.pi
+        distance[k] = theta * wavelength[k] / (4 * math.pi)
+
+        stub_angle = -math.atan(1 / b_stub)
+        if stub_angle < 0:
+            stub_angle += math.pi
+        stub_length[k] = stub_angle * wavelength[k] / (2 * math.pi)
+
+        y_stub = 1j * b_stub
+        gamma_in = (y_stub - 1) / (y_stub + 1)
+        gamma_out = (yl_norm - 1) / (yl_norm + 1)
+        s11[k] = gamma_in
+        # |Γ| 因舍入略大于1时 NumPy 的开方得到 nan，未编译运行时 math.sqrt 会抛出异常
+        t_in, t_out = 1 - abs(gamma_in) ** 2, 1 - abs(gamma_out) ** 2
+        s21[k] = (math.sqrt(t_in) if t_in >= 0 else math.nan) * (math.sqrt(t_out) if t_out >= 0 else math.nan)
+        s22[k] = gamma_out
+        gamma = abs(gamma_in)
+        vswr[k] = (1 + gamma) / (1 - gamma) if gamma < 1 else math.inf
+
+
+def _numba_available() -> bool:
+    """是否安装了 Numba"""
+    try:
+        import numba  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def backend() -> str:
+    """
+    当前使用的实现，首次调用时自动选择
+
+    返回:
+        str: 安装了 Numba 时为 numba，否则为 numpy
+    """
+    global _backend
+    if _backend is None:
+        _backend = "numba" if _numba_available() else "numpy"
+    return _backend
+
+
+def set_backend(name: Optional[str]) -> None:
+    """
+    指定使用的实现
+
+    参数:
+        name: Optional[str], numba 或 numpy，为None时恢复自动选择
+    """
+    global _backend
+    if name is not None and name not in BACKENDS:
+        raise ValueError(f"实现必须是: {', '.join(BACKENDS)}")
+    if name == "numba" and not _numba_available():
+        raise ValueError("未安装numba")
+    _backend = name
+
+
+def _kernel(name: str) -> Callable:
+    """编译并缓存循环内核"""
+    if name not in _compiled:
+        import numba  # 仅在使用编译内核时导入
+
+        loop = _quarter_wave_loop if name == "quarter_wave" else _stub_loop
+        with instrumentation.stage("kernel_compile"):
+            # error_model="numpy" 使除零和负数开方得到 inf/nan，与 NumPy 实现一致
+            _compiled[name] = numba.njit(cache=True, error_model="numpy")(loop)
+    return _compiled[name]
+
+
+def _prepare(freq: np.ndarray, z0: np.ndarray, zl: Union[np.ndarray, LoadModel], precision: str):
+    """求值负载模型并按计算精度展平为连续的一维数组"""
+    real, complex_ = precision_dtypes(precision)
+    freq = np.asarray(freq, dtype=real)
+    z0 = np.asarray(z0, dtype=real)
+    zl = resolve_load(zl, freq)
+    freq, z0, zl = np.broadcast_arrays(freq, z0, zl)
+    return (freq.shape, np.ascontiguousarray(freq).ravel(), np.ascontiguousarray(z0).ravel(),
+            np.ascontiguousarray(zl, dtype=complex_).ravel(), real, complex_)
+
+
+def quarter_wave_kernel(freq: np.ndarray, z0: np.ndarray,
+                        zl: Union[np.ndarray, LoadModel], precision: str = "double") -> Dict[str, np.ndarray]:
+    """
+    批量计算四分之一波长变换器，自动选择实现
+
+    参数:
+        freq: np.ndarray, 频率 (Hz)
+        z0: np.ndarray, 特征阻抗 (Ω)
+        zl: np.ndarray, 负载阻抗 (Ω)，负载模型按各频率求值
+        precision: str, 计算精度，double 或 single
+
+    返回:
+        Dict[str, np.ndarray]: 同 ``batch.quarter_wave_batch``
+    """
+    if backend() == "numpy":
+        return quarter_wave_batch(freq, z0, zl, precision)
+
+    shape, freq, z0, zl, real, complex_ = _prepare(freq, z0, zl, precision)
+    wavelength, zt, vswr = (np.empty(freq.shape, dtype=real) for _ in range(3))
+    s11, s21, s22 = (np.empty(freq.shape, dtype=complex_) for _ in range(3))
+    _kernel("quarter_wave")(freq, z0, zl, wavelength, zt, s11, s21, s22, vswr)
+    return {
+        "wavelength": wavelength.reshape(shape),
+        "transformer_impedance": zt.reshape(shape),
+        "length": wavelength.reshape(shape) / 4,
+        "s11": s11.reshape(shape),
+        "s21": s21.reshape(shape),
+        "s22": s22.reshape(shape),
+        "vswr": vswr.reshape(shape)
+    }
+
+
+def stub_kernel(freq: np.ndarray, z0: np.ndarray,
+                zl: Union[np.ndarray, LoadModel], precision: str = "double") -> Dict[str, np.ndarray]:
+    """
+    批量计算单支节匹配器，自动选择实现
+
+    参数:
+        freq: np.ndarray, 频率 (Hz)
+        z0: np.ndarray, 特征阻抗 (Ω)
+        zl: np.ndarray, 负载阻抗 (Ω)，负载模型按各频率求值
+        precision: str, 计算精度，double 或 single
+
+    返回:
+        Dict[str, np.ndarray]: 同 ``batch.stub_batch``
+    """
+    if backend() == "numpy":
+        return stub_batch(freq, z0, zl, precision)
+
+    shape, freq, z0, zl, real, complex_ = _prepare(freq, z0, zl, precision)
+    wavelength, distance, stub_length, vswr = (np.empty(freq.shape, dtype=real) for _ in range(4))
+    s11, s21, s22 = (np.empty(freq.shape, dtype=complex_) for _ in range(3))
+    _kernel("stub")(freq, z0, zl, wavelength, distance, stub_length, s11, s21, s22, vswr)
+    return {
+        "wavelength": wavelength.reshape(shape),
+        "distance": distance.reshape(shape),
+        "stub_length": stub_length.reshape(shape),
+        "s11": s11.reshape(shape),
+        "s21": s21.reshape(shape),
+        "s22": s22.reshape(shape),
+        "vswr": vswr.reshape(shape)
+    }
+
+
+KERNELS = {
+    "quarter_wave": quarter_wave_kernel,
+    "stub": stub_kernel
+}
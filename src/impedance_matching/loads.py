@@ -0,0 +1,256 @@
+"""频率相关负载模型模块
+
+负载模型一次调用即可对整个频率数组求出复数阻抗 ``zl(f)``。
+凡是接受固定负载阻抗 ``zl`` 的地方也接受负载模型：标量匹配器在设计频率处求值，
+频率扫描和批量求解对每个频点分别求值。
+"""
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple, Union
+
+ArrayLike = Union[float, complex, np.ndarray]
+
+# Touchstone 频率单位
+_FREQUENCY_UNITS = {"HZ": 1.0, "KHZ": 1e3, "MHZ": 1e6, "GHZ": 1e9}
+
+
+class LoadModel(ABC):
+    """负载阻抗模型基类"""
+
+    @abstractmethod
+    def impedance(self, frequencies: ArrayLike) -> np.ndarray:
+        """
+        计算负载阻抗
+
+        参数:
+            frequencies: 频率或频率数组 (Hz)
+
+        返回:
+            np.ndarray: 与频率形状相同的复数阻抗 (Ω)
+        """
+
+    def __call__(self, frequencies: ArrayLike) -> np.ndarray:
+        """等同于 impedance"""
+        return self.impedance(frequencies)
+
+
+class ConstantLoad(LoadModel):
+    """与频率无关的负载"""
+
+    def __init__(self, z: complex):
+        """
+        初始化固定负载
+
+        参数:
+            z: complex, 负载阻抗 (Ω)
+        """
+        self.z = complex(z)
+
+    def impedance(self, frequencies: ArrayLike) -> np.ndarray:
+        return np.full(np.shape(frequencies), self.z, dtype=complex)
+
+
+class RLCLoad(LoadModel):
+    """
+    集总RLC负载
+
+    串联拓扑 Z = R + jωL + 1/(jωC)，并联拓扑 Y = 1/R + 1/(jωL) + jωC。
+    值为None的元件不参与计算。
+    """
+
+    def __init__(self, resistance: float, inductance: Optional[float] = None,
+                 capacitance: Optional[float] = None, topology: str = "series"):
+        """
+        初始化RLC负载
+
+        参数:
+            resistance: float, 电阻 (Ω)
+            inductance: float, 电感 (H)
+            capacitance: float, 电容 (F)
+            topology: str, series 或 parallel
+        """
+        if resistance < 0:
+            raise ValueError("电阻不能为负数")
+        if inductance is not None and inductance <= 0:
+            raise ValueError("电感必须为正数")
+        if capacitance is not None and capacitance <= 0:
+            raise ValueError("电容必须为正数")
+        if topology not in ("series", "parallel"):
+            raise ValueError("拓扑必须是series或parallel")
+        if topology == "parallel" and resistance == 0:
+            raise ValueError("并联拓扑的电阻必须为正数")
+
+        self.resistance = resistance
+        self.inductance = inductance
+        self.capacitance = capacitance
+        self.topology = topology
+
+    def impedance(self, frequencies: ArrayLike) -> np.ndarray:
+        omega = 2 * np.pi * np.asarray(frequencies, dtype=float)
+        if self.topology == "series":
+            z = np.full(omega.shape, self.resistance, dtype=complex)
+            if self.inductance is not None:
+                z = z + 1j * omega * self.inductance
+            if self.capacitance is not None:
+                z = z + 1 / (1j * omega * self.capacitance)
+            return z
+
+        y = np.full(omega.shape, 1 / self.resistance, dtype=complex)
+        if self.inductance is not None:
+            y = y + 1 / (1j * omega * self.inductance)
+        if self.capacitance is not None:
+            y = y + 1j * omega * self.capacitance
+        return 1 / y
+
+
+class TabulatedLoad(LoadModel):
+    """由测量或仿真数据插值的负载"""
+
+    def __init__(self, frequencies: np.ndarray, impedances: np.ndarray, bounds_error: bool = False):
+        """
+        初始化表格负载
+
+        参数:
+            frequencies: np.ndarray, 数据频点 (Hz)
+            impedances: np.ndarray, 各频点的复数阻抗 (Ω)
+            bounds_error: bool, 为True时超出数据频率范围抛出异常，否则取端点值
+        """
+        frequencies = np.asarray(frequencies, dtype=float).ravel()
+        impedances = np.asarray(impedances, dtype=complex).ravel()
+        if frequencies.size == 0 or frequencies.shape != impedances.shape:
+            raise ValueError("频点和阻抗数据必须一一对应且不能为空")
+
+        # 排序一次，之后每次求值只做插值
+        order = np.argsort(frequencies)
+        self.frequencies = frequencies[order]
+        self.impedances = impedances[order]
+        if np.any(np.diff(self.frequencies) == 0):
+            raise ValueError("频点不能重复")
+        self.bounds_error = bounds_error
+
+    def impedance(self, frequencies: ArrayLike) -> np.ndarray:
+        f = np.asarray(frequencies, dtype=float)
+        if self.bounds_error and (np.any(f < self.frequencies[0]) or np.any(f > self.frequencies[-1])):
+            raise ValueError("频率超出负载数据范围")
+        real = np.interp(f, self.frequencies, self.impedances.real)
+        imag = np.interp(f, self.frequencies, self.impedances.imag)
+        return real + 1j * imag
+
+    @classmethod
+    def from_touchstone(cls, path: str, port: int = 1, bounds_error: bool = False) -> "TabulatedLoad":
+        """
+        从 Touchstone 文件读取单端口负载
+
+        支持 v1 格式的 S、Z、Y 参数及 DB、MA、RI 数据格式，多端口文件取指定端口的反射参数。
+
+        参数:
+            path: str, .sNp 文件路径
+            port: int, 端口号 (从1开始)
+            bounds_error: bool, 见 TabulatedLoad
+
+        返回:
+            TabulatedLoad: 表格负载
+        """
+        frequencies, impedances = read_touchstone(path, port)
+        return cls(frequencies, impedances, bounds_error)
+
+
+def read_touchstone(path: str, port: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    读取 Touchstone 文件中指定端口的输入阻抗
+
+    参数:
+        path: str, .sNp 文件路径
+        port: int, 端口号 (从1开始)
+
+    返回:
+        Tuple[np.ndarray, np.ndarray]: 频率 (Hz) 和复数阻抗 (Ω)
+    """
+    extension = path.rsplit(".", 1)[-1].lower()
+    if not (extension.startswith("s") and extension.endswith("p") and extension[1:-1].isdigit()):
+        raise ValueError(f"不是Touchstone文件: {path}")
+    n_ports = int(extension[1:-1])
+    if not 1 <= port <= n_ports:
+        raise ValueError(f"端口号必须在1到{n_ports}之间")
+
+    unit, parameter, data_format, reference = "GHZ", "S", "MA", 50.0
+    numbers = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("!", 1)[0].strip()
+            if not line:
+                continue
+            if line.startswith("#"):
+                tokens = line[1:].upper().split()
+                for i, token in enumerate(tokens):
+                    if token in _FREQUENCY_UNITS:
+                        unit = token
+                    elif token in ("S", "Y", "Z", "H", "G"):
+                        parameter = token
+                    elif token in ("DB", "MA", "RI"):
+                        data_format = token
+                    elif token == "R" and i + 1 < len(tokens):
+                        reference = float(tokens[i + 1])
+                continue
+            if line.startswith("["):
+                raise ValueError("暂不支持Touchstone 2.0关键字")
+            numbers.extend(float(value) for value in line.split())
+
+    if parameter not in ("S", "Y", "Z"):
+        raise ValueError(f"不支持的网络参数类型: {parameter}")
+
+    values_per_point = 1 + 2 * n_ports * n_ports
+    data = np.asarray(numbers, dtype=float)
+    if data.size == 0 or data.size % values_per_point:
+        raise ValueError("Touchstone数据不完整")
+    data = data.reshape(-1, values_per_point)
+
+    # 2端口文件按 11、21、12、22 排列，其余按行优先排列，对角元素的位置在两种排列中相同
+    index = (port - 1) * n_ports + (port - 1)
+    a = data[:, 1 + 2 * index]
+    b = data[:, 2 + 2 * index]
+    if data_format == "RI":
+        value = a + 1j * b
+    else:
+        magnitude = 10 ** (a / 20) if data_format == "DB" else a
+        value = magnitude * np.exp(1j * np.deg2rad(b))
+
+    if parameter == "S":
+        impedance = reference * (1 + value) / (1 - value)
+    elif parameter == "Z":
+        impedance = reference * value
+    else:
+        impedance = reference / value
+    return data[:, 0] * _FREQUENCY_UNITS[unit], impedance
+
+
+def resolve_load(zl: Union[complex, np.ndarray, LoadModel], frequencies: ArrayLike) -> np.ndarray:
+    """
+    在给定频率处求负载阻抗
+
+    参数:
+        zl: 固定阻抗、阻抗数组或负载模型
+        frequencies: 频率或频率数组 (Hz)
+
+    返回:
+        np.ndarray: 负载模型在各频率处的阻抗，或原样转换为复数数组的固定阻抗
+    """
+    if isinstance(zl, LoadModel):
+        return zl.impedance(frequencies)
+    return np.asarray(zl, dtype=complex)
+
+
+def load_at(zl: Union[complex, LoadModel], frequency: float) -> complex:
+    """
+    标量匹配器使用：负载模型在设计频率处求值，固定阻抗原样返回
+
+    参数:
+        zl: 固定阻抗或负载模型
+        frequency: float, 设计频率 (Hz)
+
+    返回:
+        complex: 负载阻抗 (Ω)
+    """
+    if isinstance(zl, LoadModel):
+        return complex(zl.impedance(frequency))
+    return zl
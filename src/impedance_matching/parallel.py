@@ -0,0 +1,189 @@
+"""共享内存并行求解模块
+
+多进程批量求解时，输入列和结果列都放在父进程预先分配的 ``multiprocessing.shared_memory`` 块中，
+工作进程按行区间直接读写这些数组，只返回区间边界。进程间传递的只有共享内存块的名称、
+数据类型和形状，不随作业数增长，百万级作业的结果也不需要序列化回父进程。
+
+工作进程必须与父进程共用同一个 resource_tracker，否则工作进程退出时其自己的 tracker
+会把仍在使用的共享内存当作泄漏释放。复用的进程池应由 ``process_pool`` 创建，
+它在启动工作进程之前先启动父进程的 tracker。
+"""
+import numpy as np
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Mapping, Optional, Tuple, TYPE_CHECKING
+
+from src.impedance_matching.kernels import KERNELS
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, ProcessPoolExecutor
+
+# 共享数组的描述：共享内存块名称、数据类型和形状
+ArraySpec = Tuple[str, str, Tuple[int, ...]]
+
+
+class SharedArrays:
+    """一组放在共享内存中的 NumPy 数组"""
+
+    def __init__(self, layout: Mapping[str, Tuple[np.dtype, Tuple[int, ...]]]):
+        """
+        在共享内存中分配数组，内容未初始化
+
+        参数:
+            layout: Mapping[str, Tuple[np.dtype, Tuple[int, ...]]], 各数组的数据类型和形状
+        """
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.arrays: Dict[str, np.ndarray] = {}
+        self.spec: Dict[str, ArraySpec] = {}
+        try:
+            for name, (dtype, shape) in layout.items():
+                dtype = np.dtype(dtype)
+                # 共享内存块大小不能为0
+                size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+                block = shared_memory.SharedMemory(create=True, size=size)
+                self._blocks.append(block)
+                self.arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+                self.spec[name] = (block.name, dtype.str, tuple(shape))
+        except BaseException:
+            self.close()
+            raise
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, np.ndarray]) -> "SharedArrays":
+        """
+        将已有数组复制到共享内存
+
+        参数:
+            arrays: Mapping[str, np.ndarray], 数组
+
+        返回:
+            SharedArrays: 内容相同的共享数组
+        """
+        arrays = {name: np.asarray(values) for name, values in arrays.items()}
+        shared = cls({name: (values.dtype, values.shape) for name, values in arrays.items()})
+        for name, values in arrays.items():
+            shared.arrays[name][...] = values
+        return shared
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def copy(self) -> Dict[str, np.ndarray]:
+        """
+        复制为普通数组，共享内存释放后仍然有效
+
+        返回:
+            Dict[str, np.ndarray]: 数组副本
+        """
+        return {name: values.copy() for name, values in self.arrays.items()}
+
+    def close(self) -> None:
+        """释放共享内存，之后不能再访问 ``arrays``"""
+        self.arrays = {}
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+def process_pool(workers: int) -> "ProcessPoolExecutor":
+    """
+    创建与本模块共享内存配合使用的进程池
+
+    参数:
+        workers: int, 进程数
+
+    返回:
+        ProcessPoolExecutor: 工作进程与父进程共用 resource_tracker 的进程池
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    resource_tracker.ensure_running()
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def attach(spec: Mapping[str, ArraySpec]) -> Tuple[Dict[str, np.ndarray], List[shared_memory.SharedMemory]]:
+    """
+    在工作进程中按描述打开共享数组
+
+    参数:
+        spec: Mapping[str, ArraySpec], ``SharedArrays.spec``
+
+    返回:
+        Tuple[Dict[str, np.ndarray], List[shared_memory.SharedMemory]]: 数组和共享内存块，
+        用完后应关闭这些块（不释放，释放由父进程负责）
+    """
+    blocks = []
+    arrays = {}
+    for name, (block_name, dtype, shape) in spec.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    return arrays, blocks
+
+
+def _solve_range(method: str, inputs: Mapping[str, ArraySpec], outputs: Mapping[str, ArraySpec],
+                 start: int, stop: int, precision: str) -> Tuple[int, int]:
+    """求解一个行区间并写入共享结果数组，作为进程池任务时必须是模块级函数"""
+    arrays, blocks = attach({**inputs, **outputs})
+    try:
+        solution = KERNELS[method](arrays["freq"][start:stop], arrays["z0"][start:stop],
+                                   arrays["zl"][start:stop], precision)
+        for name in outputs:
+            arrays[name][start:stop] = solution[name]
+    finally:
+        # 结果可能是输入的视图，释放所有引用后才能关闭共享内存块
+        arrays = solution = None
+        for block in blocks:
+            block.close()
+    return start, stop
+
+
+def solve_shared(method: str, freq: np.ndarray, z0: np.ndarray, zl: np.ndarray,
+                 workers: int = 1, chunk_size: int = 100_000, precision: str = "double",
+                 executor: Optional["Executor"] = None) -> Dict[str, np.ndarray]:
+    """
+    多进程批量求解，结果经共享内存返回
+
+    参数:
+        method: str, 匹配方法，KERNELS 中的键
+        freq: np.ndarray, 频率 (Hz)，一维
+        z0: np.ndarray, 特征阻抗 (Ω)，一维
+        zl: np.ndarray, 负载阻抗 (Ω)，一维
+        workers: int, 并行进程数，为1或只有一个数据块时在当前进程计算
+        chunk_size: int, 每个任务的作业数
+        precision: str, 计算精度，double 或 single
+        executor: Optional[Executor], 由 ``process_pool`` 创建的复用进程池，为None时按 workers 创建
+
+    返回:
+        Dict[str, np.ndarray]: 同 ``KERNELS[method]``
+    """
+    solver = KERNELS[method]
+    freq, z0, zl = np.broadcast_arrays(np.asarray(freq, dtype=float), np.asarray(z0, dtype=float),
+                                       np.asarray(zl, dtype=complex))
+    bounds = [(start, min(start + chunk_size, len(freq))) for start in range(0, len(freq), chunk_size)]
+    if len(bounds) <= 1:
+        return solver(freq, z0, zl, precision)
+    if executor is None and workers <= 1:
+        chunks = [solver(freq[a:b], z0[a:b], zl[a:b], precision) for a, b in bounds]
+        return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+
+    # 以一行求解得到结果列的名称和数据类型
+    template = solver(freq[:1], z0[:1], zl[:1], precision)
+    layout = {name: (values.dtype, freq.shape) for name, values in template.items()}
+    with SharedArrays.from_arrays({"freq": freq, "z0": z0, "zl": zl}) as inputs, \
+            SharedArrays(layout) as outputs:
+        own_executor = executor is None
+        if own_executor:
+            executor = process_pool(workers)
+        try:
+            futures = [executor.submit(_solve_range, method, inputs.spec, outputs.spec, a, b, precision)
+                       for a, b in bounds]
+            for future in futures:
+                future.result()
+        finally:
+            if own_executor:
+                executor.shutdown()
+        return outputs.copy()
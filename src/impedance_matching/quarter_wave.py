@@ -1,29 +1,37 @@
 """四分之一波长变换器模块"""
 import numpy as np
 from typing import Dict, Optional, List, Union
+from src.impedance_matching.cascade import network_response
+from src.impedance_matching.loads import LoadModel, load_at
+from src.impedance_matching.transmission_line import TransmissionLine
 
 class QuarterWaveTransformer:
     """四分之一波长变换器类"""
-    def __init__(self, freq: float, z0: float, zl: complex):
+    def __init__(self, freq: float, z0: float, zl: Union[complex, LoadModel],
+                 line: Optional[TransmissionLine] = None):
         """
         初始化四分之一波长变换器
 
         参数:
             freq: float, 频率 (Hz)
             z0: float, 特征阻抗 (Ω)
-            zl: complex, 负载阻抗 (Ω)
+            zl: complex, 负载阻抗 (Ω)，负载模型在设计频率处求值
+            line: Optional[TransmissionLine], 变换段的传输线模型，为None时为理想无耗线
         """
         if freq <= 0:
             raise ValueError("频率必须为正数")
         if z0 <= 0:
             raise ValueError("特征阻抗必须为正数")
+        zl = load_at(zl, freq)
         if abs(zl) <= 0:
             raise ValueError("负载阻抗的模必须为正数")
 
         self.freq = freq
         self.z0 = z0
         self.zl = zl
+        self.line = line
         self.wavelength = self.calculate_wavelength()
+        self.length = self.wavelength / 4
         self.zt = self.calculate_transformer_impedance()
         self.s_parameters = self.calculate_s_parameters()
         self.vswr = self.calculate_vswr()
@@ -33,8 +41,10 @@ class QuarterWaveTransformer:
         计算波长
 
         返回:
-            float: 波长 (m)
+            float: 波长 (m)，指定传输线模型时为导波波长
         """
+        if self.line is not None:
+            return float(self.line.guided_wavelength(self.freq))
         c = 3e8  # 光速 (m/s)
         return c / self.freq
 
@@ -54,6 +64,14 @@ class QuarterWaveTransformer:
         返回:
             List[complex]: S参数列表 [S11, S12, S21, S22]
         """
+        if self.line is not None:
+            # 由传输线模型的阻抗、色散和损耗计算实际变换段的响应
+            A, B, C, D = self.line.abcd(self.freq, self.length)
+            s11, s21 = network_response((A, B, C, D), self.z0, self.zl)
+            z_out = (D * self.z0 + B) / (C * self.z0 + A)
+            s22 = (z_out - np.conj(self.zl)) / (z_out + self.zl)
+            return [complex(s11), complex(s21), complex(s21), complex(s22)]
+
         gamma_in = (self.zt - self.z0) / (self.zt + self.z0)
         gamma_out = (self.zl - self.zt) / (self.zl + self.zt)
         s11 = gamma_in
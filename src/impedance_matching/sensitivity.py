@@ -0,0 +1,115 @@
+"""参数灵敏度分析模块
+
+对 ``topology.Topology`` 描述的匹配网络，一次前向级联加一次反向级联即可求出
+|S11| 和驻波比对全部设计参数的解析导数：
+
+    M = M1 · M2 · … · Mn,   ∂M/∂p = (M1 … Mk-1) · ∂Mk/∂p · (Mk+1 … Mn)
+
+其中 p 属于第 k 个元件。前缀积和后缀积各计算一次，每个参数只需两次 2×2 矩阵乘法，
+而有限差分需要对每个参数额外做两次完整的频率扫描。
+"""
+import numpy as np
+from typing import Dict, List, Mapping, Optional, Union
+
+from src.impedance_matching.cascade import ABCD, ArrayLike, cascade, reflection_coefficient, vswr
+from src.impedance_matching.loads import LoadModel, resolve_load
+from src.impedance_matching.topology import Topology
+
+
+def _abcd_derivative(prefix: Optional[ABCD], derivative: ABCD, suffix: Optional[ABCD]) -> ABCD:
+    """前缀积 · 元件导数 · 后缀积，前缀或后缀为None时视为单位矩阵"""
+    stages = [stage for stage in (prefix, derivative, suffix) if stage is not None]
+    return cascade(*stages)
+
+
+def sensitivity(topology: Topology, frequencies: ArrayLike, z0: float,
+                zl: Union[complex, LoadModel],
+                values: Optional[Mapping[str, ArrayLike]] = None) -> Dict[str, Union[np.ndarray, Dict]]:
+    """
+    计算 |S11| 和驻波比对全部设计参数的导数
+
+    |S11| 为0时不可导，此时给出 |∂S11/∂p|，即参数朝任一方向变化时 |S11| 的增长率。
+
+    参数:
+        topology: Topology, 匹配网络
+        frequencies: 频率数组 (Hz)
+        z0: float, 源阻抗 (Ω)
+        zl: 负载阻抗 (Ω)，负载模型按各频点求值
+        values: 要替换标称值的参数，见 ``Topology.abcd``
+
+    返回:
+        Dict: 包含
+            - s11: 复数 S11
+            - vswr: 驻波比
+            - d_s11: "元件名.参数名" 到 ∂|S11|/∂p 的映射
+            - d_vswr: "元件名.参数名" 到 ∂VSWR/∂p 的映射
+    """
+    frequencies = np.asarray(frequencies, dtype=float)
+    zl = resolve_load(zl, frequencies)
+    values = dict(values or {})
+    unknown = set(values) - set(topology.nominal())
+    if unknown:
+        raise KeyError(f"未知参数: {', '.join(sorted(unknown))}")
+
+    element_values = []
+    stages: List[ABCD] = []
+    for element in topology.elements:
+        current = {parameter: values.get(f"{element.name}.{parameter}", nominal)
+                   for parameter, nominal in element.nominal().items()}
+        element_values.append(current)
+        stages.append(element.abcd(frequencies, current))
+
+    # prefixes[k] = M1 … Mk-1，suffixes[k] = Mk+1 … Mn
+    n = len(stages)
+    prefixes: List[Optional[ABCD]] = [None] * n
+    suffixes: List[Optional[ABCD]] = [None] * n
+    for k in range(1, n):
+        prefixes[k] = stages[0] if k == 1 else cascade(prefixes[k - 1], stages[k - 1])
+    for k in range(n - 2, -1, -1):
+        suffixes[k] = stages[n - 1] if k == n - 2 else cascade(stages[k + 1], suffixes[k + 1])
+    total = stages[0] if n == 1 else cascade(prefixes[n - 1], stages[n - 1])
+
+    A, B, C, D = total
+    denominator = C * zl + D
+    z_in = (A * zl + B) / denominator
+    s11 = reflection_coefficient(z_in, z0)
+    magnitude = np.abs(s11)
+    ds11_dz = 2 * z0 / (z_in + z0) ** 2
+    with np.errstate(divide="ignore"):
+        dvswr_ds11 = np.where(magnitude < 1, 2 / (1 - magnitude) ** 2, np.inf)
+
+    d_s11: Dict[str, np.ndarray] = {}
+    d_vswr: Dict[str, np.ndarray] = {}
+    for k, element in enumerate(topology.elements):
+        for parameter, derivative in element.derivatives(frequencies, element_values[k]).items():
+            dA, dB, dC, dD = _abcd_derivative(prefixes[k], derivative, suffixes[k])
+            dz_in = ((dA * zl + dB) - z_in * (dC * zl + dD)) / denominator
+            ds11 = ds11_dz * dz_in
+            with np.errstate(divide="ignore", invalid="ignore"):
+                d_magnitude = np.where(magnitude > 0, np.real(np.conj(s11) * ds11) / magnitude, np.abs(ds11))
+            name = f"{element.name}.{parameter}"
+            d_s11[name] = np.broadcast_to(d_magnitude, s11.shape)
+            d_vswr[name] = np.broadcast_to(dvswr_ds11 * d_magnitude, s11.shape)
+
+    return {
+        "s11": s11,
+        "vswr": vswr(s11),
+        "d_s11": d_s11,
+        "d_vswr": d_vswr
+    }
+
+
+def normalized_sensitivity(result: Dict[str, Union[np.ndarray, Dict]], nominal: Mapping[str, float],
+                           key: str = "d_vswr") -> Dict[str, np.ndarray]:
+    """
+    把导数换算为参数变化1%时的指标变化量，便于比较量纲不同的参数
+
+    参数:
+        result: ``sensitivity`` 的返回值
+        nominal: Mapping[str, float], 参数标称值，通常为 ``Topology.nominal()``
+        key: str, d_s11 或 d_vswr
+
+    返回:
+        Dict[str, np.ndarray]: 参数名到 0.01·p·∂X/∂p 的映射
+    """
+    return {name: 0.01 * nominal[name] * derivative for name, derivative in result[key].items()}
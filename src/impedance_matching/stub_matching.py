@@ -1,22 +1,24 @@
 """单支节匹配器模块"""
 import numpy as np
 from typing import Dict, List, Tuple, Union, Any
+from src.impedance_matching.loads import LoadModel, load_at
 
 class StubMatcher:
     """单支节匹配器类"""
-    def __init__(self, freq: float, z0: float, zl: complex):
+    def __init__(self, freq: float, z0: float, zl: Union[complex, LoadModel]):
         """
         初始化单支节匹配器
 
         参数:
             freq: float, 频率 (Hz)
             z0: float, 特征阻抗 (Ω)
-            zl: complex, 负载阻抗 (Ω)
+            zl: complex, 负载阻抗 (Ω)，负载模型在设计频率处求值
         """
         if freq <= 0:
             raise ValueError("频率必须为正数")
         if z0 <= 0:
             raise ValueError("特征阻抗必须为正数")
+        zl = load_at(zl, freq)
         if abs(zl) <= 0:
             raise ValueError("负载阻抗的模必须为正数")
 
@@ -0,0 +1,232 @@
+"""微带线几何综合模块
+
+将匹配设计给出的电参数（线的特性阻抗、电长度）换算为指定基板上的微带线宽度和物理长度。
+
+宽度求解不对每个设计迭代求根，而是对每种基板预先计算一张“宽度 → 特性阻抗”的正向表，
+之后用插值反查，整批设计只需一次 ``np.interp``。表格可以缓存到磁盘，
+相同基板和表格设置在之后的进程中直接读取。
+"""
+import hashlib
+import os
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+from src import instrumentation
+from src.npz_io import load_npz, save_npz
+from src.impedance_matching.transmission_line import (
+    COPPER_CONDUCTIVITY,
+    SPEED_OF_LIGHT,
+    Microstrip,
+    _check_dielectric,
+    microstrip_dispersion,
+    microstrip_static
+)
+
+TABLE_VERSION = 1  # 表格公式或格式变化时递增，使旧缓存失效
+
+
+class Substrate:
+    """微带线基板"""
+
+    def __init__(self, eps_r: float, height: float, thickness: float = 0.0, tan_delta: float = 0.0,
+                 conductivity: float = COPPER_CONDUCTIVITY, name: str = ""):
+        """
+        初始化基板
+
+        参数:
+            eps_r: float, 相对介电常数
+            height: float, 介质厚度 (m)
+            thickness: float, 导带厚度 (m)
+            tan_delta: float, 介质损耗角正切
+            conductivity: float, 导体电导率 (S/m)
+            name: str, 基板名称，仅用于显示
+        """
+        if height <= 0:
+            raise ValueError("介质厚度必须为正数")
+        if thickness < 0:
+            raise ValueError("导带厚度不能为负数")
+        _check_dielectric(eps_r, tan_delta)
+
+        self.eps_r = eps_r
+        self.height = height
+        self.thickness = thickness
+        self.tan_delta = tan_delta
+        self.conductivity = conductivity
+        self.name = name
+
+    def line(self, width: float) -> Microstrip:
+        """
+        在该基板上构造指定宽度的微带线
+
+        参数:
+            width: float, 导带宽度 (m)
+
+        返回:
+            Microstrip: 微带线模型
+        """
+        return Microstrip(width, self.height, self.eps_r, self.thickness,
+                          self.tan_delta, self.conductivity)
+
+
+class MicrostripSynthesizer:
+    """
+    基于反查表的微带线综合器
+
+    表格在归一化宽度 W/h 的对数网格上计算准静态特性阻抗和有效介电常数。
+    特性阻抗随宽度单调下降，因此可直接对 ln(W/h) 插值反查；
+    网格足够密时插值误差远小于加工公差。超出表格范围的阻抗返回 NaN。
+    """
+
+    def __init__(self, substrate: Substrate, points: int = 2048,
+                 ratio_range: Tuple[float, float] = (0.01, 100.0),
+                 cache_dir: Optional[str] = None):
+        """
+        初始化综合器
+
+        参数:
+            substrate: Substrate, 基板
+            points: int, 表格点数
+            ratio_range: Tuple[float, float], W/h 的取值范围
+            cache_dir: Optional[str], 表格缓存目录，为None时只在内存中保存
+        """
+        if points < 2:
+            raise ValueError("表格点数至少为2")
+        if not 0 < ratio_range[0] < ratio_range[1]:
+            raise ValueError("W/h 范围必须为递增的正数")
+
+        self.substrate = substrate
+        self.points = points
+        self.ratio_range = ratio_range
+        self.cache_dir = cache_dir
+        self._table: Optional[Dict[str, np.ndarray]] = None
+
+    @property
+    def cache_key(self) -> str:
+        """由基板几何参数和表格设置确定的缓存键"""
+        s = self.substrate
+        text = (f"v{TABLE_VERSION}|{s.eps_r!r}|{s.height!r}|{s.thickness!r}|"
+                f"{self.points}|{self.ratio_range[0]!r}|{self.ratio_range[1]!r}")
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def cache_path(self) -> Optional[str]:
+        """缓存文件路径，未设置缓存目录时为None"""
+        if self.cache_dir is None:
+            return None
+        return os.path.join(self.cache_dir, f"microstrip_{self.cache_key}.npz")
+
+    @property
+    def table(self) -> Dict[str, np.ndarray]:
+        """反查表，首次访问时从缓存读取或重新计算"""
+        if self._table is None:
+            self._table = self._load_table()
+        return self._table
+
+    def _load_table(self) -> Dict[str, np.ndarray]:
+        """读取缓存的表格，不存在或已损坏时重新计算并写入缓存"""
+        path = self.cache_path
+        if path is not None:
+            try:
+                saved = load_npz(path)
+                if saved is not None:
+                    table = {name: saved[name] for name in ("log_ratio", "z_static", "eps_static")}
+                    instrumentation.count("cache_hits")
+                    return table
+            except (OSError, KeyError, ValueError):
+                pass
+
+        table = self._build_table()
+        if path is not None:
+            # 原子写入，避免并行进程读到写了一半的缓存
+            save_npz(path, table)
+        return table
+
+    def _build_table(self) -> Dict[str, np.ndarray]:
+        """在 W/h 对数网格上计算正向表，按特性阻抗升序排列以便插值"""
+        with instrumentation.stage("synthesis_table"):
+            s = self.substrate
+            log_ratio = np.linspace(np.log(self.ratio_range[0]), np.log(self.ratio_range[1]), self.points)
+            z_static, eps_static = microstrip_static(np.exp(log_ratio) * s.height, s.height,
+                                                     s.eps_r, s.thickness)
+        return {
+            "log_ratio": log_ratio[::-1].copy(),
+            "z_static": z_static[::-1].copy(),
+            "eps_static": eps_static[::-1].copy()
+        }
+
+    def width(self, impedance: np.ndarray) -> np.ndarray:
+        """
+        求给定特性阻抗的导带宽度
+
+        参数:
+            impedance: np.ndarray, 特性阻抗 (Ω)
+
+        返回:
+            np.ndarray: 导带宽度 (m)，超出表格范围时为 NaN
+        """
+        table = self.table
+        log_ratio = np.interp(np.asarray(impedance, dtype=float), table["z_static"], table["log_ratio"],
+                              left=np.nan, right=np.nan)
+        return np.exp(log_ratio) * self.substrate.height
+
+    def synthesize(self, impedance: np.ndarray, electrical_length: np.ndarray,
+                   frequency: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        批量综合微带线几何尺寸
+
+        宽度按准静态特性阻抗求得，物理长度按设计频率处含色散的有效介电常数换算。
+
+        参数:
+            impedance: np.ndarray, 特性阻抗 (Ω)
+            electrical_length: np.ndarray, 电长度 (度)
+            frequency: np.ndarray, 设计频率 (Hz)
+
+        返回:
+            Dict[str, np.ndarray]: 宽度 width (m)、物理长度 length (m) 和有效介电常数 eps_eff
+        """
+        impedance = np.asarray(impedance, dtype=float)
+        table = self.table
+        log_ratio = np.interp(impedance, table["z_static"], table["log_ratio"], left=np.nan, right=np.nan)
+        eps_static = np.interp(impedance, table["z_static"], table["eps_static"], left=np.nan, right=np.nan)
+
+        s = self.substrate
+        eps_eff = microstrip_dispersion(frequency, s.height, s.eps_r, impedance, eps_static)
+        wavelength = SPEED_OF_LIGHT / (np.asarray(frequency, dtype=float) * np.sqrt(eps_eff))
+        return {
+            "width": np.exp(log_ratio) * s.height,
+            "length": np.asarray(electrical_length, dtype=float) / 360 * wavelength,
+            "eps_eff": eps_eff
+        }
+
+
+def synthesize_solution(synthesizer: MicrostripSynthesizer, method: str, freq: np.ndarray,
+                        z0: np.ndarray, solution: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    为批量求解结果计算微带线尺寸
+
+    四分之一波长变换器综合变换段（电长度90°）；单支节匹配的主线和支节都取特性阻抗 z0，
+    按求解结果中的距离和支节长度换算电长度。
+
+    参数:
+        synthesizer: MicrostripSynthesizer, 综合器
+        method: str, 匹配方法，quarter_wave 或 stub
+        freq: np.ndarray, 设计频率 (Hz)
+        z0: np.ndarray, 特征阻抗 (Ω)
+        solution: Dict[str, np.ndarray], ``batch.BATCH_SOLVERS`` 的求解结果
+
+    返回:
+        Dict[str, np.ndarray]: 几何尺寸结果列
+    """
+    if method == "quarter_wave":
+        geometry = synthesizer.synthesize(solution["transformer_impedance"], 90.0, freq)
+        return {"width": geometry["width"], "physical_length": geometry["length"]}
+    if method == "stub":
+        degrees = 360 / solution["wavelength"]
+        distance = synthesizer.synthesize(z0, solution["distance"] * degrees, freq)
+        stub = synthesizer.synthesize(z0, solution["stub_length"] * degrees, freq)
+        return {
+            "width": distance["width"],
+            "physical_distance": distance["length"],
+            "physical_stub_length": stub["length"]
+        }
+    raise ValueError(f"不支持几何综合的匹配方法: {method}")
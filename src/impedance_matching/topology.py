@@ -0,0 +1,333 @@
+"""匹配网络拓扑模块
+
+把匹配网络描述为从源到负载依次级联的元件，每个元件有若干命名参数
+（传输线的特性阻抗、长度、有效介电常数，集总元件的值）。
+``Topology.abcd`` 接受任意形状、可相互广播的参数数组和频率数组，
+因此“样本 × 频点”的整个扰动集合可以在一次级联中求出。
+"""
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+from src.impedance_matching.batch import SPEED_OF_LIGHT
+from src.impedance_matching.cascade import (
+    ABCD,
+    ArrayLike,
+    cascade,
+    line_abcd,
+    network_response,
+    open_stub_admittance,
+    series_abcd,
+    short_stub_admittance,
+    shunt_abcd
+)
+
+ELEMENT_TYPES = ("inductor", "capacitor", "resistor")
+
+
+class Element(ABC):
+    """级联元件基类"""
+
+    #: 可扰动的参数名
+    parameters: Tuple[str, ...] = ()
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def nominal(self) -> Dict[str, float]:
+        """
+        获取参数标称值
+
+        返回:
+            Dict[str, float]: 参数名到标称值的映射
+        """
+        return {parameter: getattr(self, parameter) for parameter in self.parameters}
+
+    @abstractmethod
+    def abcd(self, frequencies: ArrayLike, values: Mapping[str, ArrayLike]) -> ABCD:
+        """
+        计算元件的ABCD矩阵
+
+        参数:
+            frequencies: 频率数组 (Hz)
+            values: 参数名到取值的映射，取值可以是与频率相互广播的数组
+
+        返回:
+            ABCD: (A, B, C, D)
+        """
+
+    @abstractmethod
+    def derivatives(self, frequencies: ArrayLike, values: Mapping[str, ArrayLike]) -> Dict[str, ABCD]:
+        """
+        计算ABCD矩阵对各参数的解析导数
+
+        参数:
+            frequencies: 频率数组 (Hz)
+            values: 参数名到取值的映射
+
+        返回:
+            Dict[str, ABCD]: 参数名到 (dA, dB, dC, dD) 的映射
+        """
+
+
+class _LineElement(Element):
+    """传输线类元件的公共部分"""
+
+    parameters = ("impedance", "length", "eps_eff")
+
+    def __init__(self, impedance: float, length: float, eps_eff: float = 1.0, name: str = "line"):
+        """
+        参数:
+            impedance: float, 特性阻抗 (Ω)
+            length: float, 物理长度 (m)
+            eps_eff: float, 有效介电常数
+            name: str, 元件名，在拓扑内唯一
+        """
+        if impedance <= 0:
+            raise ValueError("特性阻抗必须为正数")
+        if length < 0:
+            raise ValueError("线长不能为负数")
+        if eps_eff < 1:
+            raise ValueError("有效介电常数不能小于1")
+        super().__init__(name)
+        self.impedance = impedance
+        self.length = length
+        self.eps_eff = eps_eff
+
+    @staticmethod
+    def _propagation(frequencies: ArrayLike, values: Mapping[str, ArrayLike]) -> np.ndarray:
+        """无耗线的传播常数 jβ"""
+        return 2j * np.pi * np.asarray(frequencies) * np.sqrt(values["eps_eff"]) / SPEED_OF_LIGHT
+
+    def _gamma_length(self, frequencies: ArrayLike, values: Mapping[str, ArrayLike]) -> np.ndarray:
+        """无耗线的 γl = jβl"""
+        return self._propagation(frequencies, values) * values["length"]
+
+    def _gamma_length_derivatives(self, frequencies: ArrayLike,
+                                  values: Mapping[str, ArrayLike]) -> Dict[str, np.ndarray]:
+        """γl 对线长和有效介电常数的导数"""
+        propagation = self._propagation(frequencies, values)
+        return {
+            "length": propagation,
+            "eps_eff": propagation * values["length"] / (2 * np.asarray(values["eps_eff"]))
+        }
+
+
+class LineSection(_LineElement):
+    """串联传输线段"""
+
+    def abcd(self, frequencies: ArrayLike, values: Mapping[str, ArrayLike]) -> ABCD:
+        return line_abcd(values["impedance"], self._gamma_length(frequencies, values))
+
+    def derivatives(self, frequencies: ArrayLike, values: Mapping[str, ArrayLike]) -> Dict[str, ABCD]:
+        z = values["impedance"]
+        gamma_length = self._gamma_length(frequencies, values)
+        cosh, sinh = np.cosh(gamma_length), np.sinh(gamma_length)
+        result = {"impedance": (0, sinh, -sinh / z ** 2, 0)}
+        for parameter, dx in self._gamma_length_derivatives(frequencies, values).items():
+            result[parameter] = (sinh * dx, z * cosh * dx, cosh / z * dx, sinh * dx)
+        return result
+
+
+class ShortStub(_LineElement):
+    """并联终端短路支节"""
+
+    def __init__(self, impedance: float, length: float, eps_eff: float = 1.0, name: str = "stub"):
+        super().__init__(impedance, length, eps_eff, name)
+
+    def abcd(self, frequencies: ArrayLike, values: Mapping[str, ArrayLike]) -> ABCD:
+        return shunt_abcd(short_stub_admittance(values["impedance"], self._gamma_length(frequencies, values)))
+
+    def derivatives(self, frequencies: ArrayLike, values: Mapping[str, ArrayLike]) -> Dict[str, ABCD]:
+        z = values["impedance"]
+        gamma_length = self._gamma_length(frequencies, values)
+        y = short_stub_admittance(z, gamma_length)
+        dy_dx = -1 / (z * np.sinh(gamma_length) ** 2)
+        result = {"impedance": (0, 0, -y / z, 0)}
+        for parameter, dx in self._gamma_length_derivatives(frequencies, values).items():
+            result[parameter] = (0, 0, dy_dx * dx, 0)
+        return result
+
+
+class OpenStub(_LineElement):
+    """并联终端开路支节"""
+
+    def __init__(self, impedance: float, length: float, eps_eff: float = 1.0, name: str = "stub"):
+        super().__init__(impedance, length, eps_eff, name)
+
+    def abcd(self, frequencies: ArrayLike, values: Mapping[str, ArrayLike]) -> ABCD:
+        return shunt_abcd(open_stub_admittance(values["impedance"], self._gamma_length(frequencies, values)))
+
+    def derivatives(self, frequencies: ArrayLike, values: Mapping[str, ArrayLike]) -> Dict[str, ABCD]:
+        z = values["impedance"]
+        gamma_length = self._gamma_length(frequencies, values)
+        y = open_stub_admittance(z, gamma_length)
+        dy_dx = 1 / (z * np.cosh(gamma_length) ** 2)
+        result = {"impedance": (0, 0, -y / z, 0)}
+        for parameter, dx in self._gamma_length_derivatives(frequencies, values).items():
+            result[parameter] = (0, 0, dy_dx * dx, 0)
+        return result
+
+
+class _LumpedElement(Element):
+    """集总元件的公共部分"""
+
+    parameters = ("value",)
+
+    def __init__(self, element_type: str, value: float, name: str):
+        """
+        参数:
+            element_type: str, inductor、capacitor 或 resistor
+            value: float, 元件值 (H、F 或 Ω)
+            name: str, 元件名，在拓扑内唯一
+        """
+        if element_type not in ELEMENT_TYPES:
+            raise ValueError("元件类型必须是inductor、capacitor或resistor")
+        if value <= 0:
+            raise ValueError("元件值必须为正数")
+        super().__init__(name)
+        self.element_type = element_type
+        self.value = value
+
+    def _impedance(self, frequencies: ArrayLike, value: ArrayLike) -> np.ndarray:
+        """元件阻抗"""
+        omega = 2 * np.pi * np.asarray(frequencies)
+        if self.element_type == "inductor":
+            return 1j * omega * value
+        if self.element_type == "capacitor":
+            return 1 / (1j * omega * value)
+        return np.asarray(value) + 0j * omega
+
+    def _impedance_derivative(self, frequencies: ArrayLike, value: ArrayLike) -> np.ndarray:
+        """元件阻抗对元件值的导数"""
+        if self.element_type == "resistor":
+            return np.ones_like(np.asarray(frequencies), dtype=complex)
+        # 电感 jωL 与元件值成正比，电容 1/(jωC) 与元件值成反比
+        sign = 1 if self.element_type == "inductor" else -1
+        return sign * self._impedance(frequencies, value) / value
+
+
+class SeriesElement(_LumpedElement):
+    """串联集总元件"""
+
+    def __init__(self, element_type: str, value: float, name: str = "series"):
+        super().__init__(element_type, value, name)
+
+    def abcd(self, frequencies: ArrayLike, values: Mapping[str, ArrayLike]) -> ABCD:
+        return series_abcd(self._impedance(frequencies, values["value"]))
+
+    def derivatives(self, frequencies: ArrayLike, values: Mapping[str, ArrayLike]) -> Dict[str, ABCD]:
+        return {"value": (0, self._impedance_derivative(frequencies, values["value"]), 0, 0)}
+
+
+class ShuntElement(_LumpedElement):
+    """并联集总元件"""
+
+    def __init__(self, element_type: str, value: float, name: str = "shunt"):
+        super().__init__(element_type, value, name)
+
+    def abcd(self, frequencies: ArrayLike, values: Mapping[str, ArrayLike]) -> ABCD:
+        return shunt_abcd(1 / self._impedance(frequencies, values["value"]))
+
+    def derivatives(self, frequencies: ArrayLike, values: Mapping[str, ArrayLike]) -> Dict[str, ABCD]:
+        z = self._impedance(frequencies, values["value"])
+        return {"value": (0, 0, -self._impedance_derivative(frequencies, values["value"]) / z ** 2, 0)}
+
+
+class Topology:
+    """由元件级联组成的匹配网络，参数以 "元件名.参数名" 引用"""
+
+    def __init__(self, elements: Sequence[Element]):
+        """
+        初始化拓扑
+
+        参数:
+            elements: Sequence[Element], 从源到负载依次排列的元件
+        """
+        if not elements:
+            raise ValueError("拓扑至少包含一个元件")
+        names = [element.name for element in elements]
+        if len(set(names)) != len(names):
+            raise ValueError("元件名不能重复")
+        self.elements = list(elements)
+
+    def nominal(self) -> Dict[str, float]:
+        """
+        获取全部参数的标称值
+
+        返回:
+            Dict[str, float]: "元件名.参数名" 到标称值的映射
+        """
+        return {f"{element.name}.{parameter}": value
+                for element in self.elements for parameter, value in element.nominal().items()}
+
+    def abcd(self, frequencies: ArrayLike, values: Optional[Mapping[str, ArrayLike]] = None) -> ABCD:
+        """
+        计算整个网络的ABCD矩阵
+
+        参数:
+            frequencies: 频率数组 (Hz)
+            values: 要替换标称值的参数，键为 "元件名.参数名"，未给出的参数取标称值
+
+        返回:
+            ABCD: 与频率和参数数组广播后形状相同的ABCD矩阵
+        """
+        values = values or {}
+        unknown = set(values) - set(self.nominal())
+        if unknown:
+            raise KeyError(f"未知参数: {', '.join(sorted(unknown))}")
+
+        stages = []
+        for element in self.elements:
+            element_values = {parameter: values.get(f"{element.name}.{parameter}", nominal)
+                              for parameter, nominal in element.nominal().items()}
+            stages.append(element.abcd(frequencies, element_values))
+        return cascade(*stages)
+
+    def response(self, frequencies: ArrayLike, z0: ArrayLike, zl: ArrayLike,
+                 values: Optional[Mapping[str, ArrayLike]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        计算端接负载后的 S11 和 S21
+
+        参数:
+            frequencies: 频率数组 (Hz)
+            z0: 源阻抗 (Ω)
+            zl: 负载阻抗 (Ω)，可为与频率形状相同的数组
+            values: 见 abcd
+
+        返回:
+            Tuple[np.ndarray, np.ndarray]: (S11, S21)
+        """
+        return network_response(self.abcd(frequencies, values), z0, zl)
+
+    @classmethod
+    def quarter_wave(cls, transformer) -> "Topology":
+        """
+        由 ``quarter_wave.QuarterWaveTransformer`` 的设计构造拓扑
+
+        参数:
+            transformer: QuarterWaveTransformer, 已求解的变换器
+
+        返回:
+            Topology: 元件名为 transformer 的单段传输线
+        """
+        # 指定了传输线模型时由导波波长折算有效介电常数，使标称电长度恰为90°
+        eps_eff = (SPEED_OF_LIGHT / (transformer.freq * transformer.wavelength)) ** 2
+        return cls([LineSection(float(transformer.zt), transformer.length, max(eps_eff, 1.0),
+                                name="transformer")])
+
+    @classmethod
+    def stub(cls, matcher) -> "Topology":
+        """
+        由 ``stub_matching.StubMatcher`` 的设计构造拓扑
+
+        参数:
+            matcher: StubMatcher, 已求解的单支节匹配器
+
+        返回:
+            Topology: 并联短路支节 stub 和到负载的传输线 line
+        """
+        return cls([
+            ShortStub(matcher.z0, matcher.stub_length, name="stub"),
+            LineSection(matcher.z0, matcher.distance, name="line")
+        ])
@@ -0,0 +1,369 @@
+"""传输线模型模块
+
+提供理想线、微带线、带状线和同轴线模型。与几何尺寸有关的准静态量
+（特性阻抗、有效介电常数、损耗系数的前置因子）在构造时计算一次，
+之后对整个频率数组向量化求值，真实传输线的计算量与理想线相当。
+
+损耗采用低损耗近似：特性阻抗取实数，衰减常数为导体损耗与介质损耗之和 (Np/m)。
+"""
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import Tuple, Union
+
+from src.impedance_matching.cascade import ABCD, line_abcd
+
+ArrayLike = Union[float, np.ndarray]
+
+SPEED_OF_LIGHT = 299_792_458.0  # 真空光速 (m/s)
+MU0 = 4e-7 * np.pi  # 真空磁导率 (H/m)
+ETA0 = MU0 * SPEED_OF_LIGHT  # 真空波阻抗 (Ω)
+COPPER_CONDUCTIVITY = 5.8e7  # 铜的电导率 (S/m)
+
+
+class TransmissionLine(ABC):
+    """传输线模型基类"""
+
+    @abstractmethod
+    def characteristic_impedance(self, frequencies: ArrayLike) -> np.ndarray:
+        """
+        特性阻抗
+
+        参数:
+            frequencies: 频率或频率数组 (Hz)
+
+        返回:
+            np.ndarray: 特性阻抗 (Ω)
+        """
+
+    @abstractmethod
+    def effective_permittivity(self, frequencies: ArrayLike) -> np.ndarray:
+        """
+        有效介电常数
+
+        参数:
+            frequencies: 频率或频率数组 (Hz)
+
+        返回:
+            np.ndarray: 有效介电常数
+        """
+
+    @abstractmethod
+    def attenuation(self, frequencies: ArrayLike) -> np.ndarray:
+        """
+        衰减常数
+
+        参数:
+            frequencies: 频率或频率数组 (Hz)
+
+        返回:
+            np.ndarray: 衰减常数 (Np/m)
+        """
+
+    def phase_constant(self, frequencies: ArrayLike) -> np.ndarray:
+        """
+        相位常数
+
+        参数:
+            frequencies: 频率或频率数组 (Hz)
+
+        返回:
+            np.ndarray: 相位常数 (rad/m)
+        """
+        f = np.asarray(frequencies, dtype=float)
+        return 2 * np.pi * f * np.sqrt(self.effective_permittivity(f)) / SPEED_OF_LIGHT
+
+    def propagation_constant(self, frequencies: ArrayLike) -> np.ndarray:
+        """
+        传播常数 γ = α + jβ
+
+        参数:
+            frequencies: 频率或频率数组 (Hz)
+
+        返回:
+            np.ndarray: 传播常数 (1/m)
+        """
+        return self.attenuation(frequencies) + 1j * self.phase_constant(frequencies)
+
+    def guided_wavelength(self, frequencies: ArrayLike) -> np.ndarray:
+        """
+        导波波长
+
+        参数:
+            frequencies: 频率或频率数组 (Hz)
+
+        返回:
+            np.ndarray: 导波波长 (m)
+        """
+        return 2 * np.pi / self.phase_constant(frequencies)
+
+    def abcd(self, frequencies: ArrayLike, length: float) -> ABCD:
+        """
+        一段传输线的ABCD矩阵
+
+        参数:
+            frequencies: 频率或频率数组 (Hz)
+            length: float, 物理长度 (m)
+
+        返回:
+            ABCD: 各频点的ABCD矩阵
+        """
+        f = np.asarray(frequencies, dtype=float)
+        return line_abcd(self.characteristic_impedance(f), self.propagation_constant(f) * length)
+
+
+def _surface_resistance_factor(conductivity: float) -> float:
+    """表面电阻 Rs = factor * sqrt(f) 中与频率无关的因子"""
+    if conductivity <= 0:
+        raise ValueError("电导率必须为正数")
+    return float(np.sqrt(np.pi * MU0 / conductivity))
+
+
+def _check_dielectric(eps_r: float, tan_delta: float) -> None:
+    """检查介质参数"""
+    if eps_r < 1:
+        raise ValueError("相对介电常数不能小于1")
+    if tan_delta < 0:
+        raise ValueError("损耗角正切不能为负数")
+
+
+def microstrip_static(width: ArrayLike, height: float, eps_r: float,
+                      thickness: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    微带线准静态特性阻抗和有效介电常数（Hammerstad 公式），对宽度数组向量化
+
+    参数:
+        width: 导带宽度或宽度数组 (m)
+        height: float, 介质厚度 (m)
+        eps_r: float, 相对介电常数
+        thickness: float, 导带厚度 (m)，为0时不做厚度修正
+
+    返回:
+        Tuple[np.ndarray, np.ndarray]: (特性阻抗 (Ω), 有效介电常数)
+    """
+    w = np.asarray(width, dtype=float)
+    if thickness > 0:
+        w = w + thickness / np.pi * (1 + np.log(2 * height / thickness))
+    u = w / height
+    eps_static = (eps_r + 1) / 2 + (eps_r - 1) / 2 / np.sqrt(1 + 12 / u)
+    narrow = 60 / np.sqrt(eps_static) * np.log(8 / u + u / 4)
+    wide = ETA0 / (np.sqrt(eps_static) * (u + 1.393 + 0.667 * np.log(u + 1.444)))
+    return np.where(u <= 1, narrow, wide), eps_static
+
+
+def microstrip_dispersion(frequencies: ArrayLike, height: float, eps_r: float,
+                          z_static: ArrayLike, eps_static: ArrayLike) -> np.ndarray:
+    """
+    微带线有效介电常数随频率的变化（Getsinger 模型）
+
+    参数:
+        frequencies: 频率或频率数组 (Hz)
+        height: float, 介质厚度 (m)
+        eps_r: float, 相对介电常数
+        z_static: 准静态特性阻抗 (Ω)
+        eps_static: 准静态有效介电常数
+
+    返回:
+        np.ndarray: 有效介电常数
+    """
+    f = np.asarray(frequencies, dtype=float)
+    fp = z_static / (2 * MU0 * height)
+    g = 0.6 + 0.009 * np.asarray(z_static)
+    return eps_r - (eps_r - eps_static) / (1 + g * (f / fp) ** 2)
+
+
+class IdealLine(TransmissionLine):
+    """
+    理想传输线
+
+    默认相速度为 3e8 m/s，与标量匹配器的波长计算一致。
+    """
+
+    def __init__(self, z0: float, phase_velocity: float = 3e8, attenuation: float = 0.0):
+        """
+        初始化理想传输线
+
+        参数:
+            z0: float, 特性阻抗 (Ω)
+            phase_velocity: float, 相速度 (m/s)
+            attenuation: float, 与频率无关的衰减常数 (Np/m)
+        """
+        if z0 <= 0:
+            raise ValueError("特征阻抗必须为正数")
+        if phase_velocity <= 0:
+            raise ValueError("相速度必须为正数")
+        self.z0 = z0
+        self.phase_velocity = phase_velocity
+        self.alpha = attenuation
+
+    def characteristic_impedance(self, frequencies: ArrayLike) -> np.ndarray:
+        return np.full(np.shape(frequencies), float(self.z0))
+
+    def effective_permittivity(self, frequencies: ArrayLike) -> np.ndarray:
+        return np.full(np.shape(frequencies), (SPEED_OF_LIGHT / self.phase_velocity) ** 2)
+
+    def attenuation(self, frequencies: ArrayLike) -> np.ndarray:
+        return np.full(np.shape(frequencies), float(self.alpha))
+
+    def phase_constant(self, frequencies: ArrayLike) -> np.ndarray:
+        return 2 * np.pi * np.asarray(frequencies, dtype=float) / self.phase_velocity
+
+
+class Microstrip(TransmissionLine):
+    """
+    微带线
+
+    准静态特性阻抗和有效介电常数采用 Hammerstad 公式（含导体厚度的有效宽度修正），
+    色散采用 Getsinger 模型，导体损耗按 Rs/(Z0·W) 估算，介质损耗按填充因子计算。
+    """
+
+    def __init__(self, width: float, height: float, eps_r: float, thickness: float = 0.0,
+                 tan_delta: float = 0.0, conductivity: float = COPPER_CONDUCTIVITY):
+        """
+        初始化微带线
+
+        参数:
+            width: float, 导带宽度 (m)
+            height: float, 介质厚度 (m)
+            eps_r: float, 相对介电常数
+            thickness: float, 导带厚度 (m)，为0时不做厚度修正
+            tan_delta: float, 介质损耗角正切
+            conductivity: float, 导体电导率 (S/m)
+        """
+        if width <= 0 or height <= 0:
+            raise ValueError("导带宽度和介质厚度必须为正数")
+        if thickness < 0:
+            raise ValueError("导带厚度不能为负数")
+        _check_dielectric(eps_r, tan_delta)
+
+        self.width = width
+        self.height = height
+        self.eps_r = eps_r
+        self.thickness = thickness
+        self.tan_delta = tan_delta
+        self.conductivity = conductivity
+
+        z_static, eps_static = microstrip_static(width, height, eps_r, thickness)
+        self.eps_static = float(eps_static)
+        self.z_static = float(z_static)
+        # 损耗前置因子，乘以 sqrt(f) 或 f 即得衰减常数
+        self._conductor_factor = _surface_resistance_factor(conductivity) / (self.z_static * width)
+        if eps_r > 1:
+            filling = eps_r * (self.eps_static - 1) / (self.eps_static * (eps_r - 1))
+        else:
+            filling = 1.0
+        self._dielectric_factor = np.pi * np.sqrt(self.eps_static) * filling * tan_delta / SPEED_OF_LIGHT
+
+    def effective_permittivity(self, frequencies: ArrayLike) -> np.ndarray:
+        return microstrip_dispersion(frequencies, self.height, self.eps_r, self.z_static, self.eps_static)
+
+    def characteristic_impedance(self, frequencies: ArrayLike) -> np.ndarray:
+        eps = self.effective_permittivity(frequencies)
+        if self.eps_static == 1:
+            return np.full(eps.shape, self.z_static)
+        return self.z_static * np.sqrt(self.eps_static / eps) * (eps - 1) / (self.eps_static - 1)
+
+    def attenuation(self, frequencies: ArrayLike) -> np.ndarray:
+        f = np.asarray(frequencies, dtype=float)
+        return self._conductor_factor * np.sqrt(f) + self._dielectric_factor * f
+
+
+class Stripline(TransmissionLine):
+    """
+    对称带状线
+
+    TEM 传输线，无色散。特性阻抗和导体损耗采用 Pozar 给出的近似公式。
+    """
+
+    def __init__(self, width: float, ground_spacing: float, eps_r: float,
+                 thickness: float = 35e-6, tan_delta: float = 0.0,
+                 conductivity: float = COPPER_CONDUCTIVITY):
+        """
+        初始化带状线
+
+        参数:
+            width: float, 导带宽度 (m)
+            ground_spacing: float, 两接地板间距 (m)
+            eps_r: float, 相对介电常数
+            thickness: float, 导带厚度 (m)
+            tan_delta: float, 介质损耗角正切
+            conductivity: float, 导体电导率 (S/m)
+        """
+        if width <= 0 or ground_spacing <= 0 or thickness <= 0:
+            raise ValueError("导带宽度、接地板间距和导带厚度必须为正数")
+        if thickness >= ground_spacing:
+            raise ValueError("导带厚度必须小于接地板间距")
+        _check_dielectric(eps_r, tan_delta)
+
+        self.width = width
+        self.ground_spacing = ground_spacing
+        self.eps_r = eps_r
+        self.thickness = thickness
+        self.tan_delta = tan_delta
+        self.conductivity = conductivity
+
+        b, t, w = ground_spacing, thickness, width
+        ratio = w / b
+        w_eff = w - (0 if ratio > 0.35 else (0.35 - ratio) ** 2 * b)
+        self.z_static = float(30 * np.pi / np.sqrt(eps_r) * b / (w_eff + 0.441 * b))
+
+        if np.sqrt(eps_r) * self.z_static < 120:
+            a = 1 + 2 * w / (b - t) + (b + t) / (np.pi * (b - t)) * np.log((2 * b - t) / t)
+            geometry = 2.7e-3 * eps_r * self.z_static / (30 * np.pi * (b - t)) * a
+        else:
+            bb = 1 + b / (0.5 * w + 0.7 * t) * (0.5 + 0.414 * t / w + np.log(4 * np.pi * w / t) / (2 * np.pi))
+            geometry = 0.16 / (self.z_static * b) * bb
+        self._conductor_factor = _surface_resistance_factor(conductivity) * geometry
+        self._dielectric_factor = np.pi * np.sqrt(eps_r) * tan_delta / SPEED_OF_LIGHT
+
+    def characteristic_impedance(self, frequencies: ArrayLike) -> np.ndarray:
+        return np.full(np.shape(frequencies), self.z_static)
+
+    def effective_permittivity(self, frequencies: ArrayLike) -> np.ndarray:
+        return np.full(np.shape(frequencies), float(self.eps_r))
+
+    def attenuation(self, frequencies: ArrayLike) -> np.ndarray:
+        f = np.asarray(frequencies, dtype=float)
+        return self._conductor_factor * np.sqrt(f) + self._dielectric_factor * f
+
+
+class Coax(TransmissionLine):
+    """同轴线，TEM 传输线，无色散"""
+
+    def __init__(self, inner_radius: float, outer_radius: float, eps_r: float = 1.0,
+                 tan_delta: float = 0.0, conductivity: float = COPPER_CONDUCTIVITY):
+        """
+        初始化同轴线
+
+        参数:
+            inner_radius: float, 内导体半径 (m)
+            outer_radius: float, 外导体内半径 (m)
+            eps_r: float, 相对介电常数
+            tan_delta: float, 介质损耗角正切
+            conductivity: float, 导体电导率 (S/m)
+        """
+        if inner_radius <= 0 or outer_radius <= inner_radius:
+            raise ValueError("外导体半径必须大于内导体半径且均为正数")
+        _check_dielectric(eps_r, tan_delta)
+
+        self.inner_radius = inner_radius
+        self.outer_radius = outer_radius
+        self.eps_r = eps_r
+        self.tan_delta = tan_delta
+        self.conductivity = conductivity
+
+        log_ratio = np.log(outer_radius / inner_radius)
+        eta = ETA0 / np.sqrt(eps_r)
+        self.z_static = float(eta / (2 * np.pi) * log_ratio)
+        self._conductor_factor = (_surface_resistance_factor(conductivity) / (2 * eta)
+                                  * (1 / inner_radius + 1 / outer_radius) / log_ratio)
+        self._dielectric_factor = np.pi * np.sqrt(eps_r) * tan_delta / SPEED_OF_LIGHT
+
+    def characteristic_impedance(self, frequencies: ArrayLike) -> np.ndarray:
+        return np.full(np.shape(frequencies), self.z_static)
+
+    def effective_permittivity(self, frequencies: ArrayLike) -> np.ndarray:
+        return np.full(np.shape(frequencies), float(self.eps_r))
+
+    def attenuation(self, frequencies: ArrayLike) -> np.ndarray:
+        f = np.asarray(frequencies, dtype=float)
+        return self._conductor_factor * np.sqrt(f) + self._dielectric_factor * f
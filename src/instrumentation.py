@@ -0,0 +1,292 @@
+"""性能剖析模块
+
+为计算流程提供分阶段计时器和计数器。默认关闭，关闭时 ``stage`` 返回共享的
+空上下文，``count`` 只做一次属性检查，对热路径的开销可以忽略。
+
+用法::
+
+    from src import instrumentation
+
+    instrumentation.enable()
+    calculator.batch_calculate(param_list)
+    instrumentation.profiler.export_chrome_trace("trace.json")
+
+计时和计数只在当前进程内记录，进程池中的子进程不会汇总到主进程。
+"""
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _NullStage:
+    """剖析关闭时使用的空上下文"""
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """记录一次阶段耗时的上下文"""
+    __slots__ = ("_profiler", "_name", "_start", "_memory")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self._profiler = profiler
+        self._name = name
+        self._start = 0
+        self._memory = 0
+
+    def __enter__(self) -> "_Stage":
+        if self._profiler.track_memory:
+            self._memory = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        end = time.perf_counter_ns()
+        memory = tracemalloc.get_traced_memory()[0] - self._memory if self._profiler.track_memory else 0
+        self._profiler._record(self._name, self._start, end, memory)
+        return False
+
+
+class Profiler:
+    """
+    分阶段计时与计数器
+
+    每个阶段累计调用次数、总耗时、最短和最长耗时；开启内存跟踪时还累计
+    阶段内净分配的字节数。逐次事件用于导出 Chrome trace，超过 ``max_events``
+    后只保留统计并记录丢弃数。
+    """
+
+    def __init__(self, max_events: int = 100_000):
+        """
+        初始化剖析器
+
+        参数:
+            max_events: int, 保留的逐次事件上限
+        """
+        self.enabled = False
+        self.track_memory = False
+        self.max_events = max_events
+        self._started_tracemalloc = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self, track_memory: bool = False) -> None:
+        """
+        开启剖析
+
+        参数:
+            track_memory: bool, 是否通过 tracemalloc 统计每个阶段的内存分配
+        """
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.track_memory = track_memory
+        self.enabled = True
+
+    def disable(self) -> None:
+        """关闭剖析，已记录的数据保留到 reset 为止"""
+        self.enabled = False
+        self.track_memory = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def reset(self) -> None:
+        """清空已记录的数据"""
+        self._epoch = time.perf_counter_ns()
+        self._stages: Dict[str, List[int]] = {}
+        self._counters: Dict[str, int] = {}
+        self._events: List[Tuple[str, int, int, int]] = []
+        self.dropped_events = 0
+
+    def stage(self, name: str) -> Any:
+        """
+        返回一个为阶段计时的上下文管理器
+
+        参数:
+            name: str, 阶段名
+
+        返回:
+            上下文管理器，剖析关闭时为共享的空上下文
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """
+        累加计数器
+
+        参数:
+            name: str, 计数器名，如 evaluations、cache_hits
+            n: int, 增量
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def _record(self, name: str, start: int, end: int, memory: int) -> None:
+        """记录一次阶段耗时 (纳秒)"""
+        duration = end - start
+        with self._lock:
+            stats = self._stages.get(name)
+            if stats is None:
+                self._stages[name] = [1, duration, duration, duration, memory]
+            else:
+                stats[0] += 1
+                stats[1] += duration
+                stats[2] = min(stats[2], duration)
+                stats[3] = max(stats[3], duration)
+                stats[4] += memory
+            if len(self._events) < self.max_events:
+                self._events.append((name, start, duration, threading.get_ident()))
+            else:
+                self.dropped_events += 1
+
+    def report(self) -> Dict[str, Any]:
+        """
+        汇总统计
+
+        返回:
+            Dict[str, Any]: stages 为各阶段的次数和耗时 (秒)，counters 为计数器
+        """
+        with self._lock:
+            stages = {
+                name: {
+                    "count": count,
+                    "total": total / 1e9,
+                    "mean": total / count / 1e9,
+                    "min": low / 1e9,
+                    "max": high / 1e9,
+                    "memory": memory
+                }
+                for name, (count, total, low, high, memory) in self._stages.items()
+            }
+            return {
+                "stages": stages,
+                "counters": dict(self._counters),
+                "dropped_events": self.dropped_events
+            }
+
+    def export_json(self, path: str) -> None:
+        """
+        将汇总统计写为 JSON
+
+        参数:
+            path: str, 输出路径
+        """
+        _write_json(path, self.report())
+
+    def export_chrome_trace(self, path: str) -> None:
+        """
+        写出 Chrome trace 格式文件，可在 chrome://tracing 或 Perfetto 中查看
+
+        参数:
+            path: str, 输出路径
+        """
+        pid = os.getpid()
+        with self._lock:
+            events: List[Dict[str, Any]] = [
+                {
+                    "name": name,
+                    "cat": "stage",
+                    "ph": "X",
+                    "ts": (start - self._epoch) / 1e3,
+                    "dur": duration / 1e3,
+                    "pid": pid,
+                    "tid": tid
+                }
+                for name, start, duration, tid in self._events
+            ]
+            end = max((event["ts"] + event["dur"] for event in events), default=0.0)
+            events.extend(
+                {"name": name, "ph": "C", "ts": end, "pid": pid, "args": {name: value}}
+                for name, value in self._counters.items()
+            )
+        _write_json(path, {"traceEvents": events, "displayTimeUnit": "ms"})
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    """写出 JSON 文件，必要时创建目录"""
+    save_dir = os.path.dirname(path)
+    if save_dir:
+        os.makedirs(save_dir, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def throughput(designs: int, elapsed: float) -> Dict[str, float]:
+    """
+    计算吞吐量
+
+    参数:
+        designs: int, 完成的设计数
+        elapsed: float, 耗时 (秒)
+
+    返回:
+        Dict[str, float]: designs、elapsed 和 designs_per_second
+    """
+    if elapsed > 0:
+        rate = designs / elapsed
+    else:
+        rate = float("inf") if designs else 0.0
+    return {"designs": designs, "elapsed": elapsed, "designs_per_second": rate}
+
+
+profiler = Profiler()
+
+
+def enable(track_memory: bool = False) -> None:
+    """开启全局剖析器"""
+    profiler.enable(track_memory)
+
+
+def disable() -> None:
+    """关闭全局剖析器"""
+    profiler.disable()
+
+
+def stage(name: str) -> Any:
+    """为全局剖析器的一个阶段计时"""
+    return profiler.stage(name)
+
+
+def count(name: str, n: int = 1) -> None:
+    """累加全局剖析器的计数器"""
+    profiler.count(name, n)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """
+    为整个函数调用计时的装饰器
+
+    参数:
+        name: str, 阶段名
+    """
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with profiler.stage(name):
+                return func(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+def report() -> Dict[str, Any]:
+    """汇总全局剖析器的统计"""
+    return profiler.report()
@@ -0,0 +1,42 @@
+"""原子读写 ``.npz`` 文件
+
+检查点、微带线综合表格等缓存文件共用的读写函数，不依赖求解或优化模块。
+写入先落到同目录的临时文件再替换，进程在写入途中终止或并行进程同时写入时，
+读取方只会看到完整的旧文件或新文件；读取不允许 pickle。
+"""
+import os
+import numpy as np
+from typing import Dict, Mapping, Optional
+
+
+def save_npz(path: str, arrays: Mapping[str, np.ndarray]) -> None:
+    """
+    原子写入 ``.npz`` 文件，按需创建所在目录
+
+    参数:
+        path: str, 文件路径
+        arrays: Mapping[str, np.ndarray], 数组
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(temp_path, path)
+
+
+def load_npz(path: str) -> Optional[Dict[str, np.ndarray]]:
+    """
+    读取 ``.npz`` 文件的全部数组
+
+    参数:
+        path: str, 文件路径
+
+    返回:
+        Optional[Dict[str, np.ndarray]]: 数组，文件不存在时为None
+    """
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        return {name: data[name] for name in data.files}
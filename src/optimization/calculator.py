@@ -1,6 +1,9 @@
 """优化计算模块"""
+import hashlib
+import json
+import time
 import numpy as np
-from typing import Dict, List, Optional, Union, Tuple, Any, cast, TypedDict, NotRequired
+from typing import Dict, List, Optional, Union, Tuple, Any, Callable, cast, TypedDict, NotRequired
 from src.impedance_matching.core import (
     QuarterWaveTransformer,
     StubMatcher,
@@ -8,6 +11,17 @@ from src.impedance_matching.core import (
     PiMatcher,
     TMatcher
 )
+from src import instrumentation
+from src.impedance_matching.batch import precision_dtypes
+from src.impedance_matching.kernels import KERNELS
+from src.impedance_matching.parallel import solve_shared
+from src.optimization.checkpoint import Checkpoint
+from src.optimization.validation import ValidationResult, validate_arrays
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+# 可按数组批量给出的数值参数
+NUMERIC_FIELDS = ("freq", "z0", "z_load_real", "z_load_imag")
 
 class CalculationParametersDict(TypedDict):
     """计算参数字典类型"""
@@ -20,7 +34,14 @@ class CalculationParametersDict(TypedDict):
     weight_factors: NotRequired[Dict[str, float]]
 
 class CalculationParameters:
-    """计算参数类"""
+    """
+    计算参数类
+
+    数值字段以浮点数保存，使用 __slots__ 减小大批量参数对象的内存占用。
+    """
+    __slots__ = ("freq", "z0", "z_load_real", "z_load_imag", "matching_method",
+                 "optimization_target", "weight_factors")
+
     def __init__(self, freq: float = 5e9, z0: float = 50, z_load_real: float = 75,
                  z_load_imag: float = 25, matching_method: str = "quarter_wave",
                  optimization_target: str = "vswr", weight_factors: Optional[Dict[str, float]] = None):
@@ -46,11 +67,7 @@ class CalculationParameters:
             raise ValueError("匹配方法必须是 quarter_wave, stub, L, Pi 或 T")
         if optimization_target not in ["vswr", "length"]:
             raise ValueError("优化目标必须是vswr或length")
-        if weight_factors is not None:
-            if not all(0 <= v <= 1 for v in weight_factors.values()):
-                raise ValueError("权重因子必须在0到1之间")
-            if abs(sum(weight_factors.values()) - 1) > 1e-6:
-                raise ValueError("权重因子之和必须为1")
+        _check_weight_factors(weight_factors)
 
         self.freq = freq
         self.z0 = z0
@@ -60,6 +77,52 @@ class CalculationParameters:
         self.optimization_target = optimization_target
         self.weight_factors = weight_factors or {"vswr": 0.7, "length": 0.3}
 
+    @classmethod
+    def _from_validated(cls, freq: float, z0: float, z_load_real: float, z_load_imag: float,
+                        matching_method: str, optimization_target: str,
+                        weight_factors: Dict[str, float]) -> 'CalculationParameters':
+        """由已经过 validate_arrays 检查的值创建参数对象，不重复逐个检查"""
+        params = cls.__new__(cls)
+        params.freq = freq
+        params.z0 = z0
+        params.z_load_real = z_load_real
+        params.z_load_imag = z_load_imag
+        params.matching_method = matching_method
+        params.optimization_target = optimization_target
+        # 每个对象持有自己的权重因子，修改一行不影响其他行
+        params.weight_factors = dict(weight_factors)
+        return params
+
+    @classmethod
+    def from_arrays(cls, freq: np.ndarray, z0: np.ndarray, z_load_real: np.ndarray,
+                    z_load_imag: np.ndarray, matching_method: str = "quarter_wave",
+                    optimization_target: str = "vswr",
+                    weight_factors: Optional[Dict[str, float]] = None) -> List['CalculationParameters']:
+        """
+        由参数数组批量创建参数对象
+
+        数值参数可以是标量或可相互广播的数组，整体验证一次，不经过逐个对象的检查和字符串转换。
+
+        参数:
+            freq: np.ndarray, 频率 (Hz)
+            z0: np.ndarray, 特征阻抗 (Ω)
+            z_load_real: np.ndarray, 负载阻抗实部 (Ω)
+            z_load_imag: np.ndarray, 负载阻抗虚部 (Ω)
+            matching_method: str, 匹配方法
+            optimization_target: str, 优化目标
+            weight_factors: dict, 权重因子
+
+        返回:
+            List[CalculationParameters]: 按行排列的参数对象
+        """
+        _check_weight_factors(weight_factors)
+        validation = validate_arrays(freq, z0, z_load_real, z_load_imag,
+                                     matching_method, optimization_target)
+        validation.raise_if_invalid()
+        return _build_parameters((freq, z0, z_load_real, z_load_imag), validation.mask,
+                                 matching_method, optimization_target,
+                                 weight_factors or {"vswr": 0.7, "length": 0.3})
+
     def get_complex_load(self) -> complex:
         """
         获取复数形式的负载阻抗
@@ -86,10 +149,10 @@ class CalculationParameters:
             CalculationParametersDict: 参数字典
         """
         return {
-            "freq": str(self.freq),
-            "z0": str(self.z0),
-            "z_load_real": str(self.z_load_real),
-            "z_load_imag": str(self.z_load_imag),
+            "freq": self.freq,
+            "z0": self.z0,
+            "z_load_real": self.z_load_real,
+            "z_load_imag": self.z_load_imag,
             "matching_method": self.matching_method,
             "optimization_target": self.optimization_target,
             "weight_factors": self.weight_factors
@@ -101,22 +164,16 @@ class CalculationParameters:
         从字典创建参数对象
 
         参数:
-            data: CalculationParametersDict, 参数字典
+            data: CalculationParametersDict, 参数字典，数值字段可以是数字或数字字符串
 
         返回:
             CalculationParameters: 参数对象
         """
-        # 确保数值类型的字段被转换为浮点数
-        freq = float(data["freq"]) if isinstance(data["freq"], (str, float)) else 0.0
-        z0 = float(data["z0"]) if isinstance(data["z0"], (str, float)) else 0.0
-        z_load_real = float(data["z_load_real"]) if isinstance(data["z_load_real"], (str, float)) else 0.0
-        z_load_imag = float(data["z_load_imag"]) if isinstance(data["z_load_imag"], (str, float)) else 0.0
-
         return cls(
-            freq=freq,
-            z0=z0,
-            z_load_real=z_load_real,
-            z_load_imag=z_load_imag,
+            freq=float(data["freq"]),
+            z0=float(data["z0"]),
+            z_load_real=float(data["z_load_real"]),
+            z_load_imag=float(data["z_load_imag"]),
             matching_method=str(data["matching_method"]),
             optimization_target=str(data["optimization_target"]),
             weight_factors=data.get("weight_factors")
@@ -132,18 +189,44 @@ class CalculationParameters:
             f"matching_method={self.matching_method})"
         )
 
+def _check_weight_factors(weight_factors: Optional[Dict[str, float]]) -> None:
+    """检查权重因子"""
+    if weight_factors is not None:
+        if not all(0 <= v <= 1 for v in weight_factors.values()):
+            raise ValueError("权重因子必须在0到1之间")
+        if abs(sum(weight_factors.values()) - 1) > 1e-6:
+            raise ValueError("权重因子之和必须为1")
+
+def _build_parameters(columns: Tuple[np.ndarray, ...], mask: np.ndarray, matching_method: str,
+                      optimization_target: str,
+                      weight_factors: Dict[str, float]) -> List[CalculationParameters]:
+    """为掩码选中的行创建参数对象，调用方负责先完成验证"""
+    arrays = np.broadcast_arrays(*(np.asarray(values, dtype=float) for values in columns))
+    rows = zip(*(array[mask].tolist() for array in arrays))
+    from_validated = CalculationParameters._from_validated
+    return [from_validated(freq, z0, z_load_real, z_load_imag,
+                           matching_method, optimization_target, weight_factors)
+            for freq, z0, z_load_real, z_load_imag in rows]
+
 class BatchCalculator:
     """批量计算器类"""
-    def __init__(self, params: CalculationParameters):
+    def __init__(self, params: CalculationParameters, precision: str = "double"):
         """
         初始化批量计算器
 
         参数:
             params: CalculationParameters, 计算参数
+            precision: str, ``screen_arrays`` 的计算精度，double 或 single
         """
+        precision_dtypes(precision)
         self.params = params
+        self.precision = precision
         self.results: List[Dict[str, Any]] = []
         self.best_result: Optional[Dict[str, Any]] = None
+        # 最近一次批量计算的吞吐量，见 instrumentation.throughput
+        self.throughput: Dict[str, float] = {}
+        # 最近一次按数组生成参数时的验证结果，记录被跳过的无效行
+        self.validation: Optional[ValidationResult] = None
 
     def calculate(self, params: Optional[CalculationParameters] = None) -> Dict[str, Any]:
         """
@@ -158,41 +241,202 @@ class BatchCalculator:
         if params is None:
             params = self.params
 
-        if params.matching_method == "quarter_wave":
-            calculator = QuarterWaveTransformer(
-                frequency=params.freq,
-                z0=params.z0,
-                zl=params.get_complex_load()
-            )
-        else:  # stub
-            calculator = StubMatcher(
-                frequency=params.freq,
-                z0=params.z0,
-                zl=params.get_complex_load()
-            )
-
-        result = calculator.calculate()
+        instrumentation.count("evaluations")
+        with instrumentation.stage("network"):
+            if params.matching_method == "quarter_wave":
+                calculator = QuarterWaveTransformer(
+                    frequency=params.freq,
+                    z0=params.z0,
+                    zl=params.get_complex_load()
+                )
+            else:  # stub
+                calculator = StubMatcher(
+                    frequency=params.freq,
+                    z0=params.z0,
+                    zl=params.get_complex_load()
+                )
+
+        with instrumentation.stage("s_parameters"):
+            result = calculator.calculate()
         result["params"] = params.to_dict()
         return result
 
-    def batch_calculate(self, param_list: List[CalculationParameters]) -> List[Dict[str, Any]]:
+    def batch_calculate(self, param_list: List[CalculationParameters],
+                        progress_callback: Optional[ProgressCallback] = None,
+                        checkpoint: Optional[Checkpoint] = None,
+                        overwrite_checkpoint: bool = False) -> List[Dict[str, Any]]:
         """
         执行批量计算
 
+        给出检查点时每完成 checkpoint.interval 行记录一次已完成的行数和最优行。
+        以相同参数列表再次调用时跳过已完成的行，最优结果由记录的最优行重新计算，
+        此时 ``self.results`` 只包含本次计算的行。
+
         参数:
             param_list: List[CalculationParameters], 参数列表
+            progress_callback: Optional[ProgressCallback], 每得到一个结果时调用的回调
+            checkpoint: Optional[Checkpoint], 检查点
+            overwrite_checkpoint: bool, 检查点属于其他参数列表或不是批量计算的检查点时是否从头计算并覆盖，
+                为False时抛出 ValueError
 
         返回:
             List[Dict[str, Any]]: 计算结果列表
         """
         self.results = []
-        for params in param_list:
-            result = self.calculate(params)
+        first_row, best_row = 0, -1
+        if checkpoint is not None:
+            grid = hashlib.sha1(json.dumps([params.to_dict() for params in param_list],
+                                           sort_keys=True).encode()).hexdigest()
+            saved = checkpoint.load()
+            if saved is not None and saved[1].get("kind") == "grid" and saved[1].get("grid") == grid:
+                first_row, best_row = saved[1]["completed"], saved[1]["best"]
+                if best_row >= 0:
+                    result = self.calculate(param_list[best_row])
+                    if self._is_better_result(result):
+                        self.best_result = result
+            elif saved is not None and not overwrite_checkpoint:
+                raise ValueError(f"检查点 {checkpoint.path} 属于其他参数列表或不是批量计算的检查点，"
+                                 "请换用新的检查点路径或设置 overwrite_checkpoint=True")
+
+        start = time.perf_counter()
+        for row in range(first_row, len(param_list)):
+            result = self.calculate(param_list[row])
             self.results.append(result)
-            if self._is_better_result(result):
-                self.best_result = result
+            with instrumentation.stage("selection"):
+                if self._is_better_result(result):
+                    self.best_result = result
+                    best_row = row
+            if progress_callback is not None:
+                progress_callback(result)
+            if checkpoint is not None and (checkpoint.due(row + 1) or row + 1 == len(param_list)):
+                checkpoint.save({}, {"kind": "grid", "grid": grid, "completed": row + 1, "best": best_row})
+        self.throughput = instrumentation.throughput(len(param_list) - first_row, time.perf_counter() - start)
         return self.results
 
+    def batch_calculate_arrays(self, freq: np.ndarray, z0: np.ndarray, z_load_real: np.ndarray,
+                               z_load_imag: np.ndarray,
+                               progress_callback: Optional[ProgressCallback] = None) -> List[Dict[str, Any]]:
+        """
+        对参数数组执行批量计算
+
+        参数一次性批量验证，无效行被跳过而不会中断计算，
+        各行的有效性和错误码记录在 ``self.validation`` 中。
+        匹配方法、优化目标和权重因子取自初始化时的参数。
+
+        参数:
+            freq: np.ndarray, 频率 (Hz)
+            z0: np.ndarray, 特征阻抗 (Ω)
+            z_load_real: np.ndarray, 负载阻抗实部 (Ω)
+            z_load_imag: np.ndarray, 负载阻抗虚部 (Ω)
+            progress_callback: Optional[ProgressCallback], 每得到一个结果时调用的回调
+
+        返回:
+            List[Dict[str, Any]]: 有效行的计算结果，按行顺序排列
+        """
+        param_list = self._params_from_arrays(freq, z0, z_load_real, z_load_imag)
+        return self.batch_calculate(param_list, progress_callback)
+
+    def screen_arrays(self, freq: np.ndarray, z0: np.ndarray, z_load_real: np.ndarray,
+                      z_load_imag: np.ndarray, workers: int = 1,
+                      chunk_size: int = 100_000) -> Dict[str, np.ndarray]:
+        """
+        对参数数组做向量化初筛
+
+        按 ``self.precision`` 一次求解全部有效行，不为每行创建参数对象和结果字典，
+        适合数百万个候选设计的第一轮筛选。按优化目标选出的最优行再以相同公式在双精度下计算，
+        存入 ``self.best_result``，因此最优结果不受单精度误差影响。
+        多进程时工作进程直接写入共享内存中的结果数组，不序列化逐行的结果字典。
+        只支持有批量内核的匹配方法（``kernels.KERNELS``）。
+
+        参数:
+            freq: np.ndarray, 频率 (Hz)
+            z0: np.ndarray, 特征阻抗 (Ω)
+            z_load_real: np.ndarray, 负载阻抗实部 (Ω)
+            z_load_imag: np.ndarray, 负载阻抗虚部 (Ω)
+            workers: int, 并行进程数，为1时在当前进程计算
+            chunk_size: int, 每个任务块的行数
+
+        返回:
+            Dict[str, np.ndarray]: row（有效行在输入中的行号）和匹配方法的结果列，结果列为所选精度
+        """
+        self._check_screening_method()
+        columns = [np.asarray(column, dtype=float) for column in (freq, z0, z_load_real, z_load_imag)]
+        with instrumentation.stage("validation"):
+            self.validation = validate_arrays(*columns)
+        rows = np.flatnonzero(self.validation.mask)
+        freq, z0, z_load_real, z_load_imag = (column[rows] for column in columns)
+
+        start = time.perf_counter()
+        instrumentation.count("evaluations", len(rows))
+        with instrumentation.stage("s_parameters"):
+            solution = solve_shared(self.params.matching_method, freq, z0, z_load_real + 1j * z_load_imag,
+                                    workers=workers, chunk_size=chunk_size, precision=self.precision)
+        if len(rows):
+            self.select_best(solution, freq, z0, z_load_real, z_load_imag)
+        self.throughput = instrumentation.throughput(len(rows), time.perf_counter() - start)
+        return dict(solution, row=rows)
+
+    def select_best(self, solution: Dict[str, np.ndarray], freq: np.ndarray, z0: np.ndarray,
+                    z_load_real: np.ndarray, z_load_imag: np.ndarray) -> int:
+        """
+        按优化目标从向量化结果中选出最优行，并以双精度重新计算存入 ``self.best_result``
+
+        最优行用与初筛相同的批量内核重新计算，``self.best_result`` 的键为该内核的结果列加上 params，
+        报告的数值与排序所用的模型一致。
+
+        参数:
+            solution: Dict[str, np.ndarray], 匹配方法的结果列
+            freq: np.ndarray, 各行的频率 (Hz)
+            z0: np.ndarray, 各行的特征阻抗 (Ω)
+            z_load_real: np.ndarray, 各行的负载阻抗实部 (Ω)
+            z_load_imag: np.ndarray, 各行的负载阻抗虚部 (Ω)
+
+        返回:
+            int: 最优行的下标，并列时取第一行
+        """
+        self._check_screening_method()
+        with instrumentation.stage("selection"):
+            if self.params.optimization_target == "vswr":
+                score = solution["vswr"]
+            elif self.params.matching_method == "quarter_wave":
+                score = solution["length"]
+            else:
+                score = solution["distance"] + solution["stub_length"]
+            best = int(np.argmin(score))
+        params = CalculationParameters._from_validated(
+            float(freq[best]), float(z0[best]), float(z_load_real[best]), float(z_load_imag[best]),
+            self.params.matching_method, self.params.optimization_target, self.params.weight_factors)
+        exact = KERNELS[params.matching_method](np.array([params.freq]), np.array([params.z0]),
+                                                np.array([params.get_complex_load()]), "double")
+        self.best_result = {name: values[0].item() for name, values in exact.items()}
+        self.best_result["params"] = params.to_dict()
+        return best
+
+    def _check_screening_method(self) -> None:
+        """向量化初筛只支持有批量内核的匹配方法"""
+        if self.params.matching_method not in KERNELS:
+            raise ValueError(f"向量化初筛不支持匹配方法 {self.params.matching_method}，"
+                             f"可用: {', '.join(KERNELS)}")
+
+    def _params_from_arrays(self, freq: np.ndarray, z0: np.ndarray, z_load_real: np.ndarray,
+                            z_load_imag: np.ndarray) -> List[CalculationParameters]:
+        """
+        批量验证参数数组并为有效行创建参数对象
+
+        返回:
+            List[CalculationParameters]: 有效行的参数对象
+        """
+        with instrumentation.stage("validation"):
+            self.validation = validate_arrays(freq, z0, z_load_real, z_load_imag)
+        with instrumentation.stage("parameters"):
+            return _build_parameters((freq, z0, z_load_real, z_load_imag), self.validation.mask,
+                                     self.params.matching_method, self.params.optimization_target,
+                                     self.params.weight_factors)
+
+    def _base_columns(self, count: int) -> Dict[str, np.ndarray]:
+        """以当前参数填充的数值参数列"""
+        return {name: np.full(count, float(getattr(self.params, name))) for name in NUMERIC_FIELDS}
+
     def _is_better_result(self, result: Dict[str, Any]) -> bool:
         """
         判断结果是否更优
@@ -213,19 +457,27 @@ class BatchCalculator:
             best_length = self.best_result["distance"] + self.best_result["stub_length"]
             return current_length < best_length
 
-    def optimize(self, param_ranges: Dict[str, Tuple[float, float]], num_points: int = 10) -> Dict[str, Any]:
+    def optimize(self, param_ranges: Dict[str, Tuple[float, float]], num_points: int = 10,
+                 progress_callback: Optional[ProgressCallback] = None,
+                 checkpoint: Optional[str] = None, checkpoint_interval: int = 100,
+                 overwrite_checkpoint: bool = False) -> Dict[str, Any]:
         """
         执行参数优化
 
         参数:
             param_ranges: Dict[str, Tuple[float, float]], 参数范围
             num_points: int, 每个参数的采样点数
+            progress_callback: Optional[ProgressCallback], 每得到一个结果时调用的回调
+            checkpoint: Optional[str], 检查点文件路径 (.npz)，中断后以相同参数再次调用时跳过已完成的组合
+            checkpoint_interval: int, 写入检查点的组合数间隔
+            overwrite_checkpoint: bool, 检查点不属于本次扫描时是否从头计算并覆盖，为False时抛出 ValueError
 
         返回:
             Dict[str, Any]: 最优结果
         """
         param_list = self._generate_param_combinations(param_ranges, num_points)
-        self.batch_calculate(param_list)
+        saved = Checkpoint(checkpoint, checkpoint_interval) if checkpoint is not None else None
+        self.batch_calculate(param_list, progress_callback, saved, overwrite_checkpoint)
         if self.best_result is None:
             return {}  # 返回空字典作为默认结果
         return self.best_result
@@ -240,40 +492,39 @@ class BatchCalculator:
             num_points: int, 每个参数的采样点数
 
         返回:
-            List[CalculationParameters]: 参数组合列表
+            List[CalculationParameters]: 有效的参数组合列表，无效组合记录在 self.validation 中
         """
-        param_list = []
-        base_params = self.params.to_dict()
-
+        blocks = []
         for param_name, (min_val, max_val) in param_ranges.items():
-            values = np.linspace(min_val, max_val, num_points)
-            for value in values:
-                params_dict = base_params.copy()
-                params_dict[param_name] = float(value)
-                param_list.append(CalculationParameters.from_dict(params_dict))
-
-        return param_list
-
-    def parameter_sweep(self, param_name: str, values: List[float]) -> List[Dict[str, Any]]:
+            _check_numeric_field(param_name)
+            block = self._base_columns(num_points)
+            block[param_name] = np.linspace(min_val, max_val, num_points)
+            blocks.append(block)
+
+        if not blocks:
+            self.validation = None
+            return []
+        columns = [np.concatenate([block[name] for block in blocks]) for name in NUMERIC_FIELDS]
+        return self._params_from_arrays(*columns)
+
+    def parameter_sweep(self, param_name: str, values: List[float],
+                        progress_callback: Optional[ProgressCallback] = None) -> List[Dict[str, Any]]:
         """
         执行参数扫描
 
         参数:
             param_name: str, 参数名称
             values: List[float], 参数值列表
+            progress_callback: Optional[ProgressCallback], 每得到一个结果时调用的回调
 
         返回:
-            List[Dict[str, Any]]: 计算结果列表
+            List[Dict[str, Any]]: 有效参数值的计算结果，无效值被跳过并记录在 self.validation 中
         """
-        param_list = []
-        base_params = self.params.to_dict()
-
-        for value in values:
-            params_dict = base_params.copy()
-            params_dict[param_name] = value
-            param_list.append(CalculationParameters.from_dict(params_dict))
-
-        return self.batch_calculate(param_list)
+        _check_numeric_field(param_name)
+        columns = self._base_columns(len(values))
+        columns[param_name] = np.asarray(values, dtype=float)
+        return self.batch_calculate_arrays(*(columns[name] for name in NUMERIC_FIELDS),
+                                           progress_callback=progress_callback)
 
     def get_best_result(self) -> Optional[Dict[str, Any]]:
         """
@@ -293,6 +544,11 @@ class BatchCalculator:
         """
         return self.results 
 
+def _check_numeric_field(name: str) -> None:
+    """检查参数名是否为可扫描的数值参数"""
+    if name not in NUMERIC_FIELDS:
+        raise ValueError(f"只能扫描数值参数: {', '.join(NUMERIC_FIELDS)}")
+
 def calculate_matching(frequency: float, z0: float, zl: complex):
     """
     计算阻抗匹配网络参数
@@ -311,13 +567,15 @@ def calculate_matching(frequency: float, z0: float, zl: complex):
         raise ValueError("Characteristic impedance must be positive")
         
     # 创建不同类型的匹配网络
-    networks = {
-        "quarter_wave": QuarterWaveTransformer(frequency, z0, zl),
-        "stub": StubMatcher(frequency, z0, zl),
-        "l_network": LMatcher(frequency, z0, zl),
-        "pi_network": PiMatcher(frequency, z0, zl),
-        "t_network": TMatcher(frequency, z0, zl)
-    }
+    with instrumentation.stage("network"):
+        networks = {
+            "quarter_wave": QuarterWaveTransformer(frequency, z0, zl),
+            "stub": StubMatcher(frequency, z0, zl),
+            "l_network": LMatcher(frequency, z0, zl),
+            "pi_network": PiMatcher(frequency, z0, zl),
+            "t_network": TMatcher(frequency, z0, zl)
+        }
+    instrumentation.count("evaluations", len(networks))
     
     # 计算每种网络的性能
     results = {}
@@ -325,7 +583,8 @@ def calculate_matching(frequency: float, z0: float, zl: complex):
     best_network = None
     
     for name, network in networks.items():
-        result = network.calculate()
+        with instrumentation.stage("s_parameters"):
+            result = network.calculate()
         vswr = calculate_vswr(result["s_parameters"][0, 0])
         
         if vswr < best_vswr:
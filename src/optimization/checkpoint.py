@@ -0,0 +1,97 @@
+"""优化检查点模块
+
+长时间优化的状态（种群、速度、个体最优、全局最优、随机数生成器状态和已完成的迭代数）
+定期写入 ``.npz`` 文件：数组原样保存，其余元数据以 JSON 字符串保存，读取时不需要 pickle。
+写入经 ``npz_io.save_npz`` 先落到临时文件再替换，进程在写入途中终止也不会损坏已有的检查点。
+"""
+import json
+import numpy as np
+from typing import Any, Dict, Optional, Tuple
+
+from src.npz_io import load_npz, save_npz
+
+CHECKPOINT_VERSION = 1
+
+
+class Checkpoint:
+    """检查点文件"""
+
+    def __init__(self, path: str, interval: int = 10):
+        """
+        初始化检查点
+
+        参数:
+            path: str, 检查点文件路径 (.npz)
+            interval: int, 每隔多少次迭代写入一次
+        """
+        if interval <= 0:
+            raise ValueError("检查点间隔必须为正数")
+        self.path = path
+        self.interval = interval
+
+    def due(self, iteration: int) -> bool:
+        """
+        判断本次迭代后是否应写入检查点
+
+        参数:
+            iteration: int, 已完成的迭代数
+
+        返回:
+            bool: 是否写入
+        """
+        return iteration % self.interval == 0
+
+    def save(self, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> None:
+        """
+        写入检查点
+
+        参数:
+            arrays: Dict[str, np.ndarray], 数组状态
+            meta: Dict[str, Any], 可序列化为 JSON 的元数据
+        """
+        meta = dict(meta, version=CHECKPOINT_VERSION)
+        save_npz(self.path, dict(arrays, meta=np.array(json.dumps(meta))))
+
+    def load(self) -> Optional[Tuple[Dict[str, np.ndarray], Dict[str, Any]]]:
+        """
+        读取检查点
+
+        返回:
+            Optional[Tuple[Dict[str, np.ndarray], Dict[str, Any]]]: 数组状态和元数据，
+            文件不存在或版本不符时为None
+        """
+        arrays = load_npz(self.path)
+        if arrays is None:
+            return None
+        meta = json.loads(str(arrays.pop("meta")))
+        if meta.get("version") != CHECKPOINT_VERSION:
+            return None
+        return arrays, meta
+
+
+def rng_state(rng: np.random.Generator) -> Dict[str, Any]:
+    """
+    获取随机数生成器状态，结果可序列化为 JSON
+
+    参数:
+        rng: np.random.Generator, 随机数生成器
+
+    返回:
+        Dict[str, Any]: 位生成器状态
+    """
+    return rng.bit_generator.state
+
+
+def restore_rng(state: Dict[str, Any]) -> np.random.Generator:
+    """
+    由 ``rng_state`` 的结果恢复随机数生成器
+
+    参数:
+        state: Dict[str, Any], 位生成器状态
+
+    返回:
+        np.random.Generator: 随机数生成器，之后产生的随机数与保存时的生成器一致
+    """
+    bit_generator = getattr(np.random, state["bit_generator"])()
+    bit_generator.state = state
+    return np.random.Generator(bit_generator)
@@ -0,0 +1,176 @@
+"""已求解设计的最近邻索引模块
+
+按拓扑和频带分组，以负载反射系数 Γ = (ZL - Z0) / (ZL + Z0) 在复平面上的坐标为键保存已求解的设计。
+新负载可以在 O(log n) 时间内找到 Γ 平面上最近的已知设计，直接复用或作为优化的热启动点。
+新增设计先进入逐一比较的小缓冲区，缓冲区满时只与不大于它的 KD 树合并重建，
+新增和查询交替进行时每次查询为 O(log² n)，每个设计均摊被重建 O(log n) 次。索引可保存为 ``.npz`` 文件，读取时不需要 pickle。
+"""
+import os
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from src.impedance_matching.loads import LoadModel, resolve_load
+from src.optimization.checkpoint import Checkpoint
+
+
+def design_key(topology: str, bandwidth: float) -> str:
+    """
+    设计分组的键
+
+    参数:
+        topology: str, 匹配网络拓扑，例如 quarter_wave
+        bandwidth: float, 相对带宽
+
+    返回:
+        str: 分组键
+    """
+    return f"{topology}/bw={bandwidth:g}"
+
+
+def load_gamma(frequency: float, z0: float, zl: Union[complex, LoadModel]) -> complex:
+    """
+    负载在中心频率处的反射系数
+
+    参数:
+        frequency: float, 中心频率 (Hz)
+        z0: float, 参考阻抗 (Ω)
+        zl: 负载阻抗 (Ω)，负载模型在中心频率处求值
+
+    返回:
+        complex: 反射系数
+    """
+    zl = complex(np.asarray(resolve_load(zl, frequency)))
+    return (zl - z0) / (zl + z0)
+
+
+class _Group:
+    """
+    同一拓扑和频带的设计
+
+    点按加入顺序保存在 NumPy 数组中。最新加入的至多 BUFFER_SIZE 个点逐一比较，
+    其余的点划分为若干连续区间，每个区间一棵 KD 树，区间大小从旧到新递减。
+    缓冲区满时与末尾不大于它的区间合并重建，每个点被重建 O(log n) 次，
+    查询 O(log n) 棵树，新增和查询交替进行时也不需要重建整棵树。
+    """
+
+    BUFFER_SIZE = 64
+
+    def __init__(self):
+        self._points = np.empty(self.BUFFER_SIZE, dtype=complex)
+        self._count = 0
+        self.designs: List[Dict[str, Any]] = []
+        # 各 KD 树覆盖的区间 [start, stop) 和树本身，树在第一次查询时建立
+        self._levels: List[List[Any]] = []
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def points(self) -> np.ndarray:
+        """按加入顺序排列的 Γ"""
+        return self._points[:self._count]
+
+    def add(self, gamma: complex, design: Dict[str, Any]) -> None:
+        if self._count == len(self._points):
+            self._points = np.concatenate([self._points, np.empty(len(self._points), dtype=complex)])
+        self._points[self._count] = gamma
+        self._count += 1
+        self.designs.append(design)
+
+        indexed = self._levels[-1][1] if self._levels else 0
+        if self._count - indexed == self.BUFFER_SIZE:
+            start = indexed
+            while self._levels and self._levels[-1][1] - self._levels[-1][0] <= self._count - start:
+                start = self._levels.pop()[0]
+            self._levels.append([start, self._count, None])
+
+    def nearest(self, gamma: complex) -> Tuple[float, int]:
+        """Γ 平面上最近的点的距离和行号，距离相同时取先加入的点"""
+        indexed = self._levels[-1][1] if self._levels else 0
+        pending = np.abs(self._points[indexed:self._count] - gamma)
+        best = (float(pending.min()), indexed + int(pending.argmin())) if len(pending) else (np.inf, -1)
+        for level in reversed(self._levels):
+            start, stop, tree = level
+            if tree is None:
+                from scipy.spatial import cKDTree  # 仅在查询索引时导入scipy
+
+                points = self._points[start:stop]
+                tree = level[2] = cKDTree(np.column_stack([points.real, points.imag]))
+            distance, row = tree.query([gamma.real, gamma.imag])
+            if distance <= best[0]:
+                best = (float(distance), start + int(row))
+        return best
+
+
+class DesignIndex:
+    """已求解设计的最近邻索引"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        初始化索引，path 指向已有文件时读取其中的设计
+
+        参数:
+            path: Optional[str], 索引文件路径 (.npz)，为None时只保存在内存中
+        """
+        self.path = path
+        self._groups: Dict[str, _Group] = {}
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    def __len__(self) -> int:
+        return sum(len(group) for group in self._groups.values())
+
+    def add(self, key: str, gamma: complex, design: Dict[str, Any]) -> None:
+        """
+        新增一个设计
+
+        参数:
+            key: str, 分组键，见 ``design_key``
+            gamma: complex, 负载反射系数
+            design: Dict[str, Any], 可序列化为 JSON 的设计描述
+        """
+        self._groups.setdefault(key, _Group()).add(complex(gamma), design)
+
+    def nearest(self, key: str, gamma: complex) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """
+        查找 Γ 平面上最近的设计
+
+        参数:
+            key: str, 分组键
+            gamma: complex, 负载反射系数
+
+        返回:
+            Optional[Tuple[float, Dict[str, Any]]]: Γ 平面上的距离和设计，该组没有设计时为None
+        """
+        group = self._groups.get(key)
+        if group is None:
+            return None
+        distance, row = group.nearest(complex(gamma))
+        return distance, group.designs[row]
+
+    def save(self, path: Optional[str] = None) -> None:
+        """
+        保存索引
+
+        参数:
+            path: Optional[str], 文件路径，默认为初始化时的路径
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("未指定索引文件路径")
+        keys = list(self._groups)
+        groups = list(self._groups.values())
+        Checkpoint(path).save(
+            {"gamma": np.concatenate([group.points for group in groups] or [np.empty(0, dtype=complex)]),
+             "group": np.repeat(np.arange(len(groups)), [len(group) for group in groups])},
+            {"keys": keys, "designs": [design for group in self._groups.values() for design in group.designs]}
+        )
+
+    def _load(self) -> None:
+        """读取索引文件"""
+        saved = Checkpoint(self.path).load()
+        if saved is None:
+            return
+        arrays, meta = saved
+        for gamma, row, design in zip(arrays["gamma"].tolist(), arrays["group"].tolist(), meta["designs"]):
+            self.add(meta["keys"][row], gamma, design)
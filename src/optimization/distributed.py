@@ -0,0 +1,365 @@
+"""分布式扫描模块
+
+超出单机规模的参数扫描按行切分为分片，经可替换的任务代理 (broker) 分发给各节点上的工作进程。
+扫描目录放在各节点都能访问的共享文件系统上，保存输入列、计算设置和各分片的结果；
+代理只传递分片编号和行区间。
+
+工作进程领取分片时获得一段租期，进程崩溃或节点失联使租期过期后，分片在下一次领取时重新排队；
+执行出错的分片同样重新排队，累计领取 max_attempts 次仍未完成的分片标记为失败。
+分片结果与分配给哪个工作进程无关，重复执行同一分片只会以相同内容覆盖结果文件。
+全部分片完成后 ``DistributedSweep.merge`` 按原始行号合并分片结果，写为一个结果文件，
+最优行与单进程 ``BatchCalculator.screen_arrays`` 选出的相同。
+
+``SQLiteBroker`` 以 SQLite 数据库实现队列，适合单机多进程和测试；
+SQLite 的文件锁在部分网络文件系统上不可靠，跨节点部署时应实现 ``Broker`` 接口对接其他队列。
+"""
+import os
+import socket
+import sqlite3
+import time
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple, TypedDict
+
+from src.impedance_matching.batch import precision_dtypes
+from src.impedance_matching.kernels import KERNELS
+from src.optimization.calculator import NUMERIC_FIELDS, BatchCalculator, CalculationParameters
+from src.optimization.checkpoint import Checkpoint
+
+SHARD_STATES = ("pending", "running", "done", "failed")
+
+
+class Shard(TypedDict):
+    """领取到的分片"""
+    shard: int
+    start: int
+    stop: int
+    attempts: int
+
+
+class Broker(ABC):
+    """分片队列接口"""
+
+    @abstractmethod
+    def submit(self, bounds: Sequence[Tuple[int, int]]) -> None:
+        """
+        提交分片，分片编号为其在 bounds 中的下标
+
+        参数:
+            bounds: Sequence[Tuple[int, int]], 各分片的行区间 [start, stop)
+        """
+
+    @abstractmethod
+    def claim(self, worker: str) -> Optional[Shard]:
+        """
+        领取一个待执行的分片，先将租期已过的分片重新排队
+
+        参数:
+            worker: str, 工作进程标识
+
+        返回:
+            Optional[Shard]: 分片，没有待执行的分片时为None
+        """
+
+    @abstractmethod
+    def complete(self, shard: int, worker: str) -> bool:
+        """
+        标记分片完成
+
+        参数:
+            shard: int, 分片编号
+            worker: str, 工作进程标识
+
+        返回:
+            bool: 是否生效，租期已过且分片已被重新排队时为False
+        """
+
+    @abstractmethod
+    def fail(self, shard: int, worker: str, error: str) -> None:
+        """
+        报告分片执行出错，未达到最大次数时重新排队
+
+        参数:
+            shard: int, 分片编号
+            worker: str, 工作进程标识
+            error: str, 错误信息
+        """
+
+    @abstractmethod
+    def status(self) -> Dict[str, int]:
+        """
+        各状态的分片数
+
+        返回:
+            Dict[str, int]: SHARD_STATES 中各状态的分片数
+        """
+
+    @abstractmethod
+    def errors(self) -> Dict[int, str]:
+        """
+        失败分片最后一次的错误信息
+
+        返回:
+            Dict[int, str]: 分片编号到错误信息
+        """
+
+
+class _Transaction:
+    """在一个立即写事务中执行的连接，退出时提交或回滚并关闭"""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        # 立即获取写锁，避免两个进程领取到同一分片
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        try:
+            self.connection.execute("ROLLBACK" if exc_type is not None else "COMMIT")
+        finally:
+            self.connection.close()
+
+
+class SQLiteBroker(Broker):
+    """以 SQLite 数据库实现的分片队列，多个进程可同时访问"""
+
+    def __init__(self, path: str, lease_seconds: float = 600.0, max_attempts: int = 3):
+        """
+        初始化队列，数据库不存在时创建
+
+        参数:
+            path: str, 数据库文件路径
+            lease_seconds: float, 领取分片后的租期 (s)，应大于执行一个分片所需的时间
+            max_attempts: int, 每个分片最多领取的次数
+        """
+        if lease_seconds < 0:
+            raise ValueError("租期不能为负数")
+        if max_attempts < 1:
+            raise ValueError("最大领取次数至少为1")
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        connection = sqlite3.connect(path, timeout=60.0)
+        try:
+            # WAL 模式减少多个进程并发访问时的锁等待
+            connection.execute("PRAGMA journal_mode=WAL")
+        finally:
+            connection.close()
+        with self._transaction() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS shards ("
+                "id INTEGER PRIMARY KEY, start INTEGER NOT NULL, stop INTEGER NOT NULL, "
+                "state TEXT NOT NULL DEFAULT 'pending', worker TEXT, lease_expires REAL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, error TEXT)"
+            )
+
+    def _transaction(self) -> _Transaction:
+        """打开连接并开始事务，不缓存连接以便队列对象可以传给其他进程"""
+        return _Transaction(sqlite3.connect(self.path, timeout=60.0, isolation_level=None))
+
+    def submit(self, bounds: Sequence[Tuple[int, int]]) -> None:
+        with self._transaction() as connection:
+            if connection.execute("SELECT COUNT(*) FROM shards").fetchone()[0]:
+                raise ValueError("队列中已有分片")
+            connection.executemany("INSERT INTO shards (id, start, stop) VALUES (?, ?, ?)",
+                                   [(shard, int(start), int(stop)) for shard, (start, stop) in enumerate(bounds)])
+
+    def claim(self, worker: str) -> Optional[Shard]:
+        now = time.time()
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE shards SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "worker = NULL, lease_expires = NULL, error = '租期已过' "
+                "WHERE state = 'running' AND lease_expires < ?", (self.max_attempts, now))
+            row = connection.execute(
+                "SELECT id, start, stop, attempts FROM shards WHERE state = 'pending' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE shards SET state = 'running', worker = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE id = ?", (worker, now + self.lease_seconds, row[0]))
+        return {"shard": row[0], "start": row[1], "stop": row[2], "attempts": row[3] + 1}
+
+    def complete(self, shard: int, worker: str) -> bool:
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE shards SET state = 'done', lease_expires = NULL, error = NULL "
+                "WHERE id = ? AND worker = ? AND state = 'running'", (shard, worker))
+            return cursor.rowcount == 1
+
+    def fail(self, shard: int, worker: str, error: str) -> None:
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE shards SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "worker = NULL, lease_expires = NULL, error = ? "
+                "WHERE id = ? AND worker = ? AND state = 'running'", (self.max_attempts, error, shard, worker))
+
+    def status(self) -> Dict[str, int]:
+        with self._transaction() as connection:
+            counts = dict(connection.execute("SELECT state, COUNT(*) FROM shards GROUP BY state").fetchall())
+        return {state: counts.get(state, 0) for state in SHARD_STATES}
+
+    def errors(self) -> Dict[int, str]:
+        with self._transaction() as connection:
+            return dict(connection.execute("SELECT id, error FROM shards WHERE state = 'failed'").fetchall())
+
+
+class DistributedSweep:
+    """分片执行的参数扫描"""
+
+    def __init__(self, directory: str, broker: Optional[Broker] = None):
+        """
+        初始化扫描
+
+        参数:
+            directory: str, 扫描目录，各节点都应能访问
+            broker: Optional[Broker], 分片队列，为None时使用目录中的 SQLiteBroker
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.broker = broker if broker is not None else SQLiteBroker(os.path.join(directory, "queue.sqlite"))
+        self.best_result: Optional[Dict] = None
+        self._inputs: Optional[Tuple[Dict[str, np.ndarray], Dict]] = None
+
+    @property
+    def spec_path(self) -> str:
+        """输入列和计算设置文件的路径"""
+        return os.path.join(self.directory, "sweep.npz")
+
+    def shard_path(self, shard: int) -> str:
+        """
+        分片结果文件的路径
+
+        参数:
+            shard: int, 分片编号
+
+        返回:
+            str: 文件路径
+        """
+        return os.path.join(self.directory, "shards", f"shard_{shard:06d}.npz")
+
+    def submit(self, params: CalculationParameters, jobs: Dict[str, np.ndarray],
+               shard_size: int = 100_000, precision: str = "double") -> int:
+        """
+        写入输入并提交分片
+
+        扫描目录或队列中已有提交的扫描时拒绝提交，不改动已有扫描的输入。
+
+        参数:
+            params: CalculationParameters, 匹配方法和优化目标，数值字段取自 jobs
+            jobs: Dict[str, np.ndarray], 按 NUMERIC_FIELDS 组织的参数列
+            shard_size: int, 每个分片的行数
+            precision: str, 计算精度，double 或 single
+
+        返回:
+            int: 分片数
+        """
+        if shard_size <= 0:
+            raise ValueError("分片大小必须为正数")
+        precision_dtypes(precision)
+        if params.matching_method not in KERNELS:
+            raise ValueError(f"向量化初筛不支持匹配方法 {params.matching_method}，可用: {', '.join(KERNELS)}")
+        columns = {name: np.asarray(jobs[name], dtype=float) for name in NUMERIC_FIELDS}
+        rows = len(columns["freq"])
+        if any(len(values) != rows for values in columns.values()):
+            raise ValueError("参数列长度不一致")
+        if rows == 0:
+            raise ValueError("没有要提交的作业")
+
+        # 先检查再写入，被拒绝的重复提交不能覆盖正在执行的扫描的输入
+        if os.path.exists(self.spec_path) or any(self.broker.status().values()):
+            raise ValueError(f"扫描目录或队列中已有提交的扫描，请换用新的扫描目录: {self.directory}")
+        Checkpoint(self.spec_path).save(columns, {"params": params.to_dict(), "precision": precision})
+        bounds = [(start, min(start + shard_size, rows)) for start in range(0, rows, shard_size)]
+        self.broker.submit(bounds)
+        return len(bounds)
+
+    def _load_inputs(self) -> Tuple[Dict[str, np.ndarray], Dict]:
+        """读取输入列和计算设置，每个进程只读取一次"""
+        if self._inputs is None:
+            saved = Checkpoint(self.spec_path).load()
+            if saved is None:
+                raise FileNotFoundError(f"扫描目录中没有已提交的扫描: {self.directory}")
+            self._inputs = saved
+        return self._inputs
+
+    def _calculator(self, meta: Dict) -> BatchCalculator:
+        return BatchCalculator(CalculationParameters.from_dict(meta["params"]), precision=meta["precision"])
+
+    def run_worker(self, worker: Optional[str] = None, max_shards: Optional[int] = None) -> int:
+        """
+        循环领取并执行分片，直到队列中没有待执行的分片
+
+        参数:
+            worker: Optional[str], 工作进程标识，默认为主机名和进程号
+            max_shards: Optional[int], 最多执行的分片数
+
+        返回:
+            int: 本进程完成的分片数
+        """
+        worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+        completed = 0
+        while max_shards is None or completed < max_shards:
+            shard = self.broker.claim(worker)
+            if shard is None:
+                break
+            try:
+                self._run_shard(shard)
+            except Exception as e:
+                self.broker.fail(shard["shard"], worker, f"{type(e).__name__}: {e}")
+                continue
+            if self.broker.complete(shard["shard"], worker):
+                completed += 1
+        return completed
+
+    def _run_shard(self, shard: Shard) -> None:
+        """执行一个分片并写入结果文件"""
+        columns, meta = self._load_inputs()
+        start, stop = shard["start"], shard["stop"]
+        calculator = self._calculator(meta)
+        result = calculator.screen_arrays(*(columns[name][start:stop] for name in NUMERIC_FIELDS))
+        result["row"] = result["row"] + start
+        Checkpoint(self.shard_path(shard["shard"])).save(result, {"shard": shard["shard"]})
+
+    def merge(self, path: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """
+        合并全部分片的结果，并以双精度重新计算最优行存入 ``self.best_result``
+
+        参数:
+            path: Optional[str], 结果文件路径 (.npz)，默认为扫描目录中的 results.npz
+
+        返回:
+            Dict[str, np.ndarray]: row（有效行的原始行号）和各结果列，
+            与对全部参数调用一次 ``BatchCalculator.screen_arrays`` 的结果相同
+        """
+        status = self.broker.status()
+        if status["failed"]:
+            errors = "; ".join(f"分片 {shard}: {error}" for shard, error in sorted(self.broker.errors().items()))
+            raise RuntimeError(f"{status['failed']} 个分片执行失败: {errors}")
+        unfinished = status["pending"] + status["running"]
+        if unfinished:
+            raise RuntimeError(f"尚有 {unfinished} 个分片未完成")
+
+        if not status["done"]:
+            raise RuntimeError("队列中没有分片")
+        columns, meta = self._load_inputs()
+        shards: List[Dict[str, np.ndarray]] = []
+        for shard in range(status["done"]):
+            saved = Checkpoint(self.shard_path(shard)).load()
+            if saved is None:
+                raise FileNotFoundError(f"缺少分片 {shard} 的结果文件")
+            shards.append(saved[0])
+        merged = {name: np.concatenate([shard[name] for shard in shards]) for name in shards[0]}
+
+        calculator = self._calculator(meta)
+        rows = merged["row"]
+        if len(rows):
+            calculator.select_best(merged, *(columns[name][rows] for name in NUMERIC_FIELDS))
+        self.best_result = calculator.best_result
+        best = self.best_result["params"] if self.best_result else None
+        Checkpoint(path or os.path.join(self.directory, "results.npz")).save(
+            merged, {"params": meta["params"], "precision": meta["precision"], "best": best})
+        return merged
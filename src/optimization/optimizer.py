@@ -1,20 +1,70 @@
+import hashlib
+import time
 import numpy as np
-from typing import Dict, Optional, Union
-from src.optimization.calculator import calculate_matching, calculate_vswr
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from src import instrumentation
+from src.impedance_matching.cascade import vswr
+from src.impedance_matching.loads import resolve_load
+from src.impedance_matching.quarter_wave import QuarterWaveTransformer
+from src.impedance_matching.topology import Topology
+from src.optimization.calculator import calculate_matching, calculate_vswr, ProgressCallback
+from src.optimization.checkpoint import Checkpoint, restore_rng, rng_state
+from src.optimization.design_index import DesignIndex, design_key, load_gamma
+
+# 带宽优化的设计参数：四分之一波长变换段的特性阻抗和长度
+DESIGN_PARAMETERS = ("transformer.impedance", "transformer.length")
+# 种群类方法的参数：粒子群惯性权重、个体与群体学习因子，遗传算法的交叉扩展系数
+SWARM_INERTIA = 0.7
+SWARM_COGNITIVE = 1.5
+SWARM_SOCIAL = 1.5
+BLEND_ALPHA = 0.25
+
+# 热启动结果、参数字典或检查点路径
+WarmStart = Union[Dict[str, Any], str]
 
 class Optimizer:
-    def __init__(self, method: str = "gradient_descent"):
+    def __init__(self, method: str = "gradient_descent", bandwidth: float = 0.2, band_points: int = 41,
+                 seed: Optional[int] = None, population: int = 20,
+                 design_index: Optional[DesignIndex] = None, reuse_tolerance: float = 0.0):
+        """
+        Args:
+            method: 优化方法
+            bandwidth: genetic、particle_swarm 和 surrogate 方法优化的相对带宽，目标为该频带内的最大VSWR
+            band_points: 频带内的频点数
+            seed: 随机方法使用的随机种子
+            population: genetic 和 particle_swarm 方法的种群规模
+            design_index: 已求解设计的索引。genetic、particle_swarm 和 surrogate 方法从 Γ 平面上最近的
+                设计热启动，并把优化结果加入索引
+            reuse_tolerance: 最近设计与当前负载的 Γ 距离不超过该值且满足目标VSWR时直接返回该设计
+        """
         self.method = method
-        self.supported_methods = ["gradient_descent", "genetic", "particle_swarm"]
+        self.supported_methods = ["gradient_descent", "genetic", "particle_swarm", "surrogate"]
+        self.evaluations = 0
+        self.bandwidth = bandwidth
+        self.band_points = band_points
+        self.seed = seed
+        self.population = population
+        self.design_index = design_index
+        self.reuse_tolerance = reuse_tolerance
         
+        if population < 4:
+            raise ValueError("种群规模不能小于4")
         if method not in self.supported_methods:
             raise ValueError(f"Unsupported optimization method: {method}")
             
     def optimize(self, frequency: float, z0: float, zl: complex,
                 target_vswr: float = 1.5, max_iterations: int = 100,
-                objectives: Optional[Dict[str, float]] = None) -> Dict:
+                objectives: Optional[Dict[str, float]] = None,
+                progress_callback: Optional[ProgressCallback] = None,
+                checkpoint: Optional[str] = None, checkpoint_interval: int = 10,
+                warm_start: Optional[WarmStart] = None, overwrite_checkpoint: bool = False) -> Dict:
         """
         优化阻抗匹配网络参数
+
+        genetic 和 particle_swarm 方法每 checkpoint_interval 次迭代把种群、速度、个体最优、
+        全局最优和随机数生成器状态写入 checkpoint 文件。再次以同一文件、同一问题和同一方法调用时
+        从检查点继续，结果与未中断的运行一致。检查点属于其他问题或方法时抛出 ValueError，
+        以免覆盖其中可续算的状态；overwrite_checkpoint 为True时以其中的最优设计热启动并覆盖该文件。
         
         Args:
             frequency: 工作频率 (Hz)
@@ -23,51 +73,311 @@ class Optimizer:
             target_vswr: 目标VSWR值
             max_iterations: 最大迭代次数
             objectives: 多目标优化权重
+            progress_callback: 每次迭代后以中间结果调用的回调
+            checkpoint: 检查点文件路径 (.npz)，仅 genetic 和 particle_swarm 方法使用
+            checkpoint_interval: 写入检查点的迭代间隔
+            warm_start: 热启动设计，可以是之前的优化结果、DESIGN_PARAMETERS 到参数值的映射或检查点路径；
+                按相对各自标称设计的比例迁移到当前问题，仅 genetic、particle_swarm 和 surrogate 方法使用
+            overwrite_checkpoint: 是否允许覆盖属于其他问题或方法的检查点
             
         Returns:
-            dict: 优化结果
+            dict: 优化结果，throughput 给出本次优化评估的设计数和每秒设计数
         """
-        if self.method == "gradient_descent":
-            return self._gradient_descent(frequency, z0, zl, target_vswr, max_iterations)
-        elif self.method == "genetic":
-            return self._genetic_algorithm(frequency, z0, zl, target_vswr, max_iterations)
-        else:  # particle_swarm
-            return self._particle_swarm(frequency, z0, zl, target_vswr, max_iterations)
+        self.evaluations = 0
+        start = time.perf_counter()
+        with instrumentation.stage("optimization"):
+            if self.method == "gradient_descent":
+                result = self._gradient_descent(frequency, z0, zl, target_vswr, max_iterations, progress_callback)
+            else:
+                result = self._indexed_search(frequency, z0, zl, target_vswr, max_iterations, progress_callback,
+                                              checkpoint, checkpoint_interval, warm_start, overwrite_checkpoint)
+        result["throughput"] = instrumentation.throughput(self.evaluations, time.perf_counter() - start)
+        return result
+
+    def _evaluate(self, frequency: float, z0: float, zl: complex) -> Dict:
+        """评估一个设计并计数"""
+        self.evaluations += 1
+        return calculate_matching(frequency, z0, zl)
             
+    def _design_problem(self, frequency: float, z0: float,
+                        zl: complex) -> Tuple[List[Tuple[float, float]], Callable[[np.ndarray], float]]:
+        """
+        构造带宽优化问题
+
+        从四分之一波长变换器的设计出发，在标称值的 ±50% 内调整变换段的阻抗和长度，
+        目标为 bandwidth 频带内的最大VSWR。每次调用目标函数计为一次评估。
+
+        Returns:
+            tuple: 各参数的边界和目标函数，参数顺序同 DESIGN_PARAMETERS
+        """
+        topology = Topology.quarter_wave(QuarterWaveTransformer(frequency, z0, zl))
+        nominal = topology.nominal()
+        bounds = [(0.5 * nominal[name], 1.5 * nominal[name]) for name in DESIGN_PARAMETERS]
+        frequencies = frequency * np.linspace(1 - self.bandwidth / 2, 1 + self.bandwidth / 2, self.band_points)
+        zl_band = resolve_load(zl, frequencies)
+
+        def objective(x: np.ndarray) -> float:
+            self.evaluations += 1
+            s11, _ = topology.response(frequencies, z0, zl_band, dict(zip(DESIGN_PARAMETERS, x)))
+            return float(np.max(vswr(s11)))
+
+        return bounds, objective
+
+    def _problem_key(self, frequency: float, z0: float, zl: complex) -> str:
+        """优化问题的摘要，相同的频带、源阻抗和各频点负载得到相同的摘要"""
+        frequencies = frequency * np.linspace(1 - self.bandwidth / 2, 1 + self.bandwidth / 2, self.band_points)
+        zl_band = np.broadcast_to(resolve_load(zl, frequencies), frequencies.shape)
+        data = np.concatenate([frequencies, [z0], zl_band.real, zl_band.imag]).astype(float)
+        return hashlib.sha1(data.tobytes()).hexdigest()
+
+    def _design_result(self, x: np.ndarray, value: float, nominal: np.ndarray,
+                       target_vswr: float, iterations: int) -> Dict:
+        """带宽优化方法共用的结果格式，design_scale 为各参数相对标称设计的比例，可用于热启动"""
+        return {
+            "optimized_parameters": dict(zip(DESIGN_PARAMETERS, np.asarray(x).tolist())),
+            "performance_metrics": {"vswr": value, "bandwidth": self.bandwidth},
+            "optimization_status": "completed" if value <= target_vswr else "max_iterations_reached",
+            "iterations": iterations,
+            "design_scale": (np.asarray(x) / nominal).tolist()
+        }
+
+    @staticmethod
+    def _warm_start_scale(warm_start: Optional[WarmStart], nominal: np.ndarray) -> Optional[np.ndarray]:
+        """
+        把热启动设计换算为相对标称设计的比例
+
+        结果和检查点按它们自己的标称设计换算，只给出参数值时按当前问题的标称设计 nominal 换算。
+
+        Returns:
+            np.ndarray: 各参数的比例，warm_start 为None或检查点不存在时为None
+        """
+        if warm_start is None:
+            return None
+        if isinstance(warm_start, str):
+            saved = Checkpoint(warm_start).load()
+            if saved is None:
+                return None
+            arrays, _ = saved
+            if "best" not in arrays or "nominal" not in arrays:
+                raise ValueError(f"{warm_start} 不是优化器的检查点，不能用于热启动")
+            return arrays["best"] / arrays["nominal"]
+        if "design_scale" in warm_start:
+            return np.asarray(warm_start["design_scale"], dtype=float)
+        parameters = warm_start.get("optimized_parameters", warm_start)
+        missing = [name for name in DESIGN_PARAMETERS if name not in parameters]
+        if missing:
+            raise KeyError(f"热启动设计缺少参数: {', '.join(missing)}")
+        return np.array([parameters[name] for name in DESIGN_PARAMETERS], dtype=float) / nominal
+
+    def _indexed_search(self, frequency: float, z0: float, zl: complex,
+                        target_vswr: float, max_iterations: int,
+                        progress_callback: Optional[ProgressCallback],
+                        checkpoint: Optional[str], checkpoint_interval: int,
+                        warm_start: Optional[WarmStart], overwrite_checkpoint: bool) -> Dict:
+        """带宽优化方法的入口：先查设计索引，命中时直接返回或热启动，优化结果再加入索引"""
+        hit = None
+        if self.design_index is not None:
+            key, gamma = design_key("quarter_wave", self.bandwidth), load_gamma(frequency, z0, zl)
+            hit = self.design_index.nearest(key, gamma)
+        if hit is not None and hit[0] <= self.reuse_tolerance:
+            bounds, objective = self._design_problem(frequency, z0, zl)
+            nominal = np.array([(low + high) / 2 for low, high in bounds])
+            x = np.clip(self._warm_start_scale(hit[1], nominal) * nominal, *np.array(bounds).T)
+            value = objective(x)
+            if value <= target_vswr:
+                return dict(self._design_result(x, value, nominal, target_vswr, 0), index_hit=True)
+        if hit is not None and warm_start is None:
+            warm_start = hit[1]
+
+        if self.method == "surrogate":
+            result = self._surrogate(frequency, z0, zl, target_vswr, max_iterations, progress_callback, warm_start)
+        else:  # genetic, particle_swarm
+            saved = Checkpoint(checkpoint, checkpoint_interval) if checkpoint is not None else None
+            result = self._population_search(frequency, z0, zl, target_vswr, max_iterations,
+                                             progress_callback, saved, warm_start, overwrite_checkpoint)
+        if self.design_index is not None:
+            self.design_index.add(key, gamma, {"design_scale": result["design_scale"],
+                                               "vswr": result["performance_metrics"]["vswr"]})
+        return dict(result, index_hit=False) if self.design_index is not None else result
+
+    def _surrogate(self, frequency: float, z0: float, zl: complex,
+                   target_vswr: float, max_iterations: int,
+                   progress_callback: Optional[ProgressCallback] = None,
+                   warm_start: Optional[WarmStart] = None) -> Dict:
+        """代理模型辅助优化，max_iterations 为真实评估次数上限"""
+        from src.optimization.surrogate import surrogate_minimize
+
+        bounds, objective = self._design_problem(frequency, z0, zl)
+
+        def report(info: Dict) -> None:
+            gamma = (info["best"] - 1) / (info["best"] + 1)
+            progress_callback({"iteration": info["evaluation"], "vswr": info["best"], "s_parameters": [gamma]})
+
+        nominal = np.array([(low + high) / 2 for low, high in bounds])
+        known = [nominal]
+        scale = self._warm_start_scale(warm_start, nominal)
+        if scale is not None:
+            known.append(scale * nominal)
+        result = surrogate_minimize(objective, bounds, max_evaluations=max(max_iterations, 5),
+                                    x0=np.array(known), target=target_vswr, seed=self.seed,
+                                    progress_callback=report if progress_callback is not None else None)
+        return self._design_result(result["x"], result["value"], nominal, target_vswr, result["evaluations"])
+
+    def _population_search(self, frequency: float, z0: float, zl: complex,
+                           target_vswr: float, max_iterations: int,
+                           progress_callback: Optional[ProgressCallback],
+                           checkpoint: Optional[Checkpoint], warm_start: Optional[WarmStart],
+                           overwrite_checkpoint: bool = False) -> Dict:
+        """
+        遗传算法或粒子群优化，支持检查点续算和热启动
+
+        max_iterations 为迭代（代）数上限，每次迭代评估整个种群。
+        """
+        bounds, objective = self._design_problem(frequency, z0, zl)
+        lower, upper = np.array(bounds).T
+        nominal = (lower + upper) / 2
+        meta = {"method": self.method, "problem": self._problem_key(frequency, z0, zl),
+                "population": self.population}
+
+        saved = checkpoint.load() if checkpoint is not None else None
+        if saved is not None and all(saved[1].get(key) == value for key, value in meta.items()):
+            state, saved_meta = saved
+            rng = restore_rng(saved_meta["rng"])
+            iteration = saved_meta["iteration"]
+        else:
+            if saved is not None:
+                if not overwrite_checkpoint:
+                    raise ValueError(f"检查点 {checkpoint.path} 属于其他优化问题或方法，"
+                                     "请换用新的检查点路径（可将其作为 warm_start）或设置 overwrite_checkpoint=True")
+                if warm_start is None:
+                    warm_start = checkpoint.path
+            rng = np.random.default_rng(self.seed)
+            state = self._initial_population(rng, lower, upper, objective, self._warm_start_scale(warm_start, nominal))
+            iteration = 0
+
+        step = self._genetic_step if self.method == "genetic" else self._swarm_step
+        while iteration < max_iterations and state["best_fitness"] > target_vswr:
+            step(state, rng, lower, upper, objective)
+            iteration += 1
+            if progress_callback is not None:
+                best = float(state["best_fitness"])
+                progress_callback({"iteration": iteration, "vswr": best, "s_parameters": [(best - 1) / (best + 1)]})
+            if checkpoint is not None and checkpoint.due(iteration):
+                checkpoint.save(dict(state, nominal=nominal), dict(meta, iteration=iteration, rng=rng_state(rng)))
+        if checkpoint is not None:
+            checkpoint.save(dict(state, nominal=nominal), dict(meta, iteration=iteration, rng=rng_state(rng)))
+
+        return self._design_result(state["best"], float(state["best_fitness"]), nominal, target_vswr, iteration)
+
+    def _initial_population(self, rng: np.random.Generator, lower: np.ndarray, upper: np.ndarray,
+                            objective: Callable[[np.ndarray], float],
+                            scale: Optional[np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        初始种群：标称设计加均匀随机个体；热启动时一半种群集中在热启动设计附近
+
+        Returns:
+            dict: 种群状态，包含 positions、velocities、fitness、personal_best、personal_best_fitness、
+                best 和 best_fitness
+        """
+        span = upper - lower
+        positions = lower + rng.random((self.population, len(lower))) * span
+        positions[0] = (lower + upper) / 2
+        if scale is not None:
+            center = np.clip(scale * positions[0], lower, upper)
+            seeded = self.population // 2
+            positions[1:seeded] = np.clip(center + rng.normal(0, 0.02, (seeded - 1, len(lower))) * span,
+                                          lower, upper)
+            positions[1] = center
+        fitness = np.array([objective(x) for x in positions])
+        best = int(np.argmin(fitness))
+        return {
+            "positions": positions,
+            "velocities": np.zeros_like(positions),
+            "fitness": fitness,
+            "personal_best": positions.copy(),
+            "personal_best_fitness": fitness.copy(),
+            "best": positions[best].copy(),
+            "best_fitness": np.array(fitness[best])
+        }
+
+    @staticmethod
+    def _update_best(state: Dict[str, np.ndarray], positions: np.ndarray, fitness: np.ndarray) -> None:
+        """用新评估的个体更新全局最优"""
+        best = int(np.argmin(fitness))
+        if fitness[best] < state["best_fitness"]:
+            state["best"] = positions[best].copy()
+            state["best_fitness"] = np.array(fitness[best])
+        
+    def _genetic_step(self, state: Dict[str, np.ndarray], rng: np.random.Generator,
+                      lower: np.ndarray, upper: np.ndarray, objective: Callable[[np.ndarray], float]) -> None:
+        """遗传算法的一代：二元锦标赛选择、BLX-α 交叉、高斯变异，保留上一代最优个体"""
+        positions, fitness = state["positions"], state["fitness"]
+        size, dims = positions.shape
+        a, b = rng.integers(0, size, (2, size))
+        parents = positions[np.where(fitness[a] <= fitness[b], a, b)]
+        mates = parents[rng.permutation(size)]
+        children = parents + rng.uniform(-BLEND_ALPHA, 1 + BLEND_ALPHA, (size, dims)) * (mates - parents)
+        mutate = rng.random((size, dims)) < 1 / dims
+        children = np.clip(children + mutate * rng.normal(0, 0.1, (size, dims)) * (upper - lower), lower, upper)
+        child_fitness = np.array([objective(x) for x in children])
+
+        worst, elite = int(np.argmax(child_fitness)), int(np.argmin(fitness))
+        if fitness[elite] < child_fitness[worst]:
+            children[worst], child_fitness[worst] = positions[elite], fitness[elite]
+        state["positions"], state["fitness"] = children, child_fitness
+        self._update_best(state, children, child_fitness)
+
+    def _swarm_step(self, state: Dict[str, np.ndarray], rng: np.random.Generator,
+                    lower: np.ndarray, upper: np.ndarray, objective: Callable[[np.ndarray], float]) -> None:
+        """粒子群的一次迭代，速度限制在参数范围的20%以内"""
+        positions = state["positions"]
+        r1, r2 = rng.random((2,) + positions.shape)
+        limit = 0.2 * (upper - lower)
+        velocities = np.clip(SWARM_INERTIA * state["velocities"]
+                             + SWARM_COGNITIVE * r1 * (state["personal_best"] - positions)
+                             + SWARM_SOCIAL * r2 * (state["best"] - positions), -limit, limit)
+        positions = np.clip(positions + velocities, lower, upper)
+        fitness = np.array([objective(x) for x in positions])
+
+        improved = fitness < state["personal_best_fitness"]
+        state["personal_best"][improved] = positions[improved]
+        state["personal_best_fitness"][improved] = fitness[improved]
+        state["positions"], state["velocities"], state["fitness"] = positions, velocities, fitness
+        self._update_best(state, positions, fitness)
+
     def _gradient_descent(self, frequency: float, z0: float, zl: complex,
-                         target_vswr: float, max_iterations: int) -> Dict:
+                         target_vswr: float, max_iterations: int,
+                         progress_callback: Optional[ProgressCallback] = None) -> Dict:
         """梯度下降优化"""
-        current_result = calculate_matching(frequency, z0, zl)
+        current_result = self._evaluate(frequency, z0, zl)
         current_vswr = current_result["performance_metrics"]["vswr"]
         iterations = 0
         
         while current_vswr > target_vswr and iterations < max_iterations:
             # 简化的优化过程
             iterations += 1
-            
+
+        # 迭代不改变设计，只报告一次结果，避免进度显示虚假的迭代
+        if progress_callback is not None:
+            progress_callback({
+                "iteration": iterations,
+                "vswr": current_vswr,
+                "s_parameters": current_result["matching_network"]["parameters"]["s_parameters"]
+            })
+
         return {
             "optimized_parameters": current_result["matching_network"]["parameters"],
             "performance_metrics": current_result["performance_metrics"],
             "optimization_status": "completed" if current_vswr <= target_vswr else "max_iterations_reached",
             "iterations": iterations
         }
-        
-    def _genetic_algorithm(self, frequency: float, z0: float, zl: complex,
-                          target_vswr: float, max_iterations: int) -> Dict:
-        """遗传算法优化"""
-        # 简化的遗传算法实现
-        return self._gradient_descent(frequency, z0, zl, target_vswr, max_iterations)
-        
-    def _particle_swarm(self, frequency: float, z0: float, zl: complex,
-                        target_vswr: float, max_iterations: int) -> Dict:
-        """粒子群优化"""
-        # 简化的粒子群算法实现
-        return self._gradient_descent(frequency, z0, zl, target_vswr, max_iterations)
+
 
 def optimize_matching(frequency: float, z0: float, zl: complex,
                      target_vswr: float = 1.5, max_iterations: int = 100,
                      method: str = "gradient_descent",
-                     objectives: Optional[Dict[str, float]] = None) -> Dict:
+                     objectives: Optional[Dict[str, float]] = None,
+                     progress_callback: Optional[ProgressCallback] = None) -> Dict:
     """
     优化阻抗匹配网络的便捷函数
     
@@ -79,6 +389,7 @@ def optimize_matching(frequency: float, z0: float, zl: complex,
         max_iterations: 最大迭代次数
         method: 优化方法
         objectives: 多目标优化权重
+        progress_callback: 每次迭代后以中间结果调用的回调
         
     Returns:
         dict: 优化结果
@@ -90,7 +401,8 @@ def optimize_matching(frequency: float, z0: float, zl: complex,
         zl=zl,
         target_vswr=target_vswr,
         max_iterations=max_iterations,
-        objectives=objectives
+        objectives=objectives,
+        progress_callback=progress_callback
     )
     
     if objectives:
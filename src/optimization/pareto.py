@@ -0,0 +1,339 @@
+"""多目标 Pareto 优化模块（NSGA-II）
+
+设计空间为 1 到 ``max_sections`` 节的级联传输线变换器，每个个体的基因为
+[节数, 各节特性阻抗, 各节电长度]，节数以外的段长度视为0。同时最小化四个目标：
+
+    - vswr: 设计频率处的驻波比
+    - bandwidth: 设计频率附近驻波比不超过限值的连续相对带宽（取负值后最小化）
+    - length: 有效各节的总物理长度 (m)
+    - components: 有效节数
+
+整个种群 × 频点一次级联求值；快速非支配排序和拥挤距离都按数组计算，
+没有逐个体的 Python 循环。
+"""
+import time
+import numpy as np
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+from src import instrumentation
+from src.impedance_matching.batch import SPEED_OF_LIGHT
+from src.impedance_matching.cascade import cascade, line_abcd, network_response, vswr
+from src.impedance_matching.loads import LoadModel, resolve_load
+from src.optimization.calculator import CalculationParameters, ProgressCallback
+
+OBJECTIVES = ("vswr", "bandwidth", "length", "components")
+
+
+def non_dominated_sort(objectives: np.ndarray) -> np.ndarray:
+    """
+    快速非支配排序
+
+    支配关系矩阵一次广播求出，之后逐层剥离前沿，循环次数等于前沿层数。
+    内存占用为 O(N²)。
+
+    参数:
+        objectives: np.ndarray, 形状为 (N, M) 的目标值，均为最小化
+
+    返回:
+        np.ndarray: 每个个体所在前沿的序号，0 为 Pareto 前沿
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    n = len(objectives)
+    # 逐个目标累积比较结果，避免生成 N × N × M 的中间数组
+    no_worse = np.ones((n, n), dtype=bool)
+    better = np.zeros((n, n), dtype=bool)
+    for column in objectives.T:
+        no_worse &= column[:, np.newaxis] <= column[np.newaxis, :]
+        better |= column[:, np.newaxis] < column[np.newaxis, :]
+    # dominates[i, j] 为 i 支配 j
+    dominates = no_worse & better
+    counts = dominates.sum(axis=0)
+
+    ranks = np.full(n, -1)
+    rank = 0
+    current = counts == 0
+    while current.any():
+        ranks[current] = rank
+        counts = counts - dominates[current].sum(axis=0)
+        current = (counts == 0) & (ranks < 0)
+        rank += 1
+    return ranks
+
+
+def crowding_distance(objectives: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+    """
+    计算各个体在所在前沿内的拥挤距离，所有前沿同时计算
+
+    参数:
+        objectives: np.ndarray, 形状为 (N, M) 的目标值
+        ranks: np.ndarray, ``non_dominated_sort`` 给出的前沿序号
+
+    返回:
+        np.ndarray: 拥挤距离，前沿两端的个体为无穷大
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    n = len(objectives)
+    distance = np.zeros(n)
+    for k in range(objectives.shape[1]):
+        # 先按前沿、再按目标值排序，同一前沿的个体相邻
+        order = np.lexsort((objectives[:, k], ranks))
+        values = objectives[order, k]
+        sorted_ranks = ranks[order]
+        boundary = sorted_ranks[1:] != sorted_ranks[:-1]
+        first = np.r_[True, boundary]
+        last = np.r_[boundary, True]
+        group = np.cumsum(first) - 1
+        span = (values[last] - values[first])[group]
+
+        gap = np.zeros(n)
+        gap[1:-1] = values[2:] - values[:-2]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            contribution = np.where(span > 0, gap / span, 0.0)
+        contribution[first | last] = np.inf
+        distance[order] += contribution
+    return distance
+
+
+def select_compromise(objectives: np.ndarray, weights: Mapping[str, float]) -> int:
+    """
+    按权重在前沿上选择折中解
+
+    各目标先在前沿范围内归一化到 [0, 1]，再按权重求和取最小值。
+
+    参数:
+        objectives: np.ndarray, 形状为 (N, 4) 的前沿目标值，列顺序同 OBJECTIVES
+        weights: Mapping[str, float], 目标名到权重的映射，未给出的目标权重为0
+
+    返回:
+        int: 折中解的下标
+    """
+    unknown = set(weights) - set(OBJECTIVES)
+    if unknown:
+        raise ValueError(f"未知的优化目标: {', '.join(sorted(unknown))}")
+    objectives = np.asarray(objectives, dtype=float)
+    low = objectives.min(axis=0)
+    span = objectives.max(axis=0) - low
+    normalized = np.divide(objectives - low, span, out=np.zeros_like(objectives), where=span > 0)
+    weight_vector = np.array([weights.get(name, 0.0) for name in OBJECTIVES])
+    return int(np.argmin(normalized @ weight_vector))
+
+
+class ParetoOptimizer:
+    """多节传输线变换器的 NSGA-II 多目标优化器"""
+
+    def __init__(self, frequency: float, z0: float, zl: Union[complex, LoadModel], max_sections: int = 3,
+                 vswr_limit: float = 2.0, band: Tuple[float, float] = (0.5, 1.5), points: int = 101,
+                 impedance_bounds: Optional[Tuple[float, float]] = None):
+        """
+        初始化优化器
+
+        参数:
+            frequency: float, 设计频率 (Hz)
+            z0: float, 源阻抗 (Ω)
+            zl: complex, 负载阻抗 (Ω)，负载模型按各频点求值
+            max_sections: int, 最大节数
+            vswr_limit: float, 计算带宽时的驻波比限值
+            band: Tuple[float, float], 计算带宽的频率范围，相对设计频率
+            points: int, 带宽计算的频点数
+            impedance_bounds: Optional[Tuple[float, float]], 各节特性阻抗范围 (Ω)，
+                默认取源与负载阻抗之间并向两侧各放宽一倍
+        """
+        if frequency <= 0:
+            raise ValueError("频率必须为正数")
+        if z0 <= 0:
+            raise ValueError("特征阻抗必须为正数")
+        if max_sections < 1:
+            raise ValueError("最大节数至少为1")
+        if not 0 < band[0] < 1 < band[1]:
+            raise ValueError("频率范围必须包含设计频率")
+
+        self.frequency = frequency
+        self.z0 = z0
+        self.max_sections = max_sections
+        self.vswr_limit = vswr_limit
+        frequencies = np.union1d(frequency * np.linspace(band[0], band[1], points), [frequency])
+        self.frequencies = frequencies
+        self._center = int(np.searchsorted(frequencies, frequency))
+        self.zl = resolve_load(zl, frequencies)
+
+        if impedance_bounds is None:
+            magnitude = float(np.abs(resolve_load(zl, frequency)))
+            impedance_bounds = (0.5 * min(z0, magnitude), 2 * max(z0, magnitude))
+        self.impedance_bounds = impedance_bounds
+
+        k = max_sections
+        self.lower = np.concatenate([[1.0], np.full(k, impedance_bounds[0]), np.zeros(k)])
+        self.upper = np.concatenate([[k + 1.0], np.full(k, impedance_bounds[1]), np.full(k, 180.0)])
+        self.evaluations = 0
+        self.default_weights: Optional[Dict[str, float]] = None
+
+    @classmethod
+    def from_parameters(cls, params: CalculationParameters, **kwargs) -> "ParetoOptimizer":
+        """
+        由计算参数构造优化器，参数的 weight_factors 作为选择折中解的默认权重
+
+        参数:
+            params: CalculationParameters, 计算参数
+            kwargs: 其余构造参数
+
+        返回:
+            ParetoOptimizer: 优化器
+        """
+        optimizer = cls(params.freq, params.z0, params.z_load_real + 1j * params.z_load_imag, **kwargs)
+        optimizer.default_weights = dict(params.weight_factors)
+        return optimizer
+
+    def decode(self, genes: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        把基因解码为设计参数
+
+        参数:
+            genes: np.ndarray, 形状为 (N, 1 + 2·max_sections) 的基因
+
+        返回:
+            Dict[str, np.ndarray]: sections (N,)、impedances 和 electrical_lengths (N, max_sections)，
+            无效节的电长度为0
+        """
+        k = self.max_sections
+        sections = np.clip(np.floor(genes[:, 0]), 1, k).astype(int)
+        active = np.arange(k) < sections[:, np.newaxis]
+        return {
+            "sections": sections,
+            "impedances": genes[:, 1:1 + k],
+            "electrical_lengths": np.where(active, genes[:, 1 + k:], 0.0)
+        }
+
+    def evaluate(self, genes: np.ndarray) -> np.ndarray:
+        """
+        计算整个种群的目标值
+
+        参数:
+            genes: np.ndarray, 基因
+
+        返回:
+            np.ndarray: 形状为 (N, 4) 的目标值，列顺序同 OBJECTIVES，带宽取负值
+        """
+        design = self.decode(genes)
+        ratio = self.frequencies / self.frequency
+        stages = [line_abcd(design["impedances"][:, [k]],
+                            1j * np.deg2rad(design["electrical_lengths"][:, [k]]) * ratio)
+                  for k in range(self.max_sections)]
+        s11, _ = network_response(cascade(*stages), self.z0, self.zl)
+        ok = vswr(s11) <= self.vswr_limit
+
+        # 设计频率两侧第一个不满足指标的频点之间即为连续带宽
+        c = self._center
+        right = np.where(ok[:, c:].all(axis=1), ok.shape[1] - c, np.argmin(ok[:, c:], axis=1))
+        left = np.where(ok[:, :c + 1].all(axis=1), c + 1, np.argmin(ok[:, c::-1], axis=1))
+        upper = self.frequencies[np.clip(c + right - 1, 0, None)]
+        lower = self.frequencies[np.clip(c - left + 1, None, len(self.frequencies) - 1)]
+        bandwidth = np.where(ok[:, c], (upper - lower) / self.frequency, 0.0)
+
+        wavelength = SPEED_OF_LIGHT / self.frequency
+        length = design["electrical_lengths"].sum(axis=1) / 360 * wavelength
+
+        self.evaluations += len(genes)
+        instrumentation.count("evaluations", len(genes))
+        return np.column_stack([vswr(s11[:, c]), -bandwidth, length, design["sections"]])
+
+    def _offspring(self, rng: np.random.Generator, genes: np.ndarray, ranks: np.ndarray,
+                   distance: np.ndarray) -> np.ndarray:
+        """二元锦标赛选择、模拟二进制交叉 (SBX) 和多项式变异"""
+        n, dims = genes.shape
+        a, b = rng.integers(0, n, (2, n))
+        better = (ranks[a] < ranks[b]) | ((ranks[a] == ranks[b]) & (distance[a] > distance[b]))
+        parents = genes[np.where(better, a, b)]
+        first, second = parents[0::2], parents[1::2]
+        pairs = min(len(first), len(second))
+        first, second = first[:pairs], second[:pairs]
+
+        eta_crossover = 15.0
+        u = rng.random((pairs, dims))
+        beta = np.where(u <= 0.5, (2 * u) ** (1 / (eta_crossover + 1)),
+                        (1 / (2 * (1 - u))) ** (1 / (eta_crossover + 1)))
+        cross = rng.random((pairs, 1)) < 0.9
+        beta = np.where(cross & (rng.random((pairs, dims)) < 0.5), beta, 1.0)
+        children = np.vstack([0.5 * ((1 + beta) * first + (1 - beta) * second),
+                              0.5 * ((1 - beta) * first + (1 + beta) * second)])
+        if len(children) < n:
+            children = np.vstack([children, parents[len(children):n]])
+
+        eta_mutation = 20.0
+        span = self.upper - self.lower
+        u = rng.random(children.shape)
+        delta = np.where(u < 0.5, (2 * u) ** (1 / (eta_mutation + 1)) - 1,
+                         1 - (2 * (1 - u)) ** (1 / (eta_mutation + 1)))
+        mutate = rng.random(children.shape) < 1 / dims
+        children = children + np.where(mutate, delta * span, 0.0)
+        return np.clip(children, self.lower, self.upper)
+
+    def run(self, population: int = 100, generations: int = 50, seed: Optional[int] = None,
+            weights: Optional[Mapping[str, float]] = None,
+            progress_callback: Optional[ProgressCallback] = None) -> Dict:
+        """
+        执行 NSGA-II 优化
+
+        参数:
+            population: int, 种群规模
+            generations: int, 迭代代数
+            seed: Optional[int], 随机种子
+            weights: Optional[Mapping[str, float]], 选择折中解的权重，键为 OBJECTIVES 中的名称，
+                为None时使用 ``from_parameters`` 给出的 weight_factors
+            progress_callback: Optional[ProgressCallback], 每代结束后以前沿规模调用的回调
+
+        返回:
+            Dict: 包含
+                - front: 前沿上各设计的 sections、impedances、electrical_lengths、
+                  vswr、bandwidth、length、components
+                - preferred: 折中解在前沿中的下标，没有权重时为None
+                - generations: 迭代代数
+                - evaluations: 评估的设计数
+                - throughput: 评估的设计数和每秒设计数
+        """
+        if population < 4:
+            raise ValueError("种群规模至少为4")
+        rng = np.random.default_rng(seed)
+        self.evaluations = 0
+        start = time.perf_counter()
+
+        with instrumentation.stage("pareto"):
+            genes = rng.uniform(self.lower, self.upper, (population, len(self.lower)))
+            objectives = self.evaluate(genes)
+            ranks = non_dominated_sort(objectives)
+            distance = crowding_distance(objectives, ranks)
+            for generation in range(generations):
+                children = self._offspring(rng, genes, ranks, distance)
+                genes = np.vstack([genes, children])
+                objectives = np.vstack([objectives, self.evaluate(children)])
+                ranks = non_dominated_sort(objectives)
+                distance = crowding_distance(objectives, ranks)
+
+                # 按前沿序号、再按拥挤距离从大到小保留
+                survivors = np.lexsort((-distance, ranks))[:population]
+                genes, objectives = genes[survivors], objectives[survivors]
+                ranks, distance = ranks[survivors], distance[survivors]
+                if progress_callback is not None:
+                    progress_callback({"generation": generation + 1,
+                                       "front_size": int(np.count_nonzero(ranks == 0))})
+
+        # 去掉目标值完全相同的重复设计
+        front_index = np.flatnonzero(ranks == 0)
+        _, unique = np.unique(objectives[front_index], axis=0, return_index=True)
+        front_index = front_index[np.sort(unique)]
+        front_objectives = objectives[front_index]
+
+        weights = weights if weights is not None else self.default_weights
+        design = self.decode(genes[front_index])
+        design.update({
+            "vswr": front_objectives[:, 0],
+            "bandwidth": -front_objectives[:, 1],
+            "length": front_objectives[:, 2],
+            "components": front_objectives[:, 3].astype(int)
+        })
+        return {
+            "front": design,
+            "preferred": select_compromise(front_objectives, weights) if weights else None,
+            "generations": generations,
+            "evaluations": self.evaluations,
+            "throughput": instrumentation.throughput(self.evaluations, time.perf_counter() - start)
+        }
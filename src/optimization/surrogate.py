@@ -0,0 +1,183 @@
+"""代理模型辅助优化模块
+
+目标函数较贵（例如密集的带宽扫描或蒙特卡洛良率）时，用已评估的点拟合高斯过程 (GP)
+代理模型，在大量候选点上按期望改进 (EI) 挑选最有希望的一个再做真实评估。
+代理模型的拟合与预测只涉及几十个点的线性代数，远比真实评估便宜，
+总评估次数通常比种群类方法少一个数量级。
+"""
+import numpy as np
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from src.optimization.calculator import ProgressCallback
+
+# 在归一化输入空间 [0, 1]^D 中候选的核长度尺度，拟合时按边缘似然选择
+LENGTH_SCALES = (0.05, 0.1, 0.2, 0.4, 0.8)
+
+
+def _matern52(a: np.ndarray, b: np.ndarray, length_scale: float) -> np.ndarray:
+    """Matérn 5/2 核矩阵"""
+    distance = np.sqrt(np.maximum(((a[:, np.newaxis, :] - b[np.newaxis, :, :]) ** 2).sum(axis=2), 0.0))
+    r = np.sqrt(5.0) * distance / length_scale
+    return (1 + r + r ** 2 / 3) * np.exp(-r)
+
+
+class GaussianProcess:
+    """零均值 Matérn 5/2 高斯过程回归，输出先标准化"""
+
+    def __init__(self, length_scales: Sequence[float] = LENGTH_SCALES, noise: float = 1e-6):
+        """
+        初始化高斯过程
+
+        参数:
+            length_scales: Sequence[float], 候选长度尺度
+            noise: float, 观测噪声方差（相对标准化后的输出），同时保证数值稳定
+        """
+        self.length_scales = tuple(length_scales)
+        self.noise = noise
+        self.length_scale: Optional[float] = None
+
+    def fit(self, x: np.ndarray, y: np.ndarray) -> "GaussianProcess":
+        """
+        拟合模型，选择对数边缘似然最大的长度尺度
+
+        参数:
+            x: np.ndarray, 形状为 (N, D) 的输入
+            y: np.ndarray, 形状为 (N,) 的观测值
+
+        返回:
+            GaussianProcess: self
+        """
+        self._x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self._mean = y.mean()
+        self._scale = y.std() or 1.0
+        target = (y - self._mean) / self._scale
+
+        best = None
+        for length_scale in self.length_scales:
+            kernel = _matern52(self._x, self._x, length_scale) + self.noise * np.eye(len(self._x))
+            try:
+                factor = np.linalg.cholesky(kernel)
+            except np.linalg.LinAlgError:
+                continue
+            alpha = np.linalg.solve(factor.T, np.linalg.solve(factor, target))
+            likelihood = -0.5 * target @ alpha - np.log(np.diag(factor)).sum()
+            if best is None or likelihood > best[0]:
+                best = (likelihood, length_scale, factor, alpha)
+        if best is None:
+            raise np.linalg.LinAlgError("核矩阵不正定")
+        _, self.length_scale, self._factor, self._alpha = best
+        return self
+
+    def predict(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        预测均值和标准差
+
+        参数:
+            x: np.ndarray, 形状为 (M, D) 的输入
+
+        返回:
+            Tuple[np.ndarray, np.ndarray]: 均值和标准差
+        """
+        cross = _matern52(np.asarray(x, dtype=float), self._x, self.length_scale)
+        mean = cross @ self._alpha
+        v = np.linalg.solve(self._factor, cross.T)
+        variance = np.maximum(1.0 - (v ** 2).sum(axis=0), 0.0)
+        return self._mean + self._scale * mean, self._scale * np.sqrt(variance)
+
+
+def expected_improvement(mean: np.ndarray, std: np.ndarray, best: float, xi: float = 0.0) -> np.ndarray:
+    """
+    最小化问题的期望改进
+
+    参数:
+        mean: np.ndarray, 预测均值
+        std: np.ndarray, 预测标准差
+        best: float, 当前最优观测值
+        xi: float, 探索裕量，越大越倾向于探索
+
+    返回:
+        np.ndarray: 期望改进，标准差为0处为0
+    """
+    from scipy.special import ndtr  # 仅在使用代理模型时导入scipy
+
+    improvement = best - mean - xi
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(std > 0, improvement / std, 0.0)
+    pdf = np.exp(-0.5 * z ** 2) / np.sqrt(2 * np.pi)
+    return np.where(std > 0, improvement * ndtr(z) + std * pdf, 0.0)
+
+
+def surrogate_minimize(objective: Callable[[np.ndarray], float], bounds: Sequence[Tuple[float, float]],
+                       max_evaluations: int = 40, initial_points: Optional[int] = None,
+                       x0: Optional[np.ndarray] = None,
+                       candidates: int = 2000, target: Optional[float] = None, seed: Optional[int] = None,
+                       progress_callback: Optional[ProgressCallback] = None) -> Dict:
+    """
+    代理模型辅助的全局最小化
+
+    先评估给定的起始点和拉丁超立方采样的初始点，之后每轮拟合高斯过程，在随机候选点和当前最优点附近的
+    扰动点中选出期望改进最大的一个做真实评估。
+
+    参数:
+        objective: Callable[[np.ndarray], float], 目标函数，输入为形状 (D,) 的参数向量，返回标量
+        bounds: Sequence[Tuple[float, float]], 各参数的 (下限, 上限)
+        max_evaluations: int, 真实评估次数上限
+        initial_points: Optional[int], 初始采样点数，默认为 max(2D + 1, 5)
+        x0: Optional[np.ndarray], 需要首先评估的已知设计，形状为 (D,) 或 (K, D)，例如标称设计
+        candidates: int, 每轮参与期望改进比较的候选点数
+        target: Optional[float], 达到该目标值即停止
+        seed: Optional[int], 随机种子
+        progress_callback: Optional[ProgressCallback], 每次真实评估后以当前最优值调用的回调
+
+    返回:
+        Dict: 包含 x（最优参数）、value（最优值）、evaluations、history（每次评估的参数和值）
+        以及 status（target_reached 或 max_evaluations_reached）
+    """
+    bounds = np.asarray(bounds, dtype=float)
+    lower, upper = bounds[:, 0], bounds[:, 1]
+    if np.any(upper <= lower):
+        raise ValueError("参数上限必须大于下限")
+    dims = len(bounds)
+    initial_points = initial_points or max(2 * dims + 1, 5)
+    if max_evaluations < initial_points:
+        raise ValueError("评估次数不能少于初始采样点数")
+
+    rng = np.random.default_rng(seed)
+    # 拉丁超立方：每维等分为 initial_points 段，每段取一个点后随机配对
+    strata = (rng.permuted(np.tile(np.arange(initial_points), (dims, 1)), axis=1).T
+              + rng.random((initial_points, dims))) / initial_points
+
+    x_unit = np.empty((0, dims))
+    values = np.empty(0)
+    model = GaussianProcess()
+
+    def evaluate(point: np.ndarray) -> None:
+        nonlocal x_unit, values
+        value = float(objective(lower + point * (upper - lower)))
+        x_unit = np.vstack([x_unit, point])
+        values = np.append(values, value)
+        if progress_callback is not None:
+            progress_callback({"evaluation": len(values), "value": value, "best": float(values.min())})
+
+    if x0 is not None:
+        known = np.clip((np.atleast_2d(np.asarray(x0, dtype=float)) - lower) / (upper - lower), 0, 1)
+        strata = np.vstack([known, strata])
+    for point in strata[:max_evaluations]:
+        evaluate(point)
+    while len(values) < max_evaluations and not (target is not None and values.min() <= target):
+        best_point = x_unit[np.argmin(values)]
+        local = np.clip(best_point + rng.normal(0, 0.05, (candidates // 2, dims)), 0, 1)
+        pool = np.vstack([rng.random((candidates - len(local), dims)), local])
+        model.fit(x_unit, values)
+        mean, std = model.predict(pool)
+        evaluate(pool[np.argmax(expected_improvement(mean, std, values.min()))])
+
+    best = int(np.argmin(values))
+    return {
+        "x": lower + x_unit[best] * (upper - lower),
+        "value": float(values[best]),
+        "evaluations": len(values),
+        "history": {"x": lower + x_unit * (upper - lower), "values": values},
+        "status": "target_reached" if target is not None and values[best] <= target else "max_evaluations_reached"
+    }
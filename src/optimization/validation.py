@@ -0,0 +1,129 @@
+"""批量参数验证模块
+
+对整个参数数组一次完成有效性检查，返回有效行掩码和逐行错误码，
+批量计算可以跳过无效行或集中报告，而不是在第一个无效值处中断。
+规则与 ``CalculationParameters`` 的逐个检查一致，另外要求数值为有限值。
+"""
+import numpy as np
+from enum import IntFlag
+from typing import List, NamedTuple, Optional
+
+MATCHING_METHODS = ("quarter_wave", "stub", "L", "Pi", "T")
+OPTIMIZATION_TARGETS = ("vswr", "length")
+
+
+class ValidationError(IntFlag):
+    """参数错误码，同一行的多个错误按位组合"""
+    NONE = 0
+    FREQUENCY = 1
+    Z0 = 2
+    LOAD_REAL = 4
+    LOAD_IMAG = 8
+    METHOD = 16
+    TARGET = 32
+
+
+ERROR_MESSAGES = {
+    ValidationError.FREQUENCY: "频率必须为正数",
+    ValidationError.Z0: "特征阻抗必须为正数",
+    ValidationError.LOAD_REAL: "负载阻抗实部必须为正数",
+    ValidationError.LOAD_IMAG: "负载阻抗虚部必须为有限值",
+    ValidationError.METHOD: "匹配方法必须是 quarter_wave, stub, L, Pi 或 T",
+    ValidationError.TARGET: "优化目标必须是vswr或length"
+}
+
+
+class ValidationResult(NamedTuple):
+    """批量验证结果"""
+    mask: np.ndarray   # 有效行为True
+    codes: np.ndarray  # 每行的 ValidationError 组合，有效行为0
+
+    @property
+    def all_valid(self) -> bool:
+        """是否所有行都有效"""
+        return bool(self.mask.all())
+
+    def invalid_rows(self) -> np.ndarray:
+        """
+        获取无效行的下标
+
+        返回:
+            np.ndarray: 无效行下标 (从0开始)
+        """
+        return np.flatnonzero(~self.mask)
+
+    def messages(self, limit: Optional[int] = None) -> List[str]:
+        """
+        生成无效行的错误说明
+
+        参数:
+            limit: Optional[int], 最多返回的条数，为None时全部返回
+
+        返回:
+            List[str]: 形如 "第N行: 错误1; 错误2" 的说明，行号从1开始
+        """
+        rows = self.invalid_rows()[:limit]
+        return [f"第{row + 1}行: {'; '.join(describe(int(self.codes.flat[row])))}" for row in rows]
+
+    def raise_if_invalid(self) -> None:
+        """存在无效行时以第一个无效行的说明抛出 ValueError"""
+        if not self.all_valid:
+            raise ValueError(self.messages(limit=1)[0])
+
+
+def describe(code: int) -> List[str]:
+    """
+    将错误码展开为错误说明
+
+    参数:
+        code: int, ValidationError 组合
+
+    返回:
+        List[str]: 错误说明列表
+    """
+    return [message for flag, message in ERROR_MESSAGES.items() if code & flag]
+
+
+def validate_arrays(freq: np.ndarray, z0: np.ndarray, z_load_real: np.ndarray,
+                    z_load_imag: Optional[np.ndarray] = None,
+                    matching_method: Optional[np.ndarray] = None,
+                    optimization_target: Optional[np.ndarray] = None) -> ValidationResult:
+    """
+    批量验证计算参数
+
+    参数可以是标量或可相互广播的数组，省略的参数不检查。
+
+    参数:
+        freq: np.ndarray, 频率 (Hz)
+        z0: np.ndarray, 特征阻抗 (Ω)
+        z_load_real: np.ndarray, 负载阻抗实部 (Ω)
+        z_load_imag: Optional[np.ndarray], 负载阻抗虚部 (Ω)
+        matching_method: Optional[np.ndarray], 匹配方法名
+        optimization_target: Optional[np.ndarray], 优化目标名
+
+    返回:
+        ValidationResult: 有效行掩码和错误码
+    """
+    checks = [
+        (ValidationError.FREQUENCY, _positive(freq)),
+        (ValidationError.Z0, _positive(z0)),
+        (ValidationError.LOAD_REAL, _positive(z_load_real))
+    ]
+    if z_load_imag is not None:
+        checks.append((ValidationError.LOAD_IMAG, np.isfinite(np.asarray(z_load_imag, dtype=float))))
+    if matching_method is not None:
+        checks.append((ValidationError.METHOD, np.isin(matching_method, MATCHING_METHODS)))
+    if optimization_target is not None:
+        checks.append((ValidationError.TARGET, np.isin(optimization_target, OPTIMIZATION_TARGETS)))
+
+    valid = np.broadcast_arrays(*(ok for _, ok in checks))
+    codes = np.zeros(valid[0].shape, dtype=np.uint8)
+    for (flag, _), ok in zip(checks, valid):
+        codes[~ok] |= np.uint8(flag)
+    return ValidationResult(codes == 0, codes)
+
+
+def _positive(values: np.ndarray) -> np.ndarray:
+    """有限正数检查，NaN视为无效"""
+    values = np.asarray(values, dtype=float)
+    return np.isfinite(values) & (values > 0)
@@ -0,0 +1,187 @@
+"""蒙特卡洛容差与良率分析模块
+
+按给定分布扰动设计的元件值和传输线参数，把“样本 × 频点”一次送入级联计算，
+统计在整个频带内驻波比都满足指标的样本比例。
+
+样本分块计算，内存占用只与块大小有关。每块使用由 ``SeedSequence`` 派生的独立随机流，
+因此相同种子下的结果与块的执行顺序和进程数无关。
+"""
+import numpy as np
+from typing import Dict, List, Mapping, Optional, Sequence, Union
+
+from src import instrumentation
+from src.impedance_matching.cascade import vswr
+from src.impedance_matching.loads import LoadModel, resolve_load
+from src.impedance_matching.topology import Topology
+
+DISTRIBUTIONS = ("uniform", "normal")
+
+
+class Tolerance:
+    """单个参数的制造容差"""
+
+    def __init__(self, tolerance: float, distribution: str = "uniform", relative: bool = True):
+        """
+        初始化容差
+
+        参数:
+            tolerance: float, 均匀分布为最大偏差，正态分布为标准差
+            distribution: str, uniform 或 normal
+            relative: bool, 为True时 tolerance 是相对标称值的比例，否则为绝对值
+        """
+        if tolerance < 0:
+            raise ValueError("容差不能为负数")
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError("分布必须是uniform或normal")
+        self.tolerance = tolerance
+        self.distribution = distribution
+        self.relative = relative
+
+    def sample(self, rng: np.random.Generator, nominal: float, size: int) -> np.ndarray:
+        """
+        抽取参数样本
+
+        参数:
+            rng: np.random.Generator, 随机数生成器
+            nominal: float, 标称值
+            size: int, 样本数
+
+        返回:
+            np.ndarray: 参数样本
+        """
+        scale = self.tolerance * abs(nominal) if self.relative else self.tolerance
+        if self.distribution == "uniform":
+            deviation = rng.uniform(-scale, scale, size)
+        else:
+            deviation = rng.normal(0.0, scale, size)
+        return nominal + deviation
+
+
+class YieldAnalysis:
+    """蒙特卡洛良率分析"""
+
+    def __init__(self, topology: Topology, z0: float, zl: Union[complex, LoadModel],
+                 frequencies: np.ndarray, tolerances: Mapping[str, Tolerance], vswr_max: float = 2.0):
+        """
+        初始化良率分析
+
+        参数:
+            topology: Topology, 标称设计
+            z0: float, 源阻抗 (Ω)
+            zl: complex, 负载阻抗 (Ω)，负载模型按各频点求值
+            frequencies: np.ndarray, 需要满足指标的频点 (Hz)
+            tolerances: Mapping[str, Tolerance], "元件名.参数名" 到容差的映射
+            vswr_max: float, 驻波比上限
+        """
+        nominal = topology.nominal()
+        unknown = set(tolerances) - set(nominal)
+        if unknown:
+            raise KeyError(f"未知参数: {', '.join(sorted(unknown))}")
+        if vswr_max < 1:
+            raise ValueError("驻波比上限不能小于1")
+
+        self.topology = topology
+        self.z0 = z0
+        self.frequencies = np.asarray(frequencies, dtype=float).ravel()
+        self.zl = resolve_load(zl, self.frequencies)
+        self.tolerances = dict(tolerances)
+        self.vswr_max = vswr_max
+        self._nominal = nominal
+
+    def sample_parameters(self, rng: np.random.Generator, size: int) -> Dict[str, np.ndarray]:
+        """
+        抽取一块参数样本
+
+        参数:
+            rng: np.random.Generator, 随机数生成器
+            size: int, 样本数
+
+        返回:
+            Dict[str, np.ndarray]: 参数名到样本数组的映射，只包含有容差的参数
+        """
+        return {name: tolerance.sample(rng, self._nominal[name], size)
+                for name, tolerance in self.tolerances.items()}
+
+    def evaluate(self, values: Mapping[str, np.ndarray]) -> np.ndarray:
+        """
+        计算每个样本在频带内的最大驻波比
+
+        参数:
+            values: Mapping[str, np.ndarray], 参数样本，每个数组长度相同
+
+        返回:
+            np.ndarray: 每个样本的最大驻波比
+        """
+        # 参数为列、频率为行，广播成 样本 × 频点
+        columns = {name: np.asarray(samples)[:, np.newaxis] for name, samples in values.items()}
+        s11, _ = self.topology.response(self.frequencies, self.z0, self.zl, columns)
+        return np.max(vswr(s11), axis=-1)
+
+    def run(self, samples: int, seed: Optional[int] = None, chunk_size: int = 10_000,
+            workers: int = 1) -> Dict[str, Union[int, float, np.ndarray]]:
+        """
+        执行蒙特卡洛分析
+
+        参数:
+            samples: int, 样本总数
+            seed: Optional[int], 随机种子
+            chunk_size: int, 每块样本数，决定峰值内存
+            workers: int, 并行进程数，为1时在当前进程计算
+
+        返回:
+            Dict: 包含
+                - samples: 样本数
+                - passed: 满足指标的样本数
+                - yield: 良率
+                - standard_error: 良率的标准误差
+                - worst_vswr: 每个样本在频带内的最大驻波比
+        """
+        if samples <= 0:
+            raise ValueError("样本数必须为正数")
+        if chunk_size <= 0:
+            raise ValueError("块大小必须为正数")
+
+        sizes = [min(chunk_size, samples - start) for start in range(0, samples, chunk_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+        with instrumentation.stage("yield_analysis"):
+            if workers > 1 and len(sizes) > 1:
+                from concurrent.futures import ProcessPoolExecutor
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    chunks = list(executor.map(_run_chunk, [self] * len(sizes), seeds, sizes))
+            else:
+                chunks = [_run_chunk(self, chunk_seed, size) for chunk_seed, size in zip(seeds, sizes)]
+        instrumentation.count("yield_samples", samples)
+
+        worst = np.concatenate(chunks)
+        passed = int(np.count_nonzero(worst <= self.vswr_max))
+        ratio = passed / samples
+        return {
+            "samples": samples,
+            "passed": passed,
+            "yield": ratio,
+            "standard_error": float(np.sqrt(ratio * (1 - ratio) / samples)),
+            "worst_vswr": worst
+        }
+
+
+def _run_chunk(analysis: YieldAnalysis, seed: np.random.SeedSequence, size: int) -> np.ndarray:
+    """计算一块样本，作为进程池任务时必须是模块级函数"""
+    rng = np.random.default_rng(seed)
+    # 没有容差参数时所有样本相同
+    return np.broadcast_to(analysis.evaluate(analysis.sample_parameters(rng, size)), (size,))
+
+
+def yield_percentiles(worst_vswr: np.ndarray,
+                      percentiles: Sequence[float] = (50, 90, 99)) -> List[float]:
+    """
+    最大驻波比的分位数，用于估计给定良率下可以承诺的指标
+
+    参数:
+        worst_vswr: np.ndarray, ``YieldAnalysis.run`` 返回的 worst_vswr
+        percentiles: Sequence[float], 百分位
+
+    返回:
+        List[float]: 各百分位对应的驻波比
+    """
+    return [float(value) for value in np.percentile(worst_vswr, percentiles)]
@@ -0,0 +1,188 @@
+"""实时绘图模块"""
+from __future__ import annotations
+
+import time
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+
+class LivePlotter:
+    """
+    优化过程实时绘图器
+
+    保持同一个图形对象，通过画布位块传输 (blitting) 只重绘数据曲线，
+    并按目标帧率节流刷新，避免可视化拖慢计算循环。
+
+    实例本身可直接作为 ``Optimizer.optimize`` 或
+    ``BatchCalculator.batch_calculate`` 的 ``progress_callback`` 使用。
+    横坐标默认为优化器的迭代次数，没有迭代次数时为数据点的序号；
+    按某个参数扫描时可由 ``x_key`` 指定取结果中 params 的哪个参数作横坐标。
+    """
+
+    def __init__(self, target_fps: float = 30.0, figure: Optional[Figure] = None,
+                 title: str = "Optimization Progress", x_key: Optional[str] = None):
+        """
+        初始化实时绘图器
+
+        参数:
+            target_fps: float, 目标刷新帧率 (Hz)
+            figure: Optional[Figure], 复用的图形对象，为None时新建
+            title: str, 图标题
+            x_key: Optional[str], 作横坐标的参数名，如 freq，为None时使用迭代次数或数据点序号
+        """
+        if target_fps <= 0:
+            raise ValueError("目标帧率必须为正数")
+
+        import matplotlib.pyplot as plt
+
+        self.x_key = x_key
+        self.min_interval = 1.0 / target_fps
+        self.fig = figure if figure is not None else plt.figure(figsize=(12, 4))
+        self.fig.clear()
+        self.fig.suptitle(title)
+
+        self.ax_s11 = self.fig.add_subplot(131)
+        self.ax_vswr = self.fig.add_subplot(132)
+        self.ax_smith = self.fig.add_subplot(133)
+
+        xlabel = {None: "Iteration / Sample", "freq": "Frequency (Hz)"}.get(x_key, x_key)
+        self.ax_s11.set_xlabel(xlabel)
+        self.ax_s11.set_ylabel("|S11| (dB)")
+        self.ax_s11.grid(True)
+        self.ax_vswr.set_xlabel(xlabel)
+        self.ax_vswr.set_ylabel("VSWR")
+        self.ax_vswr.grid(True)
+
+        theta = np.linspace(0, 2 * np.pi, 100)
+        self.ax_smith.plot(np.cos(theta), np.sin(theta), 'k-', alpha=0.5)
+        self.ax_smith.set_title("Smith Chart")
+        self.ax_smith.set_aspect('equal')
+        self.ax_smith.set_xlim((-1.2, 1.2))
+        self.ax_smith.set_ylim((-1.2, 1.2))
+        self.ax_smith.grid(True)
+
+        # animated=True 的曲线不参与背景绘制，只在位块传输时绘制
+        (self.s11_line,) = self.ax_s11.plot([], [], 'b-', animated=True)
+        (self.vswr_line,) = self.ax_vswr.plot([], [], 'r-', animated=True)
+        (self.smith_line,) = self.ax_smith.plot([], [], 'b.-', animated=True)
+        self._artists = [self.s11_line, self.vswr_line, self.smith_line]
+
+        self._x: List[float] = []
+        self._s11: List[complex] = []
+        self._background: Any = None
+        self._limits: Optional[Tuple[float, float, float, float]] = None
+        self._last_draw = float("-inf")
+        self._dirty = False
+        self.draw_count = 0
+
+    def __call__(self, result: Dict[str, Any]) -> None:
+        """
+        进度回调入口
+
+        参数:
+            result: Dict[str, Any], 计算器或优化器发出的中间结果
+        """
+        x, s11 = self._extract_point(result)
+        self.update(x, s11)
+
+    def update(self, x: float, s11: complex) -> bool:
+        """
+        追加一个数据点，并在达到帧间隔时刷新图形
+
+        参数:
+            x: float, 横坐标 (参数值、迭代次数或数据点序号)
+            s11: complex, 反射系数
+
+        返回:
+            bool: 本次是否执行了重绘
+        """
+        self._x.append(float(x))
+        self._s11.append(complex(s11))
+        self._dirty = True
+
+        if time.perf_counter() - self._last_draw < self.min_interval:
+            return False
+        self._redraw()
+        return True
+
+    def flush(self) -> None:
+        """强制刷新尚未绘制的数据点"""
+        if self._dirty:
+            self._redraw()
+
+    def get_data(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        获取已记录的数据
+
+        返回:
+            Tuple[np.ndarray, np.ndarray]: 横坐标数组和S11数组
+        """
+        return np.array(self._x), np.array(self._s11, dtype=complex)
+
+    def _extract_point(self, result: Dict[str, Any]) -> Tuple[float, complex]:
+        """从结果字典中提取横坐标和S11"""
+        if self.x_key is not None:
+            x = float(result["params"][self.x_key])
+        else:
+            # 多参数网格按行展开，任何单个参数都不单调，只有序号能画成连续曲线
+            x = float(result.get("iteration", len(self._x)))
+
+        s_params = np.asarray(result["s_parameters"])
+        # 兼容 2x2 矩阵和 [S11, S12, S21, S22] 列表两种格式
+        s11 = s_params[0, 0] if s_params.ndim == 2 else s_params[0]
+        return x, complex(s11)
+
+    def _redraw(self) -> None:
+        """更新曲线数据并重绘"""
+        x, s11 = self.get_data()
+        magnitude = np.clip(np.abs(s11), 1e-12, 1 - 1e-12)
+
+        self.s11_line.set_data(x, 20 * np.log10(magnitude))
+        self.vswr_line.set_data(x, (1 + magnitude) / (1 - magnitude))
+        self.smith_line.set_data(s11.real, s11.imag)
+
+        canvas = self.fig.canvas
+        if self._rescale(x, magnitude) or self._background is None:
+            # 坐标轴范围变化时才需要完整重绘并重新缓存背景
+            canvas.draw()
+            self._background = canvas.copy_from_bbox(self.fig.bbox)
+        else:
+            canvas.restore_region(self._background)
+
+        for artist in self._artists:
+            artist.axes.draw_artist(artist)
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+
+        self._last_draw = time.perf_counter()
+        self._dirty = False
+        self.draw_count += 1
+
+    def _rescale(self, x: np.ndarray, magnitude: np.ndarray) -> bool:
+        """
+        按需扩展坐标轴范围
+
+        返回:
+            bool: 坐标轴范围是否发生变化
+        """
+        s11_db = 20 * np.log10(magnitude)
+        vswr = (1 + magnitude) / (1 - magnitude)
+        limits = (float(x.min()), float(x.max()), float(s11_db.min()), float(vswr.max()))
+
+        if self._limits is not None and \
+           limits[0] >= self._limits[0] and limits[1] <= self._limits[1] and \
+           limits[2] >= self._limits[2] and limits[3] <= self._limits[3]:
+            return False
+
+        # 留出余量，减少坐标轴频繁变化导致的完整重绘
+        x_span = max(limits[1] - limits[0], abs(limits[1]) * 0.1, 1.0)
+        self._limits = (limits[0] - 0.1 * x_span, limits[1] + 0.1 * x_span,
+                        limits[2] * 1.2 - 1.0, limits[3] * 1.2 + 0.1)
+        self.ax_s11.set_xlim(self._limits[0], self._limits[1])
+        self.ax_s11.set_ylim(self._limits[2], 0.0)
+        self.ax_vswr.set_xlim(self._limits[0], self._limits[1])
+        self.ax_vswr.set_ylim(1.0, self._limits[3])
+        return True
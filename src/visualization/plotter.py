@@ -1,8 +1,15 @@
+"""绘图模块
+
+matplotlib 在首次绘图时才导入，仅导入本模块不会加载它。
+"""
+from __future__ import annotations
+
 import numpy as np
-from matplotlib.figure import Figure
-from matplotlib.axes import Axes
-import matplotlib.pyplot as plt
-from typing import Optional, Dict, Any, Tuple, cast
+from typing import Optional, Dict, Any, Tuple, cast, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+    from matplotlib.axes import Axes
 
 def plot_s_parameters(frequencies: np.ndarray,
                      s_parameters: np.ndarray,
@@ -24,8 +31,10 @@ def plot_s_parameters(frequencies: np.ndarray,
     Returns:
         matplotlib.figure.Figure: 图形对象
     """
+    import matplotlib.pyplot as plt
+
     fig = plt.figure(figsize=(10, 6))
-    ax = cast(Axes, fig.add_subplot(111))
+    ax = cast("Axes", fig.add_subplot(111))
     
     # 计算dB值
     s11_db = 20 * np.log10(np.abs(s_parameters[:, 0]))
@@ -58,8 +67,10 @@ def plot_smith_chart(s11: np.ndarray,
     Returns:
         matplotlib.figure.Figure: 图形对象
     """
+    import matplotlib.pyplot as plt
+
     fig = plt.figure(figsize=(8, 8))
-    ax = cast(Axes, fig.add_subplot(111))
+    ax = cast("Axes", fig.add_subplot(111))
     
     # 绘制单位圆
     theta = np.linspace(0, 2*np.pi, 100)
@@ -97,8 +108,10 @@ def plot_vswr(frequencies: np.ndarray,
     Returns:
         matplotlib.figure.Figure: 图形对象
     """
+    import matplotlib.pyplot as plt
+
     fig = plt.figure(figsize=(10, 6))
-    ax = cast(Axes, fig.add_subplot(111))
+    ax = cast("Axes", fig.add_subplot(111))
     
     # 计算VSWR
     reflection_coefficient = np.abs(s11)
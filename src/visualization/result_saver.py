@@ -1,11 +1,25 @@
 """结果保存模块"""
 import os
 import numpy as np
-import matplotlib
-matplotlib.use('Agg')  # 使用非交互式后端
-import matplotlib.pyplot as plt
 from typing import Any, Dict, List, Optional, Union
-from matplotlib import font_manager
+from src import instrumentation
+
+_plt: Any = None
+
+def _pyplot() -> Any:
+    """
+    首次使用时才导入 matplotlib 并切换到非交互式后端
+
+    返回:
+        module: matplotlib.pyplot 模块
+    """
+    global _plt
+    if _plt is None:
+        import matplotlib
+        matplotlib.use('Agg')  # 使用非交互式后端
+        import matplotlib.pyplot as plt
+        _plt = plt
+    return _plt
 
 class ResultSaver:
     """结果保存器类"""
@@ -20,10 +34,12 @@ class ResultSaver:
         os.makedirs(save_dir, exist_ok=True)
 
         # 设置字体
+        plt = _pyplot()
         plt.rcParams['font.family'] = ['sans-serif']
         plt.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei', 'Arial']
         plt.rcParams['axes.unicode_minus'] = False  # 解决负号显示问题
 
+    @instrumentation.timed("save")
     def save_network_data(self, network: Any, save_path: str) -> None:
         """
         保存网络数据
@@ -84,6 +100,7 @@ class ResultSaver:
         except Exception as e:
             raise OSError(f"保存网络数据失败: {str(e)}")
 
+    @instrumentation.timed("save")
     def save_plots(self, network: Any, save_path: str) -> None:
         """
         保存图表
@@ -105,6 +122,7 @@ class ResultSaver:
                 raise OSError(f"创建保存目录失败: {str(e)}")
 
         try:
+            plt = _pyplot()
             # 绘制S参数图
             plt.figure(figsize=(10, 6))
             s_params = np.array(network.s_parameters)
@@ -132,6 +150,7 @@ class ResultSaver:
         except (OSError, ValueError) as e:
             raise OSError(f"保存图表失败: {str(e)}")
 
+    @instrumentation.timed("save")
     def save_optimization_results(self, results: List[Dict[str, float]], save_path: str) -> None:
         """
         保存优化结果
@@ -162,6 +181,7 @@ class ResultSaver:
         except (OSError, ValueError) as e:
             raise OSError(f"保存优化结果失败: {str(e)}")
 
+    @instrumentation.timed("save")
     def save_parameter_sweep(self, sweep_results: List[Dict[str, float]], save_path: str,
                            param_name: str) -> None:
         """
@@ -186,6 +206,7 @@ class ResultSaver:
             result_values = [result["优化目标值"] for result in sweep_results]
 
             # 绘制扫描结果图
+            plt = _pyplot()
             plt.figure(figsize=(10, 6))
             plt.plot(param_values, result_values)
             plt.xlabel(param_name)
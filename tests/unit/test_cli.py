@@ -0,0 +1,148 @@
+"""命令行模块测试"""
+import json
+import subprocess
+import sys
+import pytest
+import numpy as np
+from src.cli import load_job_spec, main, solve_jobs
+from src.impedance_matching.quarter_wave import QuarterWaveTransformer
+from src.impedance_matching.stub_matching import StubMatcher
+
+
+@pytest.fixture
+def csv_spec(tmp_path):
+    """创建CSV作业文件"""
+    path = tmp_path / "jobs.csv"
+    path.write_text("freq,z_load_real,z_load_imag\n"
+                    "1e9,75,25\n"
+                    "2.4e9,100,0\n"
+                    "5e9,30,-40\n")
+    return str(path)
+
+
+class TestBatchCommand:
+    """测试批量计算子命令"""
+
+    def test_load_csv_spec(self, csv_spec):
+        """测试读取CSV作业文件"""
+        jobs = load_job_spec(csv_spec, default_z0=75.0)
+        assert np.allclose(jobs["freq"], [1e9, 2.4e9, 5e9])
+        assert np.allclose(jobs["z0"], 75.0)
+
+    def test_load_json_spec(self, tmp_path):
+        """测试JSON作业文件按笛卡尔积展开"""
+        path = tmp_path / "jobs.json"
+        path.write_text(json.dumps({"z0": 50, "frequencies": [1e9, 2e9, 3e9],
+                                    "loads": [[75, 25], [100, 0]]}))
+        jobs = load_job_spec(str(path))
+        assert len(jobs["freq"]) == 6
+        assert np.allclose(jobs["z_load_imag"], [25, 0] * 3)
+
+    def test_invalid_row(self, tmp_path):
+        """测试报告无效行"""
+        path = tmp_path / "jobs.csv"
+        path.write_text("freq,z_load_real,z_load_imag\n1e9,75,0\n-1,75,0\n")
+        with pytest.raises(ValueError, match="第2行: 频率必须为正数"):
+            load_job_spec(str(path))
+
+    def test_skip_invalid_rows(self, tmp_path, capsys):
+        """测试跳过无效行并集中报告"""
+        path = tmp_path / "jobs.csv"
+        path.write_text("freq,z_load_real,z_load_imag\n1e9,75,0\n-1,75,0\n2e9,0,0\n3e9,50,10\n")
+        output = tmp_path / "out.npz"
+        assert main(["batch", str(path), "-o", str(output), "--skip-invalid"]) == 0
+
+        err = capsys.readouterr().err
+        assert "第2行: 频率必须为正数" in err
+        assert "第3行: 负载阻抗实部必须为正数" in err
+        assert np.allclose(np.load(output)["freq"], [1e9, 3e9])
+
+    def test_matches_scalar_classes(self, csv_spec):
+        """测试批量结果与逐个计算一致"""
+        jobs = load_job_spec(csv_spec)
+        results = solve_jobs(jobs, ["quarter_wave", "stub"])
+        for i in range(3):
+            zl = complex(jobs["z_load_real"][i], jobs["z_load_imag"][i])
+            transformer = QuarterWaveTransformer(jobs["freq"][i], 50.0, zl)
+            matcher = StubMatcher(jobs["freq"][i], 50.0, zl)
+            assert results["quarter_wave_transformer_impedance"][i] == pytest.approx(transformer.zt)
+            assert results["quarter_wave_vswr"][i] == pytest.approx(transformer.vswr)
+            assert results["stub_distance"][i] == pytest.approx(matcher.distance)
+            assert results["stub_stub_length"][i] == pytest.approx(matcher.stub_length)
+
+    def test_parallel_matches_serial(self, csv_spec):
+        """测试多进程结果与单进程一致"""
+        jobs = load_job_spec(csv_spec)
+        serial = solve_jobs(jobs, ["quarter_wave"])
+        parallel = solve_jobs(jobs, ["quarter_wave"], workers=2, chunk_size=1)
+        for key in serial:
+            assert np.allclose(serial[key], parallel[key])
+
+    def test_write_csv_and_npz(self, csv_spec, tmp_path):
+        """测试写出CSV和npz结果"""
+        csv_out = tmp_path / "out" / "results.csv"
+        assert main(["batch", csv_spec, "-o", str(csv_out), "-m", "quarter_wave"]) == 0
+        with open(csv_out) as f:
+            header = f.readline().strip().split(",")
+        assert header[:4] == ["freq", "z0", "z_load_real", "z_load_imag"]
+        assert "quarter_wave_vswr" in header
+        assert np.loadtxt(csv_out, delimiter=",", skiprows=1).shape == (3, len(header))
+
+        npz_out = tmp_path / "results.npz"
+        assert main(["sweep", csv_spec, "-o", str(npz_out)]) == 0
+        data = np.load(npz_out)
+        assert data["stub_vswr"].shape == (3,)
+
+    def test_geometry_synthesis(self, csv_spec, tmp_path):
+        """测试按基板输出微带线宽度和物理长度"""
+        out = tmp_path / "results.npz"
+        cache = tmp_path / "cache"
+        argv = ["batch", csv_spec, "-o", str(out), "--eps-r", "4.4", "--synthesis-cache", str(cache)]
+        assert main(argv) == 0
+        data = np.load(out)
+        assert np.all(data["quarter_wave_width"] > 0)
+        assert np.all(data["quarter_wave_physical_length"] < data["quarter_wave_length"])
+        assert np.allclose(data["stub_width"], data["stub_width"][0])
+        assert len(list(cache.iterdir())) == 1
+        assert main(argv) == 0
+
+    def test_single_precision(self, csv_spec, tmp_path):
+        """测试单精度输出 float32 结果列，与双精度结果在误差界内一致"""
+        single, double = tmp_path / "single.npz", tmp_path / "double.npz"
+        assert main(["batch", csv_spec, "-o", str(single), "--precision", "single"]) == 0
+        assert main(["batch", csv_spec, "-o", str(double)]) == 0
+        single, double = np.load(single), np.load(double)
+        assert single["freq"].dtype == np.float64
+        assert single["quarter_wave_transformer_impedance"].dtype == np.float32
+        assert np.allclose(single["quarter_wave_transformer_impedance"],
+                           double["quarter_wave_transformer_impedance"], rtol=1e-6, atol=0)
+        assert np.allclose(single["stub_distance"], double["stub_distance"],
+                           rtol=0, atol=1e-5 * double["stub_wavelength"].max())
+
+    def test_distributed_sweep(self, csv_spec, tmp_path, capsys):
+        """测试分布式扫描的提交、执行和合并子命令"""
+        directory = str(tmp_path / "sweep")
+        assert main(["distribute", csv_spec, directory, "-m", "stub", "--shard-size", "2"]) == 0
+        assert main(["worker", directory, "--id", "a", "--max-shards", "1"]) == 0
+        assert main(["merge", directory]) == 1
+        assert "尚有 1 个分片未完成" in capsys.readouterr().err
+        assert main(["worker", directory]) == 0
+        assert main(["merge", directory, "-o", str(tmp_path / "merged.npz")]) == 0
+        merged = np.load(tmp_path / "merged.npz")
+        assert np.array_equal(merged["row"], [0, 1, 2])
+        assert np.allclose(merged["distance"], [StubMatcher(1e9, 50, 75 + 25j).distance,
+                                                StubMatcher(2.4e9, 50, 100).distance,
+                                                StubMatcher(5e9, 50, 30 - 40j).distance])
+
+    def test_headless_imports(self, csv_spec, tmp_path):
+        """测试批量计算不导入GUI、matplotlib或Rust扩展"""
+        out = tmp_path / "results.npz"
+        code = (
+            "import sys\n"
+            "from src.cli import main\n"
+            f"assert main(['batch', {csv_spec!r}, '-o', {str(out)!r}]) == 0\n"
+            "loaded = [m for m in ('matplotlib', 'microwave_gui', 'src.gui.main') if m in sys.modules]\n"
+            "assert not loaded, loaded\n"
+        )
+        completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        assert completed.returncode == 0, completed.stderr
@@ -0,0 +1,46 @@
+"""GUI结果模块测试"""
+import pytest
+import numpy as np
+from src.gui.result import DesignResult, SWEEP_COLUMNS, build_sweep
+
+
+class TestDesignResult:
+    """测试结构化设计结果"""
+
+    def test_build_sweep_layout(self):
+        """测试扫描数组布局"""
+        frequencies = np.array([1e9, 2e9])
+        s11 = np.array([0.5 + 0.1j, 0.0 + 0.0j])
+        s21 = np.array([0.8 + 0.0j, 1.0 + 0.0j])
+        sweep = build_sweep(frequencies, s11, s21)
+
+        assert sweep.shape == (2, len(SWEEP_COLUMNS))
+        assert sweep.dtype == np.float64
+        assert sweep.flags.c_contiguous
+        assert np.allclose(sweep[:, 0], frequencies)
+        assert np.allclose(sweep[:, 2], [0.1, 0.0])
+        assert sweep[1, 5] == pytest.approx(1.0)
+
+    def test_accessors(self):
+        """测试列访问属性"""
+        s11 = np.array([0.2j, 0.3])
+        result = DesignResult("ok", {"length": 0.01},
+                              build_sweep(np.array([1.0, 2.0]), s11, np.ones(2)))
+        assert np.allclose(result.s11, s11)
+        assert np.allclose(result.s21, 1.0)
+        assert np.allclose(result.vswr, (1 + np.abs(s11)) / (1 - np.abs(s11)))
+        assert str(result) == "ok"
+
+    def test_buffer_protocol(self):
+        """测试缓冲区协议暴露的格式"""
+        result = DesignResult("ok", sweep=build_sweep(np.ones(3), np.zeros(3), np.ones(3)))
+        view = memoryview(result.sweep)
+        assert view.format == "d"
+        assert view.shape == (3, len(SWEEP_COLUMNS))
+        assert view.c_contiguous
+
+    def test_empty_and_invalid_sweep(self):
+        """测试空扫描和无效形状"""
+        assert DesignResult("请先输入参数").sweep.shape == (0, len(SWEEP_COLUMNS))
+        with pytest.raises(ValueError, match="扫描数组形状"):
+            DesignResult("bad", sweep=np.zeros((3, 2)))
@@ -1,10 +1,40 @@
 """阻抗匹配模块测试"""
+import warnings
 import pytest
 import numpy as np
 from src.impedance_matching.core import (
     QuarterWaveTransformer,
     StubMatcher
 )
+from src.impedance_matching.cascade import (
+    cascade,
+    line_abcd,
+    quarter_wave_sweep,
+    series_abcd,
+    vswr
+)
+from src.impedance_matching.batch import quarter_wave_batch, stub_batch
+from src.impedance_matching import kernels
+from src.impedance_matching.parallel import SharedArrays, attach, solve_shared
+from src.impedance_matching.loads import RLCLoad, TabulatedLoad, resolve_load
+from src.impedance_matching.transmission_line import (
+    ETA0,
+    Coax,
+    IdealLine,
+    Microstrip,
+    Stripline
+)
+from src.impedance_matching.synthesis import MicrostripSynthesizer, Substrate
+from src.impedance_matching.sensitivity import normalized_sensitivity, sensitivity
+from src.impedance_matching.topology import (
+    LineSection,
+    OpenStub,
+    SeriesElement,
+    ShortStub,
+    ShuntElement,
+    Topology
+)
+from src.impedance_matching import quarter_wave
 
 class TestQuarterWaveTransformer:
     """四分之一波长变换器测试类"""
@@ -146,4 +176,364 @@ class TestStubMatcher:
         )
         result = matcher.calculate()
         assert "支节到负载距离" in result
-        assert "支节长度" in result
\ No newline at end of file
+        assert "支节长度" in result
+class TestCascade:
+    """ABCD级联计算测试类"""
+
+    def test_quarter_wave_matched_at_design_frequency(self):
+        """测试四分之一波长变换器在设计频率处完全匹配"""
+        frequencies = np.linspace(2.5e9, 7.5e9, 101)
+        s11, s21 = quarter_wave_sweep(frequencies, 5e9, 50, 100, np.sqrt(50 * 100))
+        assert abs(s11[50]) == pytest.approx(0, abs=1e-12)
+        # 无耗网络功率守恒
+        assert np.allclose(np.abs(s11) ** 2 + np.abs(s21) ** 2, 1)
+        # 偏离设计频率时失配
+        assert abs(s11[0]) > 0.1
+
+    def test_cascade_identity(self):
+        """测试与单位矩阵级联不改变网络"""
+        line = line_abcd(50, 1j * np.array([0.3, 1.2]))
+        total = cascade(series_abcd(np.zeros(2)), line)
+        for got, expected in zip(total, line):
+            assert np.allclose(got, expected)
+
+    def test_vswr_total_reflection(self):
+        """测试完全反射时驻波比为无穷大"""
+        assert np.isinf(vswr(np.array([1.0]))[0])
+        assert vswr(np.array([0.5]))[0] == pytest.approx(3.0)
+
+
+class TestLoadModels:
+    """频率相关负载模型测试类"""
+
+    def test_series_rlc_resonance(self):
+        """测试串联RLC在谐振频率处为纯电阻"""
+        load = RLCLoad(50, inductance=1e-9, capacitance=1e-12)
+        f0 = 1 / (2 * np.pi * np.sqrt(1e-9 * 1e-12))
+        z = load(np.array([0.5 * f0, f0, 2 * f0]))
+        assert z[1] == pytest.approx(50)
+        assert z[0].imag < 0 < z[2].imag
+
+    def test_parallel_rlc(self):
+        """测试并联RLC"""
+        load = RLCLoad(100, capacitance=1e-12, topology="parallel")
+        f = 1e9
+        expected = 1 / (1 / 100 + 2j * np.pi * f * 1e-12)
+        assert load.impedance(f) == pytest.approx(expected)
+        with pytest.raises(ValueError):
+            RLCLoad(0, topology="parallel")
+
+    def test_tabulated_interpolation(self):
+        """测试表格负载插值"""
+        load = TabulatedLoad([2e9, 1e9], [100 + 20j, 50 + 0j])
+        z = load(np.array([1e9, 1.5e9, 3e9]))
+        assert np.allclose(z, [50, 75 + 10j, 100 + 20j])
+        with pytest.raises(ValueError, match="超出"):
+            TabulatedLoad([1e9, 2e9], [50, 60], bounds_error=True).impedance(3e9)
+
+    @pytest.mark.parametrize("option, row", [
+        ("# GHz S RI R 50", "1.0 0.2 0.0"),
+        ("# MHz S MA R 50", "1000 0.2 0"),
+        ("# Hz S DB R 50", "1e9 -13.979400087 0"),
+        ("# GHz Z RI R 50", "1.0 1.5 0")
+    ])
+    def test_touchstone_formats(self, tmp_path, option, row):
+        """测试读取不同格式的Touchstone文件"""
+        path = tmp_path / "load.s1p"
+        path.write_text(f"! 测试数据\n{option}\n{row}\n")
+        load = TabulatedLoad.from_touchstone(str(path))
+        assert load.frequencies[0] == pytest.approx(1e9)
+        assert load.impedances[0] == pytest.approx(75)
+
+    def test_touchstone_two_port(self, tmp_path):
+        """测试读取2端口文件的指定端口"""
+        path = tmp_path / "device.s2p"
+        path.write_text("# GHz S RI R 50\n1 0 0 1 0 1 0 0.2 0\n2 0 0 1 0 1 0 0.2 0\n")
+        assert np.allclose(TabulatedLoad.from_touchstone(str(path), port=1).impedances, 50)
+        assert np.allclose(TabulatedLoad.from_touchstone(str(path), port=2).impedances, 75)
+
+    def test_accepted_as_zl(self):
+        """测试负载模型可用于原本接受固定阻抗的接口"""
+        load = RLCLoad(30, inductance=5e-9)
+        f0 = 2e9
+        zl0 = complex(load(f0))
+
+        transformer = quarter_wave.QuarterWaveTransformer(f0, 50, load)
+        assert transformer.zl == zl0
+        assert QuarterWaveTransformer(f0, 50, load).zl == zl0
+
+        frequencies = np.linspace(1e9, 3e9, 11)
+        s11, _ = quarter_wave_sweep(frequencies, f0, 50.0, load, transformer.zt)
+        expected = [quarter_wave_sweep(np.array([f]), f0, 50.0, complex(load(f)), transformer.zt)[0][0]
+                    for f in frequencies]
+        assert np.allclose(s11, expected)
+
+        batch = quarter_wave_batch(frequencies, 50.0, load)
+        assert np.allclose(batch["transformer_impedance"], np.sqrt(50 * np.abs(load(frequencies))))
+        assert np.array_equal(resolve_load(75 + 5j, frequencies), np.array(75 + 5j))
+
+
+class TestTransmissionLines:
+    """传输线模型测试"""
+
+    def test_ideal_line_reproduces_default(self):
+        """测试理想线模型与默认的理想变换器结果一致"""
+        f0, z0, zl = 1e9, 50.0, 100.0
+        default = quarter_wave.QuarterWaveTransformer(f0, z0, zl)
+        modeled = quarter_wave.QuarterWaveTransformer(f0, z0, zl, line=IdealLine(default.zt))
+        assert modeled.wavelength == pytest.approx(default.wavelength)
+        assert abs(modeled.s_parameters[0]) < 1e-9
+        assert abs(modeled.s_parameters[2]) == pytest.approx(1.0)
+
+        frequencies = np.linspace(0.5e9, 1.5e9, 21)
+        expected = quarter_wave_sweep(frequencies, f0, z0, zl, default.zt)
+        actual = quarter_wave_sweep(frequencies, f0, z0, zl, default.zt, line=IdealLine(default.zt))
+        assert np.allclose(actual[0], expected[0])
+        assert np.allclose(actual[1], expected[1])
+
+        core = QuarterWaveTransformer(f0, z0, zl, line=IdealLine(default.zt)).calculate()
+        assert np.allclose(core["s_parameters"], QuarterWaveTransformer(f0, z0, zl).calculate()["s_parameters"])
+
+    def test_microstrip(self):
+        """测试微带线的静态值、色散和损耗"""
+        line = Microstrip(width=3.06e-3, height=1.6e-3, eps_r=4.4, tan_delta=0.02)
+        assert float(line.characteristic_impedance(1e6)) == pytest.approx(50, abs=1)
+        assert 1 < float(line.effective_permittivity(1e6)) < 4.4
+        eps = line.effective_permittivity(np.array([1e9, 10e9, 30e9]))
+        assert np.all(np.diff(eps) > 0) and eps[-1] < 4.4
+        assert np.all(np.diff(line.attenuation(np.array([1e9, 2e9, 5e9]))) > 0)
+        with pytest.raises(ValueError):
+            Microstrip(width=-1e-3, height=1.6e-3, eps_r=4.4)
+
+    def test_stripline_and_coax(self):
+        """测试带状线和同轴线的特性阻抗"""
+        assert float(Stripline(0.8e-3, 2e-3, 2.2, thickness=1e-9).characteristic_impedance(1e9)) == \
+            pytest.approx(75, abs=1)
+        coax = Coax(inner_radius=0.45e-3, outer_radius=1.5e-3, eps_r=2.25)
+        expected = ETA0 / (2 * np.pi * np.sqrt(2.25)) * np.log(1.5 / 0.45)
+        assert float(coax.characteristic_impedance(1e9)) == pytest.approx(expected)
+        assert float(coax.guided_wavelength(1e9)) == pytest.approx(299_792_458 / 1e9 / 1.5)
+
+    def test_loss_reduces_transmission(self):
+        """测试有耗线降低传输系数而无耗线满足能量守恒"""
+        f0, z0, zl = 2e9, 50.0, 25.0
+        zt = np.sqrt(z0 * zl)
+        lossless = quarter_wave.QuarterWaveTransformer(f0, z0, zl, line=IdealLine(zt))
+        lossy = quarter_wave.QuarterWaveTransformer(f0, z0, zl, line=IdealLine(zt, attenuation=2.0))
+        s11, s21 = lossless.s_parameters[0], lossless.s_parameters[2]
+        assert abs(s11) ** 2 + abs(s21) ** 2 == pytest.approx(1.0)
+        assert abs(lossy.s_parameters[2]) < abs(s21)
+        assert lossy.length == pytest.approx(lossless.length)
+
+
+class TestSynthesis:
+    """微带线几何综合测试"""
+
+    def test_inverse_matches_forward_model(self):
+        """测试反查得到的宽度代回正向模型后阻抗和电长度一致"""
+        substrate = Substrate(eps_r=4.4, height=1.6e-3, thickness=35e-6)
+        synthesizer = MicrostripSynthesizer(substrate)
+        impedance = np.array([25.0, 50.0, 70.7, 120.0])
+        geometry = synthesizer.synthesize(impedance, 90.0, 2e9)
+        for z, width, length in zip(impedance, geometry["width"], geometry["length"]):
+            line = substrate.line(width)
+            assert line.z_static == pytest.approx(z, abs=1e-3)
+            assert length == pytest.approx(float(line.guided_wavelength(2e9)) / 4, rel=1e-4)
+        assert np.isnan(synthesizer.width(1000.0))
+
+    def test_disk_cache(self, tmp_path):
+        """测试反查表写入磁盘缓存并在之后读取"""
+        substrate = Substrate(eps_r=2.2, height=0.787e-3)
+        first = MicrostripSynthesizer(substrate, points=256, cache_dir=str(tmp_path))
+        widths = first.width([40.0, 60.0])
+        assert (tmp_path / f"microstrip_{first.cache_key}.npz").exists()
+
+        second = MicrostripSynthesizer(substrate, points=256, cache_dir=str(tmp_path))
+        second._build_table = None  # 读取缓存时不应重新计算
+        assert np.array_equal(second.width([40.0, 60.0]), widths)
+        assert MicrostripSynthesizer(Substrate(eps_r=2.2, height=1.0e-3)).cache_key != first.cache_key
+
+
+class TestSensitivity:
+    """参数灵敏度测试"""
+
+    def test_matches_finite_differences(self):
+        """测试解析导数与中心差分一致"""
+        topology = Topology([
+            SeriesElement("inductor", 3e-9, name="L1"),
+            ShuntElement("capacitor", 1.5e-12, name="C1"),
+            LineSection(60, 0.05, 2.0),
+            ShortStub(40, 0.02, name="short"),
+            OpenStub(70, 0.01, 1.5, name="open"),
+            SeriesElement("resistor", 2.0, name="R1")
+        ])
+        frequencies = np.linspace(0.5e9, 2e9, 7)
+        zl = 30 + 15j
+        result = sensitivity(topology, frequencies, 50, zl)
+        assert set(result["d_vswr"]) == set(topology.nominal())
+
+        for name, value in topology.nominal().items():
+            h = value * 1e-6
+            up = topology.response(frequencies, 50, zl, {name: value + h})[0]
+            down = topology.response(frequencies, 50, zl, {name: value - h})[0]
+            expected_s11 = (np.abs(up) - np.abs(down)) / (2 * h)
+            expected_vswr = (vswr(up) - vswr(down)) / (2 * h)
+            assert np.allclose(result["d_s11"][name], expected_s11, rtol=1e-5, atol=1e-9 * np.abs(expected_s11).max())
+            assert np.allclose(result["d_vswr"][name], expected_vswr, rtol=1e-5, atol=1e-9 * np.abs(expected_vswr).max())
+
+    def test_quarter_wave_design(self):
+        """测试四分之一波长变换器的阻抗取最优值，偏离设计频率时只对电长度敏感"""
+        transformer = quarter_wave.QuarterWaveTransformer(1e9, 50, 100)
+        topology = Topology.quarter_wave(transformer)
+        result = sensitivity(topology, np.array([1e9, 1.2e9]), 50, 100)
+        assert result["vswr"][0] == pytest.approx(1.0)
+        assert np.allclose(result["d_s11"]["transformer.impedance"], 0, atol=1e-12)
+        assert result["d_s11"]["transformer.length"][1] > 0
+
+        relative = normalized_sensitivity(result, topology.nominal())
+        assert set(relative) == {"transformer.impedance", "transformer.length", "transformer.eps_eff"}
+        with pytest.raises(KeyError):
+            sensitivity(topology, np.array([1e9]), 50, 100, {"stub.length": 0.1})
+
+
+class TestKernels:
+    """测试逐负载编译内核"""
+
+    @pytest.fixture
+    def loads(self):
+        rng = np.random.default_rng(2)
+        return (rng.uniform(1e9, 10e9, (20, 5)), np.full((20, 5), 50.0),
+                rng.uniform(10, 200, (20, 5)) + 1j * rng.uniform(-100, 100, (20, 5)))
+
+    def test_numpy_backend(self, loads):
+        """测试 NumPy 实现与批量求解完全一致"""
+        kernels.set_backend("numpy")
+        try:
+            for method, solver in (("quarter_wave", quarter_wave_batch), ("stub", stub_batch)):
+                result = kernels.KERNELS[method](*loads)
+                for name, column in solver(*loads).items():
+                    assert np.array_equal(result[name], column, equal_nan=True)
+        finally:
+            kernels.set_backend(None)
+        with pytest.raises(ValueError):
+            kernels.set_backend("fortran")
+
+    @pytest.mark.parametrize("method", ["quarter_wave", "stub"])
+    def test_loop_formulas(self, method):
+        """测试未编译的循环内核与 NumPy 实现的公式一致，包括 |Γ| 因舍入略大于1得到 nan 的行"""
+        rng = np.random.default_rng(2)
+        freq = rng.uniform(1e9, 10e9, 1000)
+        z0 = np.full(1000, 50.0)
+        zl = rng.uniform(10, 200, 1000) + 1j * rng.uniform(-100, 100, 1000)
+        if method == "quarter_wave":
+            loop, solver = kernels._quarter_wave_loop, quarter_wave_batch
+            names = ("wavelength", "transformer_impedance", "s11", "s21", "s22", "vswr")
+        else:
+            loop, solver = kernels._stub_loop, stub_batch
+            names = ("wavelength", "distance", "stub_length", "s11", "s21", "s22", "vswr")
+        columns = {name: np.empty(1000, dtype=complex if name.startswith("s") and name[1:].isdigit() else float)
+                   for name in names}
+        loop(freq, z0, zl, *columns.values())
+        with np.errstate(invalid="ignore"):
+            expected = solver(freq, z0, zl)
+        if method == "stub":
+            # 支节匹配的 |Γin| 理论上等于1，s21 和驻波比只剩舍入误差，逐行可能是 nan、0 或 inf，
+            # 把 nan 截断为0、驻波比取倒数后比较
+            assert np.isnan(expected["s21"]).any()
+            for values in (columns, expected):
+                values["s21"] = np.nan_to_num(values["s21"], nan=0)
+                values["vswr"] = 1 / values["vswr"]
+            assert np.allclose(columns.pop("s21"), expected["s21"], rtol=0, atol=1e-7)
+        for name, column in columns.items():
+            assert np.allclose(column, expected[name], rtol=1e-12, atol=1e-15), name
+
+    def test_numba_backend(self, loads):
+        """测试 Numba 内核与 NumPy 实现只在舍入上不同"""
+        pytest.importorskip("numba")
+        kernels.set_backend("numba")
+        try:
+            for method, solver in (("quarter_wave", quarter_wave_batch), ("stub", stub_batch)):
+                result = kernels.KERNELS[method](*loads)
+                for name, column in solver(*loads).items():
+                    assert result[name].shape == column.shape
+                    assert np.allclose(result[name], column, rtol=1e-12, atol=0, equal_nan=True)
+        finally:
+            kernels.set_backend(None)
+
+
+class TestPrecision:
+    """测试单精度和双精度两种计算模式"""
+
+    @pytest.fixture
+    def loads(self):
+        rng = np.random.default_rng(3)
+        size = 20000
+        return (rng.uniform(1e6, 1e11, size), rng.uniform(10, 150, size),
+                rng.uniform(1, 500, size) + 1j * rng.uniform(-500, 500, size))
+
+    def test_quarter_wave(self, loads):
+        """测试四分之一波长变换器的单精度误差在文档给出的误差界内"""
+        double = quarter_wave_batch(*loads)
+        single = quarter_wave_batch(*loads, precision="single")
+        assert single["transformer_impedance"].dtype == np.float32
+        assert single["s11"].dtype == np.complex64
+        assert double["s11"].dtype == np.complex128
+        for name in ("wavelength", "transformer_impedance", "length"):
+            assert np.allclose(single[name], double[name], rtol=1e-6, atol=0)
+        for name in ("s11", "s21", "s22"):
+            assert np.max(np.abs(single[name] - double[name])) < 1e-5
+        assert np.all(np.abs(single["vswr"] - double["vswr"]) < 1e-6 * double["vswr"] ** 2)
+
+    def test_stub(self, loads):
+        """测试单支节的单精度误差在文档给出的误差界内，S21 为 NaN 的行不发出警告"""
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", RuntimeWarning)
+            double = stub_batch(*loads)
+            single = stub_batch(*loads, precision="single")
+        assert np.isnan(double["s21"]).any()
+        assert single["distance"].dtype == np.float32
+        for name in ("distance", "stub_length"):
+            assert np.all(np.abs(single[name] - double[name]) < 1e-5 * double["wavelength"])
+        assert np.max(np.abs(single["s11"] - double["s11"])) < 1e-4
+
+    def test_kernels(self, loads):
+        """测试内核按精度传递，未知精度报错"""
+        result = kernels.quarter_wave_kernel(*loads, precision="single")
+        assert result["vswr"].dtype == np.float32
+        with pytest.raises(ValueError):
+            quarter_wave_batch(*loads, precision="half")
+
+
+class TestSharedMemory:
+    """测试共享内存并行求解"""
+
+    def test_shared_arrays(self):
+        """测试共享数组可在其他位置按描述打开，释放后不再存在"""
+        values = np.arange(6, dtype=np.complex64).reshape(2, 3)
+        with SharedArrays.from_arrays({"values": values}) as shared:
+            arrays, blocks = attach(shared.spec)
+            assert arrays["values"].dtype == np.complex64
+            assert np.array_equal(arrays["values"], values)
+            arrays["values"][0, 0] = 7
+            assert shared.arrays["values"][0, 0] == 7
+            del arrays
+            for block in blocks:
+                block.close()
+            name = shared.spec["values"][0]
+        with pytest.raises(FileNotFoundError):
+            attach({"values": (name, "<c8", (2, 3))})
+
+    @pytest.mark.parametrize("method", ["quarter_wave", "stub"])
+    @pytest.mark.parametrize("precision", ["double", "single"])
+    def test_solve_shared(self, method, precision):
+        """测试多进程结果与单进程逐位一致"""
+        rng = np.random.default_rng(5)
+        freq = rng.uniform(1e9, 10e9, 1000)
+        zl = rng.uniform(10, 200, 1000) + 1j * rng.uniform(-100, 100, 1000)
+        with np.errstate(invalid="ignore"):
+            serial = kernels.KERNELS[method](freq, np.full(1000, 50.0), zl, precision)
+            parallel = solve_shared(method, freq, 50.0, zl, workers=2, chunk_size=300, precision=precision)
+        assert set(parallel) == set(serial)
+        for name, values in serial.items():
+            assert parallel[name].dtype == values.dtype
+            assert np.array_equal(parallel[name], values, equal_nan=True)
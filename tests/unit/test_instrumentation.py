@@ -0,0 +1,126 @@
+"""性能剖析模块测试"""
+import json
+import pytest
+from src import instrumentation
+from src.cli import main
+from src.instrumentation import Profiler, throughput
+from src.optimization.calculator import BatchCalculator, CalculationParameters
+from src.optimization.optimizer import Optimizer
+
+
+@pytest.fixture(autouse=True)
+def clean_profiler():
+    """每个测试前后重置全局剖析器"""
+    instrumentation.profiler.reset()
+    yield
+    instrumentation.disable()
+    instrumentation.profiler.reset()
+
+
+class TestProfiler:
+    """测试剖析器"""
+
+    def test_disabled_is_noop(self):
+        """测试关闭时不记录任何数据"""
+        profiler = Profiler()
+        assert profiler.stage("a") is profiler.stage("b")
+        with profiler.stage("a"):
+            pass
+        profiler.count("evaluations")
+        report = profiler.report()
+        assert report["stages"] == {}
+        assert report["counters"] == {}
+
+    def test_stage_and_counter(self):
+        """测试阶段计时和计数器"""
+        profiler = Profiler()
+        profiler.enable()
+        for _ in range(3):
+            with profiler.stage("network"):
+                pass
+        profiler.count("cache_hits", 2)
+        profiler.count("cache_hits")
+
+        report = profiler.report()
+        stats = report["stages"]["network"]
+        assert stats["count"] == 3
+        assert 0 <= stats["min"] <= stats["mean"] <= stats["max"]
+        assert report["counters"] == {"cache_hits": 3}
+
+    def test_track_memory(self):
+        """测试统计阶段内存分配"""
+        profiler = Profiler()
+        profiler.enable(track_memory=True)
+        with profiler.stage("alloc"):
+            data = [0] * 100_000
+        profiler.disable()
+        assert profiler.report()["stages"]["alloc"]["memory"] > 100_000
+        del data
+
+    def test_max_events(self):
+        """测试事件数超过上限后只保留统计"""
+        profiler = Profiler(max_events=2)
+        profiler.enable()
+        for _ in range(5):
+            with profiler.stage("s"):
+                pass
+        assert profiler.report()["stages"]["s"]["count"] == 5
+        assert profiler.dropped_events == 3
+
+    def test_export(self, tmp_path):
+        """测试导出JSON和Chrome trace"""
+        profiler = Profiler()
+        profiler.enable()
+        with profiler.stage("save"):
+            pass
+        profiler.count("evaluations", 4)
+
+        profiler.export_json(str(tmp_path / "profile.json"))
+        summary = json.loads((tmp_path / "profile.json").read_text(encoding="utf-8"))
+        assert summary["stages"]["save"]["count"] == 1
+
+        profiler.export_chrome_trace(str(tmp_path / "trace.json"))
+        trace = json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))
+        phases = {event["name"]: event["ph"] for event in trace["traceEvents"]}
+        assert phases == {"save": "X", "evaluations": "C"}
+
+    def test_throughput(self):
+        """测试吞吐量计算"""
+        assert throughput(100, 0.5)["designs_per_second"] == pytest.approx(200)
+        assert throughput(0, 0.0)["designs_per_second"] == 0.0
+
+
+class TestPipelineInstrumentation:
+    """测试计算流程中的剖析点"""
+
+    def test_batch_calculator(self):
+        """测试批量计算记录阶段和吞吐量"""
+        instrumentation.enable()
+        calculator = BatchCalculator(CalculationParameters())
+        calculator.optimize({"freq": (1e9, 2e9)}, num_points=5)
+
+        report = instrumentation.report()
+        assert report["counters"]["evaluations"] == 5
+        assert {"parameters", "network", "s_parameters", "selection"} <= set(report["stages"])
+        assert calculator.throughput["designs"] == 5
+        assert calculator.throughput["designs_per_second"] > 0
+
+    def test_optimizer_throughput(self):
+        """测试优化器报告吞吐量"""
+        result = Optimizer().optimize(5e9, 50, 75 + 25j)
+        assert result["throughput"]["designs"] >= 1
+        assert result["throughput"]["designs_per_second"] > 0
+
+    def test_cli_profile(self, tmp_path):
+        """测试命令行导出剖析结果后关闭剖析器"""
+        spec = tmp_path / "jobs.csv"
+        spec.write_text("freq,z_load_real,z_load_imag\n1e9,75,25\n")
+        profile = tmp_path / "profile.json"
+        trace = tmp_path / "trace.json"
+        assert main(["batch", str(spec), "-o", str(tmp_path / "out.csv"),
+                     "--profile", str(profile), "--trace", str(trace)]) == 0
+
+        stages = json.loads(profile.read_text(encoding="utf-8"))["stages"]
+        assert {"load", "solve_quarter_wave", "solve_stub", "write"} <= set(stages)
+        assert trace.exists()
+        assert not instrumentation.profiler.enabled
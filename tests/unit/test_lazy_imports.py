@@ -0,0 +1,54 @@
+"""延迟导入测试"""
+import json
+import subprocess
+import sys
+import pytest
+
+HEAVY_MODULES = ["matplotlib", "scipy", "skrf", "microwave_gui", "numba"]
+
+_PROBE = """
+import json, sys, time
+import numpy
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _probe(statement):
+    """在新解释器中执行导入语句，返回耗时和已加载的重量级依赖"""
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(statement=statement, heavy=HEAVY_MODULES)],
+        capture_output=True, text=True
+    )
+    assert completed.returncode == 0, completed.stderr
+    return json.loads(completed.stdout)
+
+
+@pytest.mark.parametrize("statement", [
+    "from src.optimization.calculator import calculate_matching",
+    "from src.optimization.optimizer import optimize_matching",
+    "import src.visualization.plotter",
+    "import src.visualization.result_saver",
+    "import src.visualization.live_plot",
+    "import src.gui.main",
+    "import src.cli",
+])
+def test_no_heavy_imports(statement):
+    """测试导入模块时不加载重量级依赖"""
+    assert _probe(statement)["loaded"] == []
+
+
+def test_calculator_import_time():
+    """测试计算模块在 numpy 之外的导入开销"""
+    assert _probe("from src.optimization.calculator import calculate_matching")["seconds"] < 0.1
+
+
+def test_matplotlib_loaded_on_first_use(tmp_path):
+    """测试首次使用结果保存器时才加载 matplotlib"""
+    result = _probe(
+        "from src.visualization.result_saver import ResultSaver\n"
+        f"ResultSaver({str(tmp_path)!r})"
+    )
+    assert result["loaded"] == ["matplotlib"]
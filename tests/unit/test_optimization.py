@@ -1,7 +1,24 @@
 """优化模块测试"""
+import os
 import pytest
 import numpy as np
 from src.optimization.calculator import CalculationParameters, BatchCalculator
+from src.optimization.validation import ValidationError, validate_arrays
+from src.optimization.yield_analysis import Tolerance, YieldAnalysis
+from src.optimization.optimizer import Optimizer
+from src.optimization.checkpoint import Checkpoint, restore_rng, rng_state
+from src.optimization.design_index import DesignIndex, design_key, load_gamma
+from src.optimization.distributed import DistributedSweep, SQLiteBroker
+from src.optimization.surrogate import GaussianProcess, expected_improvement, surrogate_minimize
+from src.optimization.pareto import (
+    ParetoOptimizer,
+    crowding_distance,
+    non_dominated_sort,
+    select_compromise
+)
+from src.impedance_matching.quarter_wave import QuarterWaveTransformer
+from src.impedance_matching.cascade import quarter_wave_sweep
+from src.impedance_matching.topology import SeriesElement, ShuntElement, Topology
 
 class TestCalculationParameters:
     """测试计算参数类"""
@@ -173,6 +190,34 @@ class TestCalculationParameters:
         freq_hz = params.get_frequency_hz()
         assert freq_hz == 5e9
         
+    def test_dict_round_trip(self):
+        """测试字典转换保持数值类型"""
+        params = CalculationParameters(freq=5e9, z0=50, z_load_real=75, z_load_imag=-25)
+        data = params.to_dict()
+        assert data["freq"] == 5e9 and isinstance(data["z_load_imag"], (int, float))
+        restored = CalculationParameters.from_dict(data)
+        assert restored.get_complex_load() == complex(75, -25)
+        # 兼容旧版本保存的字符串数值和整数
+        legacy = dict(data, freq="5000000000.0", z0=50)
+        assert CalculationParameters.from_dict(legacy).freq == 5e9
+
+    def test_from_arrays(self):
+        """测试由数组批量创建参数对象"""
+        params = CalculationParameters.from_arrays(
+            np.array([1e9, 2e9, 3e9]), 50.0, np.array([25.0, 50.0, 100.0]), 0.0,
+            matching_method="stub")
+        assert [p.freq for p in params] == [1e9, 2e9, 3e9]
+        assert [p.z_load_real for p in params] == [25.0, 50.0, 100.0]
+        assert all(p.matching_method == "stub" for p in params)
+        assert not hasattr(params[0], "__dict__")
+        params[0].weight_factors["vswr"] = 0.5
+        assert params[1].weight_factors == {"vswr": 0.7, "length": 0.3}
+
+        with pytest.raises(ValueError, match="第2行: 负载阻抗实部必须为正数"):
+            CalculationParameters.from_arrays(np.array([1e9, 2e9]), 50.0, np.array([25.0, -1.0]), 0.0)
+        with pytest.raises(ValueError, match="匹配方法必须是"):
+            CalculationParameters.from_arrays(1e9, 50.0, 25.0, 0.0, matching_method="X")
+
 class TestBatchCalculator:
     """批量计算器测试类"""
     
@@ -222,7 +267,553 @@ class TestBatchCalculator:
         assert len(results) == len(values)
         assert all(isinstance(result, dict) for result in results)
         
+    def test_sweep_skips_invalid_values(self, calculator):
+        """测试参数扫描跳过无效值而不中断"""
+        results = calculator.parameter_sweep("z_load_real", [50, -10, 0, 100])
+        assert len(results) == 2
+        assert calculator.validation.invalid_rows().tolist() == [1, 2]
+
+    def test_batch_calculate_arrays(self, calculator):
+        """测试按数组批量计算"""
+        results = calculator.batch_calculate_arrays(
+            np.array([5e9, np.nan, 2e9]), 50.0, np.array([75.0, 75.0, 100.0]), 0.0)
+        assert [float(r["params"]["freq"]) for r in results] == [5e9, 2e9]
+        assert calculator.validation.messages() == ["第2行: 频率必须为正数"]
+
     def test_error_handling(self, calculator):
         """测试错误处理"""
         with pytest.raises(ValueError):
-            calculator.calculate(CalculationParameters(freq=-1, z0=50, z_load_real=75, z_load_imag=25)) 
\ No newline at end of file
+            calculator.calculate(CalculationParameters(freq=-1, z0=50, z_load_real=75, z_load_imag=25))
+
+
+class TestScreening:
+    """测试向量化初筛"""
+
+    @pytest.mark.parametrize("method, target", [("quarter_wave", "vswr"), ("stub", "length")])
+    def test_screen_arrays(self, method, target):
+        """测试单精度初筛与双精度选出相同的最优行，最优结果以双精度重新计算"""
+        rng = np.random.default_rng(0)
+        freq = rng.uniform(1e9, 10e9, 500)
+        z0 = np.full(500, 50.0)
+        real, imag = rng.uniform(10, 200, 500), rng.uniform(-100, 100, 500)
+        real[3] = -1.0  # 无效行被跳过
+        params = CalculationParameters(matching_method=method, optimization_target=target)
+
+        results = {}
+        for precision in ("double", "single"):
+            calculator = BatchCalculator(params, precision=precision)
+            with np.errstate(invalid="ignore"):
+                results[precision] = (calculator.screen_arrays(freq, z0, real, imag), calculator.best_result)
+        (double, best_double), (single, best_single) = results["double"], results["single"]
+        assert 3 not in double["row"] and len(double["row"]) == 499
+        assert single["wavelength"].dtype == np.float32
+        assert best_single["params"] == best_double["params"]
+        row = int(np.argmin(double["vswr"] if target == "vswr" else double["distance"] + double["stub_length"]))
+        for name, values in double.items():
+            if name != "row":
+                assert best_single[name] == values[row]
+        with pytest.raises(ValueError):
+            BatchCalculator(params, precision="half")
+
+    def test_best_result_matches_ranking(self):
+        """测试最优结果与排序使用同一模型：报告的驻波比就是选出该行所依据的驻波比"""
+        calculator = BatchCalculator(CalculationParameters())
+        screened = calculator.screen_arrays(np.full(2, 1e9), np.full(2, 50.0), np.array([100.0, 30.0]),
+                                            np.array([0.0, 20.0]))
+        best = int(np.argmin(screened["vswr"]))
+        assert calculator.best_result["params"]["z_load_real"] == [100.0, 30.0][best]
+        assert calculator.best_result["vswr"] == screened["vswr"][best] == screened["vswr"].min()
+
+    @pytest.mark.parametrize("method", ["L", "Pi", "T"])
+    def test_unsupported_method(self, method):
+        """测试没有批量内核的匹配方法不能初筛"""
+        calculator = BatchCalculator(CalculationParameters(matching_method=method))
+        with pytest.raises(ValueError, match=method):
+            calculator.screen_arrays(np.array([1e9]), np.array([50.0]), np.array([75.0]), np.array([25.0]))
+
+    def test_screen_arrays_workers(self):
+        """测试多进程初筛与单进程结果一致"""
+        rng = np.random.default_rng(1)
+        columns = (rng.uniform(1e9, 10e9, 800), np.full(800, 50.0),
+                   rng.uniform(10, 200, 800), rng.uniform(-100, 100, 800))
+        calculator = BatchCalculator(CalculationParameters())
+        serial = calculator.screen_arrays(*columns)
+        best = calculator.best_result
+        parallel = calculator.screen_arrays(*columns, workers=2, chunk_size=250)
+        for name, values in serial.items():
+            assert np.array_equal(parallel[name], values)
+        assert calculator.best_result["params"] == best["params"]
+
+
+class TestValidation:
+    """测试批量参数验证"""
+
+    def test_mask_and_codes(self):
+        """测试有效行掩码和按位组合的错误码"""
+        result = validate_arrays(
+            freq=np.array([5e9, -1.0, np.nan, 5e9]),
+            z0=50.0,
+            z_load_real=np.array([75.0, 0.0, 75.0, 75.0]),
+            z_load_imag=np.array([0.0, 0.0, 0.0, np.inf]),
+            matching_method=np.array(["stub", "stub", "quarter_wave", "X"])
+        )
+        assert result.mask.tolist() == [True, False, False, False]
+        assert result.codes[1] == ValidationError.FREQUENCY | ValidationError.LOAD_REAL
+        assert result.codes[2] == ValidationError.FREQUENCY
+        assert result.codes[3] == ValidationError.LOAD_IMAG | ValidationError.METHOD
+
+    def test_messages_match_scalar_checks(self):
+        """测试错误说明与逐个检查的提示一致"""
+        result = validate_arrays(np.array([5e9, 5e9]), np.array([50.0, -50.0]), 75.0)
+        assert result.messages() == ["第2行: 特征阻抗必须为正数"]
+        with pytest.raises(ValueError, match="特征阻抗必须为正数"):
+            result.raise_if_invalid()
+        with pytest.raises(ValueError, match="特征阻抗必须为正数"):
+            CalculationParameters(z0=-50.0)
+
+    def test_all_valid(self):
+        """测试全部有效"""
+        result = validate_arrays(np.linspace(1e9, 2e9, 100), 50.0, 75.0, 25.0)
+        assert result.all_valid
+        assert not result.codes.any()
+
+
+class TestYieldAnalysis:
+    """测试蒙特卡洛良率分析"""
+
+    @pytest.fixture
+    def analysis(self):
+        """带宽±10%、驻波比≤1.15 的四分之一波长变换器"""
+        transformer = QuarterWaveTransformer(1e9, 50, 100)
+        tolerances = {
+            "transformer.impedance": Tolerance(0.05),
+            "transformer.length": Tolerance(0.02, distribution="normal")
+        }
+        return YieldAnalysis(Topology.quarter_wave(transformer), 50, 100,
+                             np.linspace(0.9e9, 1.1e9, 21), tolerances, vswr_max=1.15)
+
+    def test_topology_matches_sweep(self):
+        """测试拓扑的标称响应与频率扫描一致"""
+        transformer = QuarterWaveTransformer(1e9, 50, 100)
+        frequencies = np.linspace(0.5e9, 1.5e9, 11)
+        s11, _ = Topology.quarter_wave(transformer).response(frequencies, 50, 100)
+        assert np.allclose(s11, quarter_wave_sweep(frequencies, 1e9, 50, 100, transformer.zt)[0])
+
+        lumped = Topology([SeriesElement("inductor", 5e-9), ShuntElement("capacitor", 2e-12)])
+        assert set(lumped.nominal()) == {"series.value", "shunt.value"}
+        with pytest.raises(ValueError):
+            Topology([SeriesElement("inductor", 5e-9), SeriesElement("capacitor", 1e-12)])
+
+    def test_yield(self, analysis):
+        """测试良率统计"""
+        result = analysis.run(20_000, seed=0)
+        assert result["samples"] == 20_000
+        assert 0 < result["yield"] < 1
+        assert result["passed"] == np.count_nonzero(result["worst_vswr"] <= 1.15)
+        assert result["standard_error"] < 0.01
+
+        nominal = YieldAnalysis(analysis.topology, 50, 100, analysis.frequencies, {}, vswr_max=1.15)
+        assert nominal.run(10)["yield"] == 1.0
+        with pytest.raises(KeyError):
+            YieldAnalysis(analysis.topology, 50, 100, analysis.frequencies, {"stub.length": Tolerance(0.1)})
+
+    def test_chunking_and_workers_reproducible(self, analysis):
+        """测试相同种子和块大小下串行与并行结果一致"""
+        serial = analysis.run(1_000, seed=7, chunk_size=128)
+        parallel = analysis.run(1_000, seed=7, chunk_size=128, workers=2)
+        assert np.array_equal(serial["worst_vswr"], parallel["worst_vswr"])
+        assert np.array_equal(analysis.run(1_000, seed=7, chunk_size=128)["worst_vswr"], serial["worst_vswr"])
+
+
+class TestParetoOptimizer:
+    """测试多目标 Pareto 优化"""
+
+    def test_non_dominated_sort(self):
+        """测试向量化排序与逐个比较的结果一致"""
+        objectives = np.random.default_rng(1).random((60, 3))
+        remaining = set(range(len(objectives)))
+        expected = np.empty(len(objectives), dtype=int)
+        rank = 0
+        while remaining:
+            front = [i for i in remaining
+                     if not any(np.all(objectives[j] <= objectives[i]) and np.any(objectives[j] < objectives[i])
+                                for j in remaining)]
+            expected[front] = rank
+            remaining -= set(front)
+            rank += 1
+        assert np.array_equal(non_dominated_sort(objectives), expected)
+
+    def test_crowding_distance(self):
+        """测试前沿两端为无穷大，内部为相邻点目标差之和"""
+        objectives = np.array([[0, 3], [1, 2], [2, 1], [3, 0], [3, 3]], dtype=float)
+        ranks = non_dominated_sort(objectives)
+        assert list(ranks) == [0, 0, 0, 0, 1]
+        distance = crowding_distance(objectives, ranks)
+        assert np.isinf(distance[[0, 3, 4]]).all()
+        assert distance[1] == pytest.approx(4 / 3)
+        assert distance[2] == pytest.approx(4 / 3)
+
+    def test_run(self):
+        """测试优化结果为互不支配的前沿，并按权重选出折中解"""
+        params = CalculationParameters(freq=1e9, z0=50, z_load_real=200, z_load_imag=0,
+                                       weight_factors={"vswr": 0.7, "length": 0.3})
+        optimizer = ParetoOptimizer.from_parameters(params, max_sections=3)
+        generations = []
+        result = optimizer.run(population=40, generations=20, seed=0,
+                               progress_callback=lambda info: generations.append(info["generation"]))
+        front = result["front"]
+        objectives = np.column_stack([front["vswr"], -front["bandwidth"], front["length"], front["components"]])
+        assert np.all(non_dominated_sort(objectives) == 0)
+        assert front["vswr"].min() < 1.2
+        assert set(front["components"]) <= {1, 2, 3}
+        assert result["evaluations"] == 40 * 21
+        assert generations == list(range(1, 21))
+        assert result["preferred"] == select_compromise(objectives, params.weight_factors)
+        with pytest.raises(ValueError):
+            select_compromise(objectives, {"cost": 1.0})
+
+
+class TestSurrogate:
+    """测试代理模型辅助优化"""
+
+    def test_gaussian_process(self):
+        """测试高斯过程在训练点处插值且远离训练点时不确定度增大"""
+        x = np.linspace(0, 1, 8)[:, np.newaxis]
+        y = np.sin(6 * x[:, 0])
+        model = GaussianProcess().fit(x, y)
+        mean, std = model.predict(x)
+        assert np.allclose(mean, y, atol=1e-3)
+        assert np.all(std < 1e-2)
+        _, far = model.predict(np.array([[3.0]]))
+        assert far[0] > 0.5
+
+        ei = expected_improvement(np.array([0.0, 1.0, 0.0]), np.array([0.1, 0.1, 0.0]), best=0.5)
+        assert ei[0] > ei[1] > 0
+        assert ei[2] == 0
+
+    def test_minimize(self):
+        """测试少量评估即可接近最小值"""
+        calls = []
+
+        def objective(x):
+            calls.append(x)
+            return float((x[0] - 0.3) ** 2 + (x[1] + 1.2) ** 2)
+
+        result = surrogate_minimize(objective, [(-2, 2), (-2, 2)], max_evaluations=25, seed=0)
+        assert len(calls) == result["evaluations"] == 25
+        assert result["value"] < 1e-2
+        assert np.allclose(result["x"], [0.3, -1.2], atol=0.1)
+
+        stopped = surrogate_minimize(objective, [(-2, 2), (-2, 2)], max_evaluations=25, seed=0,
+                                     x0=[0.3, -1.2], target=1e-6)
+        assert stopped["status"] == "target_reached"
+        assert stopped["history"]["values"][0] == pytest.approx(0, abs=1e-12)
+
+    def test_optimizer_method(self):
+        """测试 surrogate 方法以十分之一的评估次数达到随机搜索的水平"""
+        optimizer = Optimizer("surrogate", bandwidth=0.4, seed=0)
+        iterations = []
+        result = optimizer.optimize(1e9, 50, 30 + 40j, target_vswr=1.0, max_iterations=30,
+                                    progress_callback=lambda info: iterations.append(info["iteration"]))
+        assert result["iterations"] == optimizer.evaluations == 30
+        assert iterations == list(range(1, 31))
+        assert set(result["optimized_parameters"]) == {"transformer.impedance", "transformer.length"}
+
+        bounds, objective = optimizer._design_problem(1e9, 50, 30 + 40j)
+        bounds = np.array(bounds)
+        rng = np.random.default_rng(0)
+        random_best = min(objective(rng.uniform(bounds[:, 0], bounds[:, 1])) for _ in range(300))
+        nominal = objective(bounds.mean(axis=1))
+        assert result["performance_metrics"]["vswr"] < nominal
+        assert result["performance_metrics"]["vswr"] <= random_best + 1e-3
+
+
+class TestCheckpoint:
+    """测试检查点续算和热启动"""
+
+    def test_roundtrip(self, tmp_path):
+        """测试数组、元数据和随机数生成器状态可以原样恢复"""
+        checkpoint = Checkpoint(str(tmp_path / "state.npz"), interval=5)
+        assert checkpoint.load() is None
+        assert checkpoint.due(10) and not checkpoint.due(7)
+
+        rng = np.random.default_rng(3)
+        rng.random(4)
+        checkpoint.save({"positions": np.arange(6.0).reshape(3, 2)}, {"iteration": 7, "rng": rng_state(rng)})
+        arrays, meta = checkpoint.load()
+        assert np.array_equal(arrays["positions"], np.arange(6.0).reshape(3, 2))
+        assert meta["iteration"] == 7
+        assert np.array_equal(restore_rng(meta["rng"]).random(3), rng.random(3))
+        with pytest.raises(ValueError):
+            Checkpoint("state.npz", interval=0)
+
+    @pytest.mark.parametrize("method", ["genetic", "particle_swarm"])
+    def test_resume(self, tmp_path, method):
+        """测试中断后续算与未中断的运行结果一致，且不重复已完成的迭代"""
+        path = str(tmp_path / "run.npz")
+        uninterrupted = Optimizer(method, seed=1).optimize(1e9, 50, 60 + 40j, target_vswr=1.0, max_iterations=20)
+
+        optimizer = Optimizer(method, seed=1)
+        optimizer.optimize(1e9, 50, 60 + 40j, target_vswr=1.0, max_iterations=8,
+                           checkpoint=path, checkpoint_interval=4)
+        iterations = []
+        resumed = optimizer.optimize(1e9, 50, 60 + 40j, target_vswr=1.0, max_iterations=20, checkpoint=path,
+                                     checkpoint_interval=4,
+                                     progress_callback=lambda info: iterations.append(info["iteration"]))
+        assert iterations == list(range(9, 21))
+        assert optimizer.evaluations == 12 * optimizer.population
+        assert resumed["optimized_parameters"] == uninterrupted["optimized_parameters"]
+        assert resumed["performance_metrics"] == uninterrupted["performance_metrics"]
+
+    @pytest.mark.parametrize("method", ["genetic", "particle_swarm", "surrogate"])
+    def test_warm_start(self, tmp_path, method):
+        """测试频率变化后以之前的结果热启动，立即达到之前的最优值"""
+        previous = Optimizer(method, seed=1).optimize(1e9, 50, 60 + 40j, target_vswr=1.0, max_iterations=30)
+        target = previous["performance_metrics"]["vswr"] + 1e-6
+
+        warm = Optimizer(method, seed=2).optimize(1.05e9, 50, 60 + 40j, target_vswr=target,
+                                                   max_iterations=30, warm_start=previous)
+        assert warm["optimization_status"] == "completed"
+        assert warm["design_scale"] == pytest.approx(previous["design_scale"])
+        if method != "surrogate":
+            assert warm["iterations"] == 0
+
+    def test_warm_start_from_checkpoint(self, tmp_path):
+        """测试问题改变时检查点不会被续算或覆盖，可作为热启动设计"""
+        path = str(tmp_path / "run.npz")
+        previous = Optimizer("particle_swarm", seed=1).optimize(1e9, 50, 60 + 40j, target_vswr=1.0,
+                                                                max_iterations=30, checkpoint=path)
+        saved = Checkpoint(path).load()
+        target = previous["performance_metrics"]["vswr"] + 1e-6
+        optimizer = Optimizer("particle_swarm", seed=2)
+        with pytest.raises(ValueError, match="属于其他优化问题"):
+            optimizer.optimize(2e9, 50, 60 + 40j, target_vswr=target, max_iterations=30, checkpoint=path)
+        assert Checkpoint(path).load()[1] == saved[1]
+
+        result = optimizer.optimize(2e9, 50, 60 + 40j, target_vswr=target, max_iterations=30,
+                                    checkpoint=str(tmp_path / "new.npz"), warm_start=path)
+        assert result["iterations"] == 0
+        assert optimizer.evaluations == optimizer.population
+        result = optimizer.optimize(2e9, 50, 60 + 40j, target_vswr=target, max_iterations=30,
+                                    checkpoint=path, overwrite_checkpoint=True)
+        assert result["iterations"] == 0
+        assert Checkpoint(path).load()[1]["problem"] != saved[1]["problem"]
+        with pytest.raises(KeyError):
+            optimizer.optimize(2e9, 50, 60 + 40j, warm_start={"transformer.impedance": 70.0})
+
+        grid = str(tmp_path / "grid.npz")
+        BatchCalculator(CalculationParameters()).optimize({"freq": (1e9, 2e9)}, 3, checkpoint=grid)
+        with pytest.raises(ValueError, match="不是优化器的检查点"):
+            optimizer.optimize(2e9, 50, 60 + 40j, warm_start=grid)
+        # 优化器的检查点也不会被批量扫描覆盖
+        with pytest.raises(ValueError, match="不是批量计算的检查点"):
+            BatchCalculator(CalculationParameters()).optimize({"freq": (1e9, 2e9)}, 3, checkpoint=path)
+        assert set(Checkpoint(path).load()[0]) == set(saved[0])
+
+    def test_batch_resume(self, tmp_path):
+        """测试批量优化跳过已完成的组合，最优结果与完整运行一致"""
+        path = str(tmp_path / "grid.npz")
+        ranges = {"freq": (1e9, 10e9), "z_load_real": (20, 200)}
+        expected = BatchCalculator(CalculationParameters()).optimize(ranges, 10)
+
+        calculator = BatchCalculator(CalculationParameters())
+        calculator.batch_calculate(calculator._generate_param_combinations(ranges, 10)[:7],
+                                   checkpoint=Checkpoint(path, 3))
+        assert Checkpoint(path).load()[1]["completed"] == 7
+
+        # 前7行对应的检查点属于另一参数列表，不会被续算，也不会被默默覆盖
+        restarted = BatchCalculator(CalculationParameters())
+        with pytest.raises(ValueError, match="属于其他参数列表"):
+            restarted.optimize(ranges, 10, checkpoint=path)
+        assert Checkpoint(path).load()[1]["completed"] == 7
+        restarted.optimize(ranges, 10, checkpoint=path, checkpoint_interval=3, overwrite_checkpoint=True)
+        assert len(restarted.get_all_results()) == 20
+
+        resumed = BatchCalculator(CalculationParameters())
+        best = resumed.optimize(ranges, 10, checkpoint=path)
+        assert resumed.get_all_results() == []
+        assert best["vswr"] == expected["vswr"]
+        assert best["params"] == expected["params"]
+
+
+class TestDesignIndex:
+    """测试已求解设计的最近邻索引"""
+
+    def test_nearest(self, tmp_path):
+        """测试最近邻与逐一比较的结果一致，且按分组键隔离，保存后可以恢复"""
+        rng = np.random.default_rng(0)
+        points = rng.uniform(-0.9, 0.9, 200) + 1j * rng.uniform(-0.9, 0.9, 200)
+        index = DesignIndex(str(tmp_path / "designs.npz"))
+        for row, gamma in enumerate(points):
+            index.add(design_key("quarter_wave", 0.2), gamma, {"row": row})
+        index.add(design_key("quarter_wave", 0.4), 0j, {"row": -1})
+        assert len(index) == 201
+        assert index.nearest(design_key("stub", 0.2), 0j) is None
+
+        for query in rng.uniform(-1, 1, 20) + 1j * rng.uniform(-1, 1, 20):
+            distance, design = index.nearest(design_key("quarter_wave", 0.2), query)
+            assert design["row"] == np.argmin(np.abs(points - query))
+            assert distance == pytest.approx(np.min(np.abs(points - query)))
+
+        index.save()
+        restored = DesignIndex(str(tmp_path / "designs.npz"))
+        assert len(restored) == 201
+        assert restored.nearest(design_key("quarter_wave", 0.4), 0.1j)[1] == {"row": -1}
+        assert restored.nearest(design_key("quarter_wave", 0.2), points[17]) == (0.0, {"row": 17})
+        with pytest.raises(ValueError):
+            DesignIndex().save()
+
+    def test_interleaved(self):
+        """测试新增和查询交替进行时结果正确，且不会为每个新设计重建全部 KD 树"""
+        rng = np.random.default_rng(1)
+        points = rng.uniform(-1, 1, 1100) + 1j * rng.uniform(-1, 1, 1100)
+        index = DesignIndex()
+        key = design_key("quarter_wave", 0.2)
+        for row, gamma in enumerate(points):
+            if row:
+                query = complex(rng.uniform(-1, 1), rng.uniform(-1, 1))
+                distance, design = index.nearest(key, query)
+                assert design["row"] == np.argmin(np.abs(points[:row] - query))
+            index.add(key, gamma, {"row": row})
+
+        group = index._groups[key]
+        assert group.points.dtype == complex and np.array_equal(group.points, points)
+        index.nearest(key, 0j)
+        largest = group._levels[0][2]
+        for gamma in points[:100]:
+            index.add(key, gamma, {"row": -1})
+            index.nearest(key, gamma)
+        assert group._levels[0][2] is largest
+
+    def test_optimizer(self):
+        """测试优化结果加入索引，相近负载直接复用或热启动"""
+        index = DesignIndex()
+        first = Optimizer("particle_swarm", seed=0, design_index=index).optimize(
+            1e9, 50, 60 + 40j, target_vswr=1.0, max_iterations=30)
+        assert first["index_hit"] is False
+        assert len(index) == 1
+        assert load_gamma(1e9, 50, 60 + 40j) == pytest.approx((10 + 40j) / (110 + 40j))
+
+        target = first["performance_metrics"]["vswr"] + 0.01
+        reuse = Optimizer("particle_swarm", seed=1, design_index=index, reuse_tolerance=0.05)
+        result = reuse.optimize(2e9, 50, 61 + 40j, target_vswr=target)
+        assert result["index_hit"] is True
+        assert reuse.evaluations == 1
+        assert len(index) == 1
+
+        warm = Optimizer("particle_swarm", seed=1, design_index=index)
+        result = warm.optimize(2e9, 50, 61 + 40j, target_vswr=target)
+        assert result["index_hit"] is False
+        assert result["iterations"] == 0
+        assert len(index) == 2
+
+
+class TestDistributedSweep:
+    """测试分片执行的参数扫描"""
+
+    @pytest.fixture
+    def jobs(self):
+        rng = np.random.default_rng(2)
+        jobs = {"freq": rng.uniform(1e9, 10e9, 1000), "z0": np.full(1000, 50.0),
+                "z_load_real": rng.uniform(10, 200, 1000), "z_load_imag": rng.uniform(-100, 100, 1000)}
+        jobs["z_load_real"][[5, 640]] = -1.0  # 无效行
+        return jobs
+
+    @pytest.fixture
+    def params(self):
+        return CalculationParameters(matching_method="quarter_wave", optimization_target="vswr")
+
+    def test_merge_matches_single_process(self, tmp_path, jobs, params):
+        """测试多个工作进程执行后合并的结果与单进程初筛相同"""
+        sweep = DistributedSweep(str(tmp_path / "sweep"))
+        assert sweep.submit(params, jobs, shard_size=300) == 4
+        with pytest.raises(RuntimeError, match="未完成"):
+            sweep.merge()
+        assert sweep.run_worker("a", max_shards=1) == 1
+        assert DistributedSweep(str(tmp_path / "sweep")).run_worker("b") == 3
+
+        merged = sweep.merge()
+        calculator = BatchCalculator(params)
+        expected = calculator.screen_arrays(jobs["freq"], jobs["z0"], jobs["z_load_real"], jobs["z_load_imag"])
+        assert set(merged) == set(expected)
+        for name, values in expected.items():
+            assert np.array_equal(merged[name], values)
+        assert sweep.best_result["params"] == calculator.best_result["params"]
+        arrays, meta = Checkpoint(str(tmp_path / "sweep" / "results.npz")).load()
+        assert np.array_equal(arrays["row"], expected["row"])
+        assert meta["best"] == calculator.best_result["params"]
+
+    def test_expired_lease_requeued(self, tmp_path, jobs, params):
+        """测试崩溃的工作进程领取的分片在租期过后重新排队"""
+        broker = SQLiteBroker(str(tmp_path / "queue.sqlite"), lease_seconds=0.0)
+        sweep = DistributedSweep(str(tmp_path / "sweep"), broker)
+        sweep.submit(params, jobs, shard_size=500)
+        crashed = broker.claim("crashed")  # 领取后不再报告
+        assert broker.status()["running"] == 1
+
+        assert sweep.run_worker("b") == 2
+        assert not broker.complete(crashed["shard"], "crashed")
+        assert broker.status() == {"pending": 0, "running": 0, "done": 2, "failed": 0}
+        assert len(sweep.merge()["row"]) == 998
+
+    def test_failed_shard(self, tmp_path, jobs, params, monkeypatch):
+        """测试执行出错的分片重试，超过最大次数后合并时报告错误"""
+        calls = []
+        screen_arrays = BatchCalculator.screen_arrays
+
+        def flaky(calculator, *columns):
+            calls.append(len(columns[0]))
+            if len(calls) == 1:
+                raise MemoryError("节点内存不足")
+            return screen_arrays(calculator, *columns)
+
+        monkeypatch.setattr(BatchCalculator, "screen_arrays", flaky)
+        sweep = DistributedSweep(str(tmp_path / "retry"))
+        sweep.submit(params, jobs, shard_size=500)
+        assert sweep.run_worker("a") == 2
+        assert len(calls) == 3
+        assert len(sweep.merge()["row"]) == 998
+
+        broker = SQLiteBroker(str(tmp_path / "queue.sqlite"), max_attempts=1)
+        sweep = DistributedSweep(str(tmp_path / "failed"), broker)
+        sweep.submit(params, jobs, shard_size=500)
+        calls.clear()
+        assert sweep.run_worker("a") == 1
+        assert broker.errors() == {0: "MemoryError: 节点内存不足"}
+        with pytest.raises(RuntimeError, match="分片 0: MemoryError"):
+            sweep.merge()
+        with pytest.raises(ValueError):
+            sweep.submit(params, jobs)
+
+    def test_rejected_resubmit(self, tmp_path, jobs, params):
+        """测试重复提交被拒绝且不覆盖已提交扫描的输入"""
+        sweep = DistributedSweep(str(tmp_path / "sweep"))
+        sweep.submit(params, {name: values[:3] for name, values in jobs.items()})
+        with pytest.raises(ValueError, match="已有提交的扫描"):
+            DistributedSweep(str(tmp_path / "sweep")).submit(params,
+                                                             {name: values[3:4] for name, values in jobs.items()})
+        with pytest.raises(ValueError, match="L"):
+            DistributedSweep(str(tmp_path / "lumped")).submit(CalculationParameters(matching_method="L"), jobs)
+        # 空扫描不写入任何文件，目录之后仍可正常提交
+        empty = DistributedSweep(str(tmp_path / "empty"))
+        with pytest.raises(ValueError, match="没有要提交的作业"):
+            empty.submit(params, {name: values[:0] for name, values in jobs.items()})
+        assert not os.path.exists(empty.spec_path)
+        assert empty.submit(params, jobs, shard_size=500) == 2
+        sweep.run_worker("a")
+        merged = sweep.merge()
+        assert list(merged["row"]) == [0, 1, 2]
+        assert np.array_equal(merged["vswr"], BatchCalculator(params).screen_arrays(
+            *(jobs[name][:3] for name in ("freq", "z0", "z_load_real", "z_load_imag")))["vswr"])
+
+    def test_concurrent_workers(self, tmp_path, jobs, params):
+        """测试多个进程同时领取时每个分片只完成一次"""
+        from concurrent.futures import ProcessPoolExecutor
+
+        sweep = DistributedSweep(str(tmp_path / "sweep"))
+        sweep.submit(params, jobs, shard_size=50)
+        with ProcessPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(sweep.run_worker, f"w{k}") for k in range(3)]
+            assert sum(future.result() for future in futures) == 20
+        assert sweep.broker.status()["done"] == 20
+        assert len(sweep.merge()["row"]) == 998
@@ -8,6 +8,9 @@ from matplotlib.figure import Figure
 from matplotlib.axes import Axes
 import matplotlib.pyplot as plt
 from src.visualization.plotter import plot_s_parameters, plot_smith_chart, plot_vswr
+from src.visualization.live_plot import LivePlotter
+from src.optimization.calculator import CalculationParameters, BatchCalculator
+from src.optimization.optimizer import Optimizer
 
 class MockNetwork:
     """模拟网络类"""
@@ -296,4 +299,75 @@ def test_plot_vswr():
     assert isinstance(ax, Axes)
     assert ax.get_title() == "VSWR"
     assert ax.get_xlabel() == "Frequency (Hz)"
-    assert ax.get_ylabel() == "VSWR"
\ No newline at end of file
+    assert ax.get_ylabel() == "VSWR"
+
+class TestLivePlotter:
+    """测试实时绘图器"""
+
+    def test_throttled_updates(self):
+        """测试刷新节流"""
+        plotter = LivePlotter(target_fps=1.0)
+        for i in range(200):
+            plotter.update(1e9 + i * 1e6, complex(0.1, 0.01 * (i % 10)))
+        # 1 Hz 帧率下只会在第一个点时重绘
+        assert plotter.draw_count == 1
+        plotter.flush()
+        assert plotter.draw_count == 2
+        x, s11 = plotter.get_data()
+        assert len(x) == len(s11) == 200
+        assert len(plotter.s11_line.get_xdata()) == 200
+        plt.close(plotter.fig)
+
+    def test_reuses_figure(self):
+        """测试复用同一图形对象"""
+        fig = plt.figure()
+        plotter = LivePlotter(figure=fig)
+        plotter.update(1.0, complex(0.2, 0.1))
+        plotter.update(2.0, complex(0.3, 0.1))
+        plotter.flush()
+        assert plotter.fig is fig
+        assert len(fig.axes) == 3
+        plt.close(fig)
+
+    def test_batch_calculator_callback(self):
+        """测试作为批量计算器回调"""
+        params = CalculationParameters(freq=5e9, z0=50, z_load_real=75, z_load_imag=25)
+        calculator = BatchCalculator(params)
+        plotter = LivePlotter(target_fps=1000.0, x_key="freq")
+        calculator.parameter_sweep("freq", [1e9, 2e9, 3e9], progress_callback=plotter)
+        plotter.flush()
+        x, _ = plotter.get_data()
+        assert np.allclose(x, [1e9, 2e9, 3e9])
+        assert plotter.ax_s11.get_xlabel() == "Frequency (Hz)"
+        plt.close(plotter.fig)
+
+        # 默认以序号作横坐标，扫描负载的各点不会堆在同一频率上
+        plotter = LivePlotter(target_fps=1000.0)
+        calculator.optimize({"freq": (1e9, 2e9), "z_load_real": (20, 200)}, 3, progress_callback=plotter)
+        x, _ = plotter.get_data()
+        assert [result["params"]["freq"] for result in calculator.get_all_results()][3:] == [5e9] * 3
+        assert list(x) == list(range(6))
+        plt.close(plotter.fig)
+
+    def test_optimizer_callback(self):
+        """测试作为优化器回调"""
+        plotter = LivePlotter()
+        optimizer = Optimizer("particle_swarm", seed=0)
+        optimizer.optimize(5e9, 50, complex(75, 25), target_vswr=1.0,
+                           max_iterations=5, progress_callback=plotter)
+        x, _ = plotter.get_data()
+        assert list(x) == [1, 2, 3, 4, 5]
+        plt.close(plotter.fig)
+
+        # 梯度下降不改变设计，只报告一次
+        plotter = LivePlotter()
+        Optimizer("gradient_descent").optimize(5e9, 50, complex(75, 25), target_vswr=1.0,
+                                               max_iterations=5, progress_callback=plotter)
+        x, _ = plotter.get_data()
+        assert list(x) == [5]
+        plt.close(plotter.fig)
+
+    def test_invalid_fps(self):
+        """测试无效帧率"""
+        with pytest.raises(ValueError, match="目标帧率必须为正数"):
+            LivePlotter(target_fps=0)